@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark for `read_input_async`: other asyncio tasks while a prompt is open.
+
+Runs a number of periodic tasks (every task reschedules itself every 10ms) on
+an asyncio event loop, first alone and then while `read_input_async` reads
+input from a pseudo terminal, in which characters are typed (50 per second).
+Reports how often the tasks ran and how late they were.
+
+Usage::
+
+    python benchmarks/asyncio_prompt.py [--tasks=5000] [--seconds=2]
+"""
+from __future__ import unicode_literals, print_function
+
+import asyncio
+import io
+import os
+import pty
+import sys
+import time
+
+from prompt_toolkit import CommandLineInterface
+
+
+def _parse_args(argv):
+    options = {'tasks': 5000, 'seconds': 2}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _percentile(values, percentile):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100.))]
+
+
+def _start_tasks(loop, count, running):
+    """
+    Start `count` periodic tasks. Return the list in which the lateness of
+    every run is collected.
+    """
+    lateness = []
+    interval = .01
+
+    def create_task():
+        def run(expected):
+            lateness.append(time.time() - expected)
+            if running[0]:
+                loop.call_later(interval, run, time.time() + interval)
+        loop.call_later(interval, run, time.time() + interval)
+
+    for i in range(count):
+        create_task()
+
+    return lateness
+
+
+def _report(name, lateness, seconds):
+    print('%-16s %10.0f %9.1f ms %9.1f ms' % (
+        name, len(lateness) / seconds,
+        _percentile(lateness, 50) * 1000, _percentile(lateness, 99) * 1000))
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+    seconds = options['seconds']
+
+    print('Tasks: %i (every 10ms)' % options['tasks'])
+    print('')
+    print('                   runs/s   p50 lateness   p99 lateness')
+
+    # Without prompt.
+    loop = asyncio.new_event_loop()
+    running = [True]
+    lateness = _start_tasks(loop, options['tasks'], running)
+
+    loop.run_until_complete(asyncio.sleep(seconds))
+    running[0] = False
+    _report('no prompt', lateness, seconds)
+
+    # With prompt.
+    master, slave = pty.openpty()
+    stdin = os.fdopen(slave, 'rb', 0)
+    stdout = io.open(os.dup(slave), 'w')
+
+    running = [True]
+    lateness = _start_tasks(loop, options['tasks'], running)
+
+    def read_output():
+        os.read(master, 65536)
+    loop.add_reader(master, read_output)
+
+    keystrokes = 50 * seconds
+    for i in range(keystrokes):
+        loop.call_later(i / 50., os.write, master, b'x')
+    loop.call_later(seconds, os.write, master, b'\r')
+
+    cli = CommandLineInterface(stdin=stdin, stdout=stdout)
+    result = loop.run_until_complete(cli.read_input_async(loop=loop))
+    running[0] = False
+
+    assert len(result.text) == keystrokes
+    _report('prompt active', lateness, seconds)
+
+    loop.remove_reader(master)
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Benchmark for `call_from_executor` with many producer threads.
+
+A number of threads call `PosixEventLoop.call_from_executor` in a loop, while
+the main thread runs the event loop. This is done with a byte per call on a
+pipe (what `call_from_executor` used to do) and with the current queue, which
+only wakes up the event loop when no wakeup is pending yet.
+
+Reports the callbacks per second (the median of a few runs), and how often
+the event loop was woken up for processing them.
+
+Usage::
+
+    python benchmarks/call_from_executor.py [--threads=8] [--calls=50000] [--repeat=3]
+"""
+from __future__ import unicode_literals, print_function
+
+import fcntl
+import os
+import sys
+import threading
+import time
+
+from prompt_toolkit.eventloop.posix import PosixEventLoop
+
+
+class _KeyCounter(object):
+    """
+    Takes the place of the `InputProcessor`.
+    """
+    def feed_key(self, key_press):
+        pass
+
+
+class _CountingEventLoop(PosixEventLoop):
+    """
+    `PosixEventLoop` which counts the wakeups for calls from the executor.
+    """
+    wakeups = 0
+
+    def _process_calls_from_executor(self):
+        self.wakeups += 1
+        super(_CountingEventLoop, self)._process_calls_from_executor()
+
+
+class _PipePerCall(_CountingEventLoop):
+    """
+    Write a byte to a pipe for every call, and read 1024 at a time. (The
+    previous `call_from_executor`.)
+    """
+    def __init__(self, *a, **kw):
+        super(_PipePerCall, self).__init__(*a, **kw)
+
+        self._schedule_pipe = os.pipe()
+        fcntl.fcntl(self._schedule_pipe[0], fcntl.F_SETFL, os.O_NONBLOCK)
+        self.add_reader(self._schedule_pipe[0], self._process_calls_from_executor)
+        self._calls = []
+
+    def _process_calls_from_executor(self):
+        self.wakeups += 1
+        os.read(self._schedule_pipe[0], 1024)
+
+        calls, self._calls = self._calls, []
+        for c in calls:
+            c()
+
+    def call_from_executor(self, callback):
+        self._calls.append(callback)
+        os.write(self._schedule_pipe[1], b'x')
+
+    def close(self):
+        super(_PipePerCall, self).close()
+        os.close(self._schedule_pipe[0])
+        os.close(self._schedule_pipe[1])
+
+
+def _parse_args(argv):
+    options = {'threads': 8, 'calls': 50000, 'repeat': 3}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _run(eventloop_cls, options):
+    read_fd, write_fd = os.pipe()
+    stdin = os.fdopen(read_fd, 'rb', 0)
+    eventloop = eventloop_cls(_KeyCounter(), stdin)
+
+    total = options['threads'] * options['calls']
+    called = [0]
+
+    def callback():
+        called[0] += 1
+        if called[0] == total:
+            # Return from the event loop.
+            os.write(write_fd, b'x')
+
+    def producer():
+        for i in range(options['calls']):
+            eventloop.call_from_executor(callback)
+
+    threads = [threading.Thread(target=producer) for i in range(options['threads'])]
+
+    start = time.time()
+    for t in threads:
+        t.start()
+
+    eventloop.loop()
+    seconds = time.time() - start
+
+    for t in threads:
+        t.join()
+
+    wakeups = eventloop.wakeups
+    eventloop.close()
+    stdin.close()
+    os.close(write_fd)
+
+    return total / seconds, wakeups
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    print('Producers: %i threads, %i calls each' % (options['threads'], options['calls']))
+    print('')
+    print('                   callbacks/s     wakeups')
+
+    for name, eventloop_cls in (('pipe per call', _PipePerCall), ('queue', _CountingEventLoop)):
+        results = sorted(_run(eventloop_cls, options) for i in range(options['repeat']))
+        per_second, wakeups = results[len(results) // 2]
+        print('%-16s %13.0f %11i' % (name, per_second, wakeups))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Benchmark for asynchronous completion with a slow completer.
+
+Types a few characters (with a delay between them) in a command line interface
+with a completer that takes some time for every completion it yields, like
+jedi does on large modules. Measures the time between the last key press and
+the moment that the completion menu appears and is complete, and how many
+completions were generated in total (also for text that was already changed).
+
+The event loop is replaced by a simple loop that runs the callbacks of the
+executor threads. Nothing is rendered.
+
+Usage::
+
+    python benchmarks/completion.py [--completions=1000] [--delay-us=1000] [--keystrokes=5] [--typing-delay-ms=100]
+"""
+from __future__ import unicode_literals, print_function
+
+import io
+import sys
+import threading
+import time
+
+from six.moves import queue
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.line import Line
+
+
+class _SlowCompleter(Completer):
+    def __init__(self, count, delay):
+        self.count = count
+        self.delay = delay
+        self.generated = 0
+
+    def get_completions(self, document):
+        word = document.text_before_cursor
+
+        for i in range(self.count):
+            time.sleep(self.delay)
+            self.generated += 1
+            yield Completion('%s_%i' % (word, i), -len(word))
+
+
+class _EventLoop(object):
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def run_in_executor(self, callback, priority=0, key=None):
+        thread = threading.Thread(target=callback)
+        thread.daemon = True
+        thread.start()
+
+    def call_from_executor(self, callback):
+        self.queue.put(callback)
+
+    def run_until(self, condition, timeout):
+        end = time.time() + timeout
+        while not condition() and time.time() < end:
+            try:
+                self.queue.get(timeout=max(0, end - time.time()))()
+            except queue.Empty:
+                pass
+
+
+def _parse_args(argv):
+    options = {'completions': 1000, 'delay-us': 1000, 'keystrokes': 5, 'typing-delay-ms': 100}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    completer = _SlowCompleter(options['completions'], options['delay-us'] / 1000000.)
+    cli = CommandLineInterface(stdout=io.StringIO(), line=Line(completer=completer))
+    cli._redraw = lambda: None
+
+    eventloop = _EventLoop()
+    cli.eventloop = eventloop
+
+    line = cli.line
+    typing_delay = options['typing-delay-ms'] / 1000.
+
+    for i in range(options['keystrokes']):
+        if i:
+            eventloop.run_until(lambda: False, typing_delay)
+        line.insert_text('x')
+
+    start = time.time()
+
+    def completions_count():
+        if line.complete_state and line.complete_state.original_document.text == line.text:
+            return len(line.complete_state.current_completions)
+        return 0
+
+    eventloop.run_until(lambda: completions_count() > 0, 60)
+    first = time.time() - start
+
+    eventloop.run_until(lambda: completions_count() == options['completions'], 60)
+    complete = time.time() - start
+
+    # Wait for cancelled threads to stop.
+    time.sleep(.1)
+
+    print('Completions:           %i (%i us each)' % (options['completions'], options['delay-us']))
+    print('Keystrokes:            %i (%i ms apart)' % (options['keystrokes'], options['typing-delay-ms']))
+    print('')
+    print('First completions:     %.1f ms' % (first * 1000))
+    print('All completions:       %.1f ms' % (complete * 1000))
+    print('Completions generated: %i' % completer.generated)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Benchmark for the bytes written to the terminal for typical edit patterns.
+
+Replays key strokes in a command line interface with a multiline Python
+buffer of 20 lines, and counts the bytes that the renderer writes. Most of
+the output of these patterns are the escape sequences for moving the cursor
+between the changed cells, and to the position of the cursor in the input.
+
+Usage::
+
+    python benchmarks/cursor_movement.py
+"""
+from __future__ import unicode_literals, print_function
+
+import fcntl
+import os
+import pty
+import struct
+import termios
+
+from pygments.lexers import PythonLexer
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.key_bindings.emacs import emacs_bindings
+from prompt_toolkit.key_bindings.vi import vi_bindings
+from prompt_toolkit.layout import Layout
+from prompt_toolkit.layout.menus import CompletionsMenu
+from prompt_toolkit.line import Line
+from prompt_toolkit.terminal.vt100_input import InputStream
+
+_TEXT = '\n'.join(
+    'def function_%i(a, b=%i):' % (i, i) if i % 5 == 0 else
+    '    value = [x ** 2 for x in range(%i) if x %% 3]' % i
+    for i in range(20))
+
+_UP, _DOWN, _RIGHT, _LEFT = '\x1b[A', '\x1b[B', '\x1b[C', '\x1b[D'
+_HOME, _END = '\x1b[H', '\x1b[F'
+
+
+class _Stdout(object):
+    """
+    Fake stdout, which counts the bytes that are written to it. `fileno`
+    returns the pty, for the terminal size.
+    """
+    def __init__(self, fd):
+        self.fd = fd
+        self.bytes_written = 0
+
+    def fileno(self):
+        return self.fd
+
+    def write(self, data):
+        self.bytes_written += len(data.encode('utf-8'))
+
+    def flush(self):
+        pass
+
+
+class _WordCompleter(Completer):
+    def get_completions(self, document):
+        word = document.get_word_before_cursor()
+        for i in range(20):
+            if ('value_%i' % i).startswith(word):
+                yield Completion('value_%i' % i, -len(word))
+
+
+# (name, key bindings, key strokes) for every pattern. The cursor starts at
+# the end of the buffer.
+_PATTERNS = [
+    ('type at end of line', emacs_bindings, list(' # comment')),
+    ('type in the middle', emacs_bindings, [_UP] * 3 + [_LEFT] * 20 + list('abc')),
+    ('left/right', emacs_bindings, [_LEFT] * 20 + [_RIGHT] * 20),
+    ('up/down', emacs_bindings, [_UP] * 15 + [_DOWN] * 15),
+    ('home/end', emacs_bindings, [_HOME, _END] * 10),
+    ('vi motions', vi_bindings, ['\x1b'] + ['k', 'w', 'w', 'b', 'j', '0', '$'] * 5),
+    ('vi x/dd/u', vi_bindings, ['\x1b', 'g', 'g'] + ['x', 'j'] * 5 + ['d', 'd', 'u'] * 3),
+    ('completion menu', emacs_bindings, ['\n'] + list('x = v') + ['\t'] * 10),
+]
+
+
+def _run(key_bindings, keys, slave):
+    """
+    Replay the key strokes, return the number of bytes written.
+    """
+    stdout = _Stdout(slave)
+    cli = CommandLineInterface(
+        stdout=stdout,
+        line=Line(is_multiline=True, completer=_WordCompleter()),
+        layout=Layout(lexer=PythonLexer, menus=[CompletionsMenu()]),
+        key_binding_factories=[key_bindings],
+        create_async_autocompleters=False)
+    cli.line.reset(initial_value=_TEXT)
+
+    inputstream = InputStream(cli.input_processor)
+    cli.renderer.render(cli)
+    stdout.bytes_written = 0
+
+    for key in keys:
+        inputstream.feed(key)
+        inputstream.flush()
+        cli.renderer.render(cli)
+
+    return stdout.bytes_written
+
+
+def main(argv=None):
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack(str('HHHH'), 40, 120, 0, 0))
+
+    print('                         keys      bytes   per key')
+
+    try:
+        total = 0
+        for name, key_bindings, keys in _PATTERNS:
+            bytes_written = _run(key_bindings, keys, slave)
+            total += bytes_written
+            print('%-22s %7i %10i %9.1f' % (name, len(keys), bytes_written, bytes_written / float(len(keys))))
+
+        print('%-22s %7s %10i' % ('total', '', total))
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Benchmark for `run_in_executor` under fast typing.
+
+Every key press submits a completion job (some CPU work, like jedi does),
+and every few key presses also a signature job. This is done once with a new
+thread for every job (what `run_in_executor` used to do) and once with the
+`ThreadPoolExecutor`, with coalescing of completion and signature jobs.
+
+Reports the number of threads that were started, the number of jobs that ran,
+the latency between the submission and the end of the jobs, and the time
+between the last key press and the end of its completion job. The time that
+the typing loop took shows how much the (Python) main thread is slowed down
+by the other threads.
+
+Usage::
+
+    python benchmarks/executor.py [--keystrokes=200] [--interval-ms=10] [--work-ms=20]
+"""
+from __future__ import unicode_literals, print_function
+
+import sys
+import threading
+import time
+
+from prompt_toolkit.eventloop.executor import ThreadPoolExecutor
+
+
+class _ThreadPerCall(object):
+    """
+    Start a thread for every job. (The previous `run_in_executor`.)
+    """
+    def __init__(self):
+        self.threads_started = 0
+
+    def submit(self, callback, priority=0, key=None):
+        self.threads_started += 1
+        thread = threading.Thread(target=callback)
+        thread.daemon = True
+        thread.start()
+
+    def shutdown(self):
+        pass
+
+
+def _parse_args(argv):
+    options = {'keystrokes': 200, 'interval-ms': 10, 'work-ms': 20}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _calibrate(seconds):
+    """
+    Return the number of iterations of `_work` that take this many seconds
+    (in one thread).
+    """
+    iterations = 1000
+    while True:
+        start = time.time()
+        _work(iterations)
+        elapsed = time.time() - start
+        if elapsed > .1:
+            return int(iterations * seconds / elapsed)
+        iterations *= 2
+
+
+def _work(iterations):
+    for i in range(iterations):
+        sum(range(100))
+
+
+def _percentile(values, percentile):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100.))]
+
+
+def _run(executor, options, iterations):
+    latencies = []
+    last_done = threading.Event()
+    lock = threading.Lock()
+
+    def create_job(last=False):
+        submitted = time.time()
+
+        def job():
+            _work(iterations)
+            with lock:
+                latencies.append(time.time() - submitted)
+            if last:
+                last_done.set()
+        return job
+
+    keystrokes = options['keystrokes']
+    start = time.time()
+
+    for i in range(keystrokes):
+        last_keystroke = time.time()
+        executor.submit(create_job(last=(i == keystrokes - 1)), priority=1, key='completion')
+
+        if i % 5 == 0:
+            executor.submit(create_job(), key='signatures')
+
+        time.sleep(options['interval-ms'] / 1000.)
+
+    typing_time = time.time() - start
+
+    last_done.wait()
+    last_latency = time.time() - last_keystroke
+    executor.shutdown()
+
+    with lock:
+        return {
+            'threads': executor.threads_started,
+            'jobs': len(latencies),
+            'p50': _percentile(latencies, 50),
+            'p99': _percentile(latencies, 99),
+            'last': last_latency,
+            'typing': typing_time,
+        }
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    print('Keystrokes: %i (%i ms apart, %i ms of work per job)' % (
+        options['keystrokes'], options['interval-ms'], options['work-ms']))
+    print('')
+    print('                    threads   jobs  p50 latency  p99 latency  last completion     typing')
+
+    iterations = _calibrate(options['work-ms'] / 1000.)
+
+    for name, executor in (('thread per call', _ThreadPerCall()),
+                           ('thread pool (4)', ThreadPoolExecutor(max_workers=4)),
+                           ('thread pool (1)', ThreadPoolExecutor(max_workers=1))):
+        result = _run(executor, options, iterations)
+        print('%-17s %9i %6i %9.1f ms %9.1f ms %13.1f ms %7.0f ms' % (
+            name, result['threads'], result['jobs'], result['p50'] * 1000,
+            result['p99'] * 1000, result['last'] * 1000, result['typing'] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Benchmark for writing the frames of the renderer to the terminal.
+
+Renders frames of a command line interface with a multiline Python buffer to
+a pseudo terminal (which is read by another thread): small frames (typing at
+the end of the buffer) and large frames (redrawing everything). This is done
+by writing through the file object (the default), with `os.write`, and with
+`os.write` plus synchronized updates. Then again, for a non blocking file
+descriptor.
+
+Reports the write system calls per frame (from ``/proc/thread-self/io``,
+Linux only), the time of the flush per frame (from the profiler) and the
+frames that failed.
+
+Usage::
+
+    python benchmarks/frame_flush.py [--frames=50] [--lines=100]
+"""
+from __future__ import unicode_literals, print_function
+
+import fcntl
+import functools
+import io
+import os
+import pty
+import select
+import struct
+import sys
+import termios
+import threading
+
+from pygments.lexers import PythonLexer
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.layout import Layout
+from prompt_toolkit.line import Line
+from prompt_toolkit.profiler import Profiler
+from prompt_toolkit.renderer import Renderer
+from prompt_toolkit.terminal.vt100_input import InputStream
+
+
+def _parse_args(argv):
+    options = {'frames': 50, 'lines': 100}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _write_syscalls():
+    """
+    Number of write system calls of this thread so far.
+    """
+    filename = '/proc/thread-self/io' if os.path.exists('/proc/thread-self/io') else '/proc/self/io'
+    with open(filename) as f:
+        for line in f:
+            if line.startswith('syscw:'):
+                return int(line.split()[1])
+
+
+def _run(options, large, non_blocking, **renderer_options):
+    """
+    Render the frames, return (write calls per frame, seconds of flushing per
+    frame, failed frames).
+    """
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack(str('HHHH'), 500, 120, 0, 0))
+    if non_blocking:
+        fcntl.fcntl(slave, fcntl.F_SETFL, os.O_NONBLOCK)
+
+    stdout = io.open(slave, 'w', encoding='utf-8')
+
+    # Read the terminal output in another thread.
+    running = [True]
+
+    def reader():
+        while running[0]:
+            if select.select([master], [], [], .1)[0]:
+                os.read(master, 65536)
+    thread = threading.Thread(target=reader)
+    thread.start()
+
+    text = '\n'.join('    value = [x ** 2 for x in range(%i) if x %% 3]  # Comment.' % i
+                     for i in range(options['lines']))
+
+    flush_times = []
+    profiler = Profiler()
+    profiler.onFrame += lambda frame: flush_times.append(frame.phases['flush'])
+
+    cli = CommandLineInterface(
+        stdout=stdout,
+        profiler=profiler,
+        line=Line(is_multiline=True),
+        layout=Layout(lexer=PythonLexer),
+        renderer_factory=functools.partial(Renderer, **renderer_options))
+    cli.line.reset(initial_value=text)
+    inputstream = InputStream(cli.input_processor)
+
+    failed = 0
+    syscalls = _write_syscalls()
+
+    for i in range(options['frames']):
+        if large:
+            cli.renderer.reset()
+        else:
+            inputstream.feed('x')
+            inputstream.flush()
+
+        try:
+            cli.renderer.render(cli)
+        except (IOError, OSError):
+            # (A `BlockingIOError` for non blocking file descriptors.)
+            failed += 1
+            try:
+                stdout.flush()
+            except (IOError, OSError):
+                pass
+
+    syscalls = _write_syscalls() - syscalls
+
+    running[0] = False
+    thread.join()
+    os.close(master)
+    try:
+        stdout.close()
+    except (IOError, OSError):
+        pass
+
+    return syscalls / float(options['frames']), sum(flush_times) / max(1, len(flush_times)), failed
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    print('Frames: %i, buffer of %i lines' % (options['frames'], options['lines']))
+
+    for non_blocking in (False, True):
+        for large in (False, True):
+            print('')
+            print('%s frames, %s fd          writes/frame       flush   failed' % (
+                'large' if large else 'small', 'non blocking' if non_blocking else 'blocking'))
+
+            for name, renderer_options in (
+                    ('file object', {}),
+                    ('os.write', {'use_os_write': True}),
+                    ('os.write + synchronized', {'use_os_write': True, 'synchronized_output': True})):
+                syscalls, seconds, failed = _run(options, large, non_blocking, **renderer_options)
+                print('  %-36s %10.2f %8.0f us %8i' % (name, syscalls, seconds * 1000000, failed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""
+Benchmark for loading a large history file.
+
+Writes a history file of the given size (in MB) to a temporary directory, and
+measures the time to create a `FileHistory` for it, the time of a few
+`Line.reset` calls (done at every prompt), and the maximum resident set size
+of the process. This is compared against the previous implementation, that
+read all the strings in memory and copied them at every prompt.
+
+Each implementation runs in a separate process, so that the memory usage can
+be measured. On Linux, the anonymous part of the RSS (without file backed
+pages) is shown as well.
+
+Usage::
+
+    python benchmarks/history.py [--size=200] [--prompts=5]
+"""
+from __future__ import unicode_literals, print_function
+
+import datetime
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from prompt_toolkit.history import History, FileHistory
+from prompt_toolkit.line import Line
+
+
+class _EagerFileHistory(History):
+    """
+    The previous `FileHistory` implementation, which reads the whole file at
+    construction.
+    """
+    def __init__(self, filename):
+        super(_EagerFileHistory, self).__init__()
+        self.filename = filename
+
+        lines = []
+
+        def add():
+            if lines:
+                self.strings.append(''.join(lines)[:-1])
+
+        with open(self.filename, 'rb') as f:
+            for line in f:
+                line = line.decode('utf-8')
+
+                if line.startswith('+'):
+                    lines.append(line[1:])
+                else:
+                    add()
+                    lines = []
+
+            add()
+
+
+def _parse_args(argv):
+    options = {'size': 200, 'prompts': 5}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = value if name in ('run', 'filename') else int(value)
+    return options
+
+
+def _write_history_file(filename, size):
+    entries = [
+        'print("hello world")',
+        'import os\nos.listdir(".")',
+        'def f(a, b):\n    return a + b\n',
+        'result = [x ** 2 for x in range(%i) if x %% 3]',
+    ]
+    size *= 1024 * 1024
+
+    with open(filename, 'wb') as f:
+        i = 0
+        while f.tell() < size:
+            chunk = []
+            for _ in range(1000):
+                entry = entries[i % len(entries)]
+                if '%' in entry:
+                    entry = entry % i
+                chunk.append('\n# %s\n' % datetime.datetime(2014, 1, 1))
+                chunk.extend('+%s\n' % l for l in entry.split('\n'))
+                i += 1
+            f.write(''.join(chunk).encode('utf-8'))
+
+    return i
+
+
+def _run(options):
+    """
+    Run one implementation. (In the child process.)
+    """
+    start = time.time()
+
+    if options['run'] == 'old':
+        history = _EagerFileHistory(options['filename'])
+    else:
+        history = FileHistory(options['filename'])
+
+    load_time = time.time() - start
+    count = len(history)
+
+    start = time.time()
+
+    if options['run'] == 'old':
+        # What `Line.reset` used to do.
+        for _ in range(options['prompts']):
+            working_lines = history.strings[:]
+            working_lines.append('')
+    else:
+        line = Line(history=history)
+        for _ in range(options['prompts']):
+            line.reset()
+
+    reset_time = (time.time() - start) / options['prompts']
+
+    # On Linux, ru_maxrss is in kilobytes.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+    print('%i %f %f %f %f' % (count, load_time, reset_time, rss, _anonymous_rss()))
+
+
+def _anonymous_rss():
+    """
+    Anonymous part of the current RSS in MB, or -1 when unknown.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) / 1024.
+    except IOError:
+        pass
+    return -1
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    if 'run' in options:
+        _run(options)
+        return
+
+    directory = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(directory, 'history')
+        entries = _write_history_file(filename, options['size'])
+
+        print('File size: %i MB' % (os.path.getsize(filename) // (1024 * 1024)))
+        print('Entries:   %i' % entries)
+        print('')
+        print('                   startup    reset/prompt     max RSS    anon RSS')
+
+        for name in ('old', 'new'):
+            output = subprocess.check_output([
+                sys.executable, __file__, '--run=%s' % name,
+                '--filename=%s' % filename, '--prompts=%i' % options['prompts']])
+            count, load_time, reset_time, rss, anonymous_rss = output.split()
+            assert int(count) == entries
+
+            print('%-15s %8.0f ms %11.2f ms %8.0f MB %8.0f MB' % (
+                name, float(load_time) * 1000, float(reset_time) * 1000,
+                float(rss), float(anonymous_rss)))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Import time profile of prompt_toolkit. (Python 3.7+.)
+
+Imports a module in a new process with ``python -X importtime``, a few times,
+and reports the total import time, and the modules with the largest
+cumulative import time (of the fastest run).
+
+Usage::
+
+    python benchmarks/import_time.py [--module=prompt_toolkit] [--runs=5] [--top=15]
+"""
+from __future__ import unicode_literals, print_function
+
+import os
+import subprocess
+import sys
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _parse_args(argv):
+    options = {'module': 'prompt_toolkit', 'runs': 5, 'top': 15}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = value if name == 'module' else int(value)
+    return options
+
+
+def _profile(module):
+    """
+    Return the wall time of the process and a list of (self, cumulative,
+    name) tuples (in microseconds) for all the imported modules.
+    """
+    env = dict(os.environ, PYTHONPATH=_ROOT)
+
+    start = time.time()
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+        stderr=subprocess.STDOUT, env=env, cwd=_ROOT)
+    seconds = time.time() - start
+
+    modules = []
+    for line in output.decode('utf-8').splitlines():
+        if line.startswith('import time:') and '|' in line:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            try:
+                modules.append((int(self_us), int(cumulative_us), name.rstrip()))
+            except ValueError:
+                pass  # The header.
+
+    return seconds, modules
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+    module = options['module']
+
+    runs = [_profile(module) for i in range(options['runs'])]
+    seconds, modules = min(runs, key=lambda r: dict((n.strip(), c) for s, c, n in r[1])[module])
+    total = dict((n.strip(), c) for s, c, n in modules)[module]
+
+    print('import %s: %.1f ms (process: %.1f ms, best of %i)' % (
+        module, total / 1000., seconds * 1000, options['runs']))
+    print('')
+    print('    self   cumulative  module')
+
+    for self_us, cumulative_us, name in sorted(modules, key=lambda m: -m[1])[:options['top']]:
+        print('%6.1f ms  %8.1f ms  %s' % (self_us / 1000., cumulative_us / 1000., name))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Benchmark for the parsing of VT100 input.
+
+Feeds a paste-sized block of text (with some escape sequences in between)
+through an `InputStream`, and reports the throughput in characters per
+second. The key presses go to a processor that only counts them.
+
+Usage::
+
+    python benchmarks/input_parsing.py [--size=50000] [--repeat=3]
+"""
+from __future__ import unicode_literals, print_function
+
+import sys
+import time
+
+from prompt_toolkit.terminal.vt100_input import InputStream
+
+_CODE = '''def distance_to(self, other):\r    """ Distance between two points. """\r    return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** .5\r\r'''
+
+
+class _CountingProcessor(object):
+    def __init__(self):
+        self.count = 0
+
+    def feed_key(self, key_press):
+        self.count += 1
+
+
+def _parse_args(argv):
+    options = {'size': 50000, 'repeat': 3}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    chunk = _CODE + '\x1b[A\x1b[B\x1b[1;3D\x1b[15~'
+    data = (chunk * (options['size'] // len(chunk) + 1))[:options['size']]
+
+    timings = []
+    for i in range(options['repeat']):
+        processor = _CountingProcessor()
+        stream = InputStream(processor)
+
+        start = time.time()
+        stream.feed(data)
+        stream.flush()
+        timings.append(time.time() - start)
+
+    seconds = min(timings)
+
+    print('Characters:  %i' % len(data))
+    print('Key presses: %i' % processor.count)
+    print('Time:        %.3f s' % seconds)
+    print('Throughput:  %.0f characters/s' % (len(data) / seconds))
+
+
+if __name__ == '__main__':
+    main()
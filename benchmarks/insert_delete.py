@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Benchmark for the bytes written to the terminal for edits in the middle of a
+buffer, with and without the insert and delete sequences of the terminal
+(`Renderer.use_insert_delete`).
+
+Replays key strokes in a command line interface with a multiline Python
+buffer of 30 lines (in a terminal of 120x40), and counts the bytes that the
+renderer writes.
+
+Usage::
+
+    python benchmarks/insert_delete.py
+"""
+from __future__ import unicode_literals, print_function
+
+import fcntl
+import functools
+import os
+import pty
+import struct
+import termios
+
+from pygments.lexers import PythonLexer
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.key_bindings.emacs import emacs_bindings
+from prompt_toolkit.key_bindings.vi import vi_bindings
+from prompt_toolkit.layout import Layout
+from prompt_toolkit.line import Line
+from prompt_toolkit.renderer import Renderer
+from prompt_toolkit.terminal.vt100_input import InputStream
+
+_TEXT = '\n'.join(
+    'def function_%i(a, b=%i):' % (i, i) if i % 5 == 0 else
+    '    value = [x ** 2 for x in range(%i) if x %% 3]  # Comment.' % i
+    for i in range(30))
+
+_UP = '\x1b[A'
+_START_OF_LINE = '\x01'  # Control-A
+
+
+class _Stdout(object):
+    """
+    Fake stdout, which counts the bytes that are written to it. `fileno`
+    returns the pty, for the terminal size.
+    """
+    def __init__(self, fd):
+        self.fd = fd
+        self.bytes_written = 0
+
+    def fileno(self):
+        return self.fd
+
+    def write(self, data):
+        self.bytes_written += len(data.encode('utf-8'))
+
+    def flush(self):
+        pass
+
+
+# (name, key bindings, key strokes to the position, key strokes that are
+# counted) for every pattern. The cursor starts at the end of the buffer.
+_PATTERNS = [
+    ('type at start of line', emacs_bindings, [_UP] * 15 + [_START_OF_LINE], list('abcde')),
+    ('backspace in line', emacs_bindings, [_UP] * 15 + [_START_OF_LINE] + list('abcde'), ['\x7f'] * 5),
+    ('insert lines', emacs_bindings, [_UP] * 15, ['\r'] * 5),
+    ('join lines', emacs_bindings, [_UP] * 15 + [_START_OF_LINE], ['\x7f'] * 5),
+    ('vi dd', vi_bindings, ['\x1b', 'g', 'g'] + ['j'] * 10, ['d', 'd'] * 5),
+    ('vi x', vi_bindings, ['\x1b', 'g', 'g'] + ['j'] * 10 + ['0'], ['x'] * 5),
+]
+
+
+def _run(key_bindings, position_keys, keys, slave, use_insert_delete):
+    """
+    Replay the key strokes, return the number of bytes written for `keys`.
+    """
+    stdout = _Stdout(slave)
+    cli = CommandLineInterface(
+        stdout=stdout,
+        line=Line(is_multiline=True),
+        layout=Layout(lexer=PythonLexer),
+        key_binding_factories=[key_bindings],
+        renderer_factory=functools.partial(Renderer, use_insert_delete=use_insert_delete))
+    cli.line.reset(initial_value=_TEXT)
+
+    # Like the answer to the cursor position request: the output starts at
+    # the top of the terminal.
+    cli.renderer.report_absolute_cursor_row(1)
+
+    inputstream = InputStream(cli.input_processor)
+
+    def feed(key):
+        inputstream.feed(key)
+        inputstream.flush()
+        cli.renderer.render(cli)
+
+    cli.renderer.render(cli)
+    for key in position_keys:
+        feed(key)
+
+    stdout.bytes_written = 0
+    for key in keys:
+        feed(key)
+
+    return stdout.bytes_written
+
+
+def main(argv=None):
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack(str('HHHH'), 40, 120, 0, 0))
+
+    print('                          keys   without       with')
+
+    try:
+        totals = [0, 0]
+        for name, key_bindings, position_keys, keys in _PATTERNS:
+            result = [_run(key_bindings, position_keys, keys, slave, use_insert_delete)
+                      for use_insert_delete in (False, True)]
+            totals = [t + r for t, r in zip(totals, result)]
+            print('%-23s %6i %9i %10i' % ((name, len(keys)) + tuple(result)))
+
+        print('%-23s %6s %9i %10i' % (('total', '') + tuple(totals)))
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Benchmark for reverse incremental search (Ctrl-R) in the history.
+
+Fills a history with the given number of entries, and types a search string
+that only matches an entry at the start of the history, one character at a
+time, followed by a few Ctrl-R presses. This is done for a `History` and for
+a `FileHistory`.
+
+Usage::
+
+    python benchmarks/isearch.py [--entries=10000,100000,500000]
+"""
+from __future__ import unicode_literals, print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from prompt_toolkit.enums import IncrementalSearchDirection
+from prompt_toolkit.history import History, FileHistory
+from prompt_toolkit.line import Line
+
+
+def _parse_args(argv):
+    options = {'entries': [10000, 100000, 500000]}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = [int(v) for v in value.split(',')]
+    return options
+
+
+def _fill(history, count):
+    for i in range(count):
+        if i == 10:
+            history.append('import unique_module_name')
+        elif i in (20, 30):
+            history.append('unique_module_name.run(%i)' % i)
+        else:
+            history.append('result = [x ** 2 for x in range(%i) if x %% 3]' % i)
+
+
+def _time_per_keystroke(history):
+    line = Line(history=history)
+
+    keystrokes = 0
+    start = time.time()
+
+    line.start_isearch(IncrementalSearchDirection.BACKWARD)
+
+    query = 'unique_module_name'
+    for i in range(1, len(query) + 1):
+        line.set_search_text(query[:i])
+        keystrokes += 1
+
+    for i in range(3):
+        line.incremental_search(IncrementalSearchDirection.BACKWARD)
+        keystrokes += 1
+
+    seconds = time.time() - start
+
+    assert line.text == 'import unique_module_name'
+    return seconds / keystrokes
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    print('                   History    FileHistory')
+
+    directory = tempfile.mkdtemp()
+    try:
+        for count in options['entries']:
+            history = History()
+            _fill(history, count)
+
+            filename = os.path.join(directory, 'history-%i' % count)
+            _fill(FileHistory(filename), count)
+
+            print('%7i entries: %8.2f ms %11.2f ms' % (
+                count,
+                _time_per_keystroke(history) * 1000,
+                _time_per_keystroke(FileHistory(filename)) * 1000))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Benchmark for the dispatching of key presses to key bindings.
+
+Creates a registry with the key sequences of the Vi bindings, plus a number of
+custom Control-X prefixed bindings, and feeds synthetic key presses through an
+`InputProcessor`. All handlers do nothing, so only the lookup of the bindings
+is measured.
+
+Usage::
+
+    python benchmarks/key_bindings.py [--keys=100000] [--custom=50]
+"""
+from __future__ import unicode_literals, print_function
+
+import io
+import string
+import sys
+import time
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.enums import InputMode
+from prompt_toolkit.key_binding import InputProcessor, Registry, KeyPress
+from prompt_toolkit.key_bindings.vi import vi_bindings
+from prompt_toolkit.keys import Keys
+
+
+def _parse_args(argv):
+    options = {'keys': 100000, 'custom': 50}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _create_registry(options):
+    """
+    Registry with the key sequences of the Vi bindings, but handlers that
+    don't do anything.
+    """
+    cli = CommandLineInterface(stdout=io.StringIO(), key_binding_factories=[vi_bindings])
+    vi_registry = cli.input_processor._registry
+
+    registry = Registry()
+
+    def handler(event):
+        pass
+
+    for binding in vi_registry.key_bindings:
+        registry.add_binding(*binding.keys, in_mode=binding.input_mode)(handler)
+
+    for i in range(options['custom']):
+        registry.add_binding(Keys.ControlX, string.printable[i])(handler)
+
+    return registry
+
+
+def _key_presses(options):
+    """
+    Synthetic input: mostly text, with some Vi commands and Control-X
+    sequences in between.
+    """
+    pattern = (
+        [KeyPress(c, c) for c in 'hello world'] +
+        [KeyPress(Keys.ControlX, '\x18'), KeyPress('b', 'b')] +
+        [KeyPress(c, c) for c in 'dwciw'] +
+        [KeyPress(Keys.ControlSquareClose, '\x1d'), KeyPress('x', 'x')] +
+        [KeyPress(Keys.Left, '\x1b[D'), KeyPress(Keys.Backspace, '\x7f')]
+    )
+    return [pattern[i % len(pattern)] for i in range(options['keys'])]
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    registry = _create_registry(options)
+    key_presses = _key_presses(options)
+
+    result = []
+    for input_mode in (InputMode.INSERT, InputMode.VI_NAVIGATION):
+        processor = InputProcessor(registry)
+        processor.input_mode = input_mode
+
+        start = time.time()
+        for key_press in key_presses:
+            processor.feed_key(key_press)
+        result.append((input_mode, time.time() - start))
+
+    print('Key bindings:    %i' % len(registry.key_bindings))
+    print('Key presses:     %i' % len(key_presses))
+
+    for input_mode, seconds in result:
+        print('%-16s %.3f s (%.2f us per key press)' % (
+            input_mode + ':', seconds, seconds * 1000000 / len(key_presses)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Benchmark for the lexing of the input.
+
+Simulates a large paste (2000 lines of Python by default), followed by typing
+characters in the middle of it. For every keystroke, the whole text is lexed
+again, once with the Pygments lexer itself and once with the
+`IncrementalLexer`.
+
+Usage::
+
+    python benchmarks/lexing.py [--lines=2000] [--keystrokes=50]
+"""
+from __future__ import unicode_literals, print_function
+
+import sys
+import time
+
+from pygments.lexers import PythonLexer
+
+from prompt_toolkit.layout.lexers import IncrementalLexer
+
+_CODE = '''
+class Point(object):
+    """ A point in a two dimensional space. """
+    def __init__(self, x=0, y=0):
+        self.x = x  # Horizontal position.
+        self.y = y
+
+    def distance_to(self, other):
+        return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** .5
+
+'''
+
+
+def _parse_args(argv):
+    options = {'lines': 2000, 'keystrokes': 50}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _texts(options):
+    """
+    Return the text after every keystroke.
+    """
+    code_lines = _CODE.split('\n')
+    lines = [code_lines[i % len(code_lines)] for i in range(options['lines'])]
+
+    before = '\n'.join(lines[:len(lines) // 2]) + '\n'
+    after = '\n'.join(lines[len(lines) // 2:])
+
+    typed = 'value = 1 + 2  # Typed.'
+    return [before + typed[:i % len(typed)] + after for i in range(options['keystrokes'])]
+
+
+def _time_per_keystroke(get_tokens, texts):
+    start = time.time()
+    for text in texts:
+        get_tokens(text)
+    return (time.time() - start) / len(texts)
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+    texts = _texts(options)
+
+    lexer = PythonLexer(stripnl=False, stripall=False, ensurenl=False)
+    full = _time_per_keystroke(lambda text: list(lexer.get_tokens(text)), texts)
+
+    incremental_lexer = IncrementalLexer(lexer)
+
+    start = time.time()
+    incremental_lexer.get_tokens(texts[0])
+    paste = time.time() - start
+
+    incremental = _time_per_keystroke(incremental_lexer.get_tokens, texts[1:])
+
+    print('Lines:                             %i' % options['lines'])
+    print('Full lexing, per keystroke:        %.2f ms' % (full * 1000))
+    print('Incremental lexing, initial paste: %.2f ms' % (paste * 1000))
+    print('Incremental lexing, per keystroke: %.2f ms' % (incremental * 1000))
+
+
+if __name__ == '__main__':
+    main()
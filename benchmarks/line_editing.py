@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Benchmark for editing large inputs.
+
+Types characters (followed by some backspaces) in the middle and at the end
+of a large `Line`, once with the text stored as a plain string and once in a
+gap buffer. This is measured twice: once for just the edits, and once when
+also accessing `Line.document` after every key press, like the key handlers
+and the renderer do.
+
+Usage::
+
+    python benchmarks/line_editing.py [--size=1000000] [--keystrokes=2000]
+"""
+from __future__ import unicode_literals, print_function
+
+import sys
+import time
+
+from prompt_toolkit.line import Line
+
+
+def _parse_args(argv):
+    options = {'size': 1000000, 'keystrokes': 2000}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _time_per_keystroke(options, gap_buffer, position, read_document):
+    line = Line(gap_buffer=gap_buffer)
+    line.text = ('x' * 79 + '\n') * (options['size'] // 80)
+    line.cursor_position = int(len(line.text) * position)
+
+    keystrokes = options['keystrokes']
+
+    start = time.time()
+    for i in range(keystrokes):
+        if i % 10 < 8:
+            line.insert_text('a')
+        else:
+            line.delete_before_cursor()
+
+        if read_document:
+            line.document
+    return (time.time() - start) / keystrokes
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    print('Text size:  %i' % options['size'])
+    print('Keystrokes: %i' % options['keystrokes'])
+    print('')
+    print('                           string    gap buffer')
+
+    for read_document in (False, True):
+        for name, position in (('middle', .5), ('end', 1)):
+            string = _time_per_keystroke(options, False, position, read_document)
+            gap_buffer = _time_per_keystroke(options, True, position, read_document)
+
+            print('%-25s %7.1f us  %7.1f us' % (
+                'typing at %s%s:' % (name, ' + doc' if read_document else ''),
+                string * 1000000, gap_buffer * 1000000))
+
+
+if __name__ == '__main__':
+    main()
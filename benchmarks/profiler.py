@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Benchmark for the overhead of the profiler.
+
+Types characters in a command line interface, that renders to a pseudo
+terminal. Every keystroke goes through the `InputStream`, the key bindings
+and the renderer, like in `read_input`. This is done without a profiler,
+with a `Profiler`, and with a `Profiler` that records every frame to a file.
+Reports the time per keystroke (best of a few runs).
+
+Usage::
+
+    python benchmarks/profiler.py [--keystrokes=500] [--runs=5]
+"""
+from __future__ import unicode_literals, print_function
+
+import fcntl
+import io
+import os
+import pty
+import shutil
+import struct
+import sys
+import tempfile
+import termios
+import time
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.profiler import Profiler, FrameRecorder
+from prompt_toolkit.terminal.vt100_input import InputStream
+
+
+def _parse_args(argv):
+    options = {'keystrokes': 500, 'runs': 5}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _run(options, profiler):
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack(str('HHHH'), 40, 120, 0, 0))
+    fcntl.fcntl(master, fcntl.F_SETFL, os.O_NONBLOCK)
+    stdout = io.open(slave, 'w')
+
+    def drain():
+        try:
+            while os.read(master, 65536):
+                pass
+        except OSError:
+            pass
+
+    try:
+        cli = CommandLineInterface(stdout=stdout, profiler=profiler)
+        cli.input_processor.profiler = profiler
+        inputstream = InputStream(cli.input_processor)
+
+        best = None
+        for run in range(options['runs']):
+            cli.line.reset()
+            cli.renderer.reset()
+
+            start = time.time()
+            for i in range(options['keystrokes']):
+                input_start = time.time()
+                inputstream.feed('x')
+                inputstream.flush()
+                if profiler:
+                    profiler.add_time('input', input_start)
+
+                cli.renderer.render(cli)
+                drain()
+
+            seconds = (time.time() - start) / options['keystrokes']
+            best = seconds if best is None else min(best, seconds)
+    finally:
+        stdout.close()
+        os.close(master)
+
+    return best
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    print('Keystrokes: %i (best of %i runs)' % (options['keystrokes'], options['runs']))
+    print('')
+    print('                     per keystroke')
+
+    directory = tempfile.mkdtemp()
+    try:
+        recording = Profiler()
+        recording.onFrame += FrameRecorder(os.path.join(directory, 'session.log'))
+
+        for name, profiler in (('no profiler', None),
+                               ('profiler', Profiler()),
+                               ('profiler + recorder', recording)):
+            print('%-20s %10.1f us' % (name, _run(options, profiler) * 1000000))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Benchmark for reading a large input from a pseudo terminal.
+
+Writes the given number of MB through a pty to a child process that runs the
+`PosixEventLoop` (in raw mode). The key presses are only counted, so that
+this measures the reading and parsing of the input, and the number of times
+that `loop()` returns. (`read_input` renders after every return.)
+
+Usage::
+
+    python benchmarks/pty_input.py [--size=10] [--read-sizes=1024,65536]
+"""
+from __future__ import unicode_literals, print_function
+
+import fcntl
+import os
+import pty
+import select
+import struct
+import sys
+import termios
+import threading
+import time
+
+
+class _KeyCounter(object):
+    """
+    Takes the place of the `InputProcessor`.
+    """
+    def __init__(self):
+        self.count = 0
+
+    def feed_key(self, key_press):
+        self.count += 1
+
+
+def _parse_args(argv):
+    options = {'size': 10, 'read-sizes': [1024, 64 * 1024]}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        if name == 'read-sizes':
+            options[name] = [int(v) for v in value.split(',')]
+        else:
+            options[name] = int(value)
+    return options
+
+
+def _child(options):
+    """
+    Run the event loop until all the input has been received. (In the pty.)
+    """
+    from prompt_toolkit.eventloop.posix import PosixEventLoop
+    from prompt_toolkit.terminal.vt100_input import raw_mode
+
+    total = options['size'] * 1024 * 1024
+    PosixEventLoop.stdin_read_size = options['read-size']
+
+    counter = _KeyCounter()
+    eventloop = PosixEventLoop(counter, sys.stdin)
+    returns = 0
+
+    with raw_mode(sys.stdin.fileno()):
+        # Tell the parent that we're ready.
+        os.write(sys.stdout.fileno(), b'ready\n')
+
+        start = time.time()
+        while counter.count < total:
+            eventloop.loop()
+            returns += 1
+        seconds = time.time() - start
+
+    eventloop.close()
+    sys.stderr.write('%i %f\n' % (returns, seconds))
+
+
+def _run(options, read_size):
+    stderr_read, stderr_write = os.pipe()
+
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.dup2(stderr_write, 2)
+        os.execv(sys.executable, [
+            sys.executable, __file__, '--child=1', '--size=%i' % options['size'],
+            '--read-size=%i' % read_size])
+
+    os.close(stderr_write)
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack(str('HHHH'), 24, 80, 0, 0))
+
+    # Wait until the child is in raw mode.
+    output = b''
+    while b'ready' not in output:
+        output += os.read(fd, 1024)
+
+    def write():
+        data = b'abcdefghijklmnopqrstuvwxyz' * 4096
+        remaining = options['size'] * 1024 * 1024
+        while remaining > 0:
+            remaining -= os.write(fd, data[:remaining])
+
+    thread = threading.Thread(target=write)
+    thread.daemon = True
+    thread.start()
+
+    result = b''
+    while True:
+        r, _, _ = select.select([fd, stderr_read], [], [])
+        if fd in r:
+            try:
+                os.read(fd, 65536)
+            except OSError:
+                pass
+        if stderr_read in r:
+            data = os.read(stderr_read, 1024)
+            if not data:
+                break
+            result += data
+
+    os.waitpid(pid, 0)
+    os.close(fd)
+    os.close(stderr_read)
+
+    returns, seconds = result.split()
+    return int(returns), float(seconds)
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    if options.pop('child', None):
+        _child(options)
+        return
+
+    print('Input size: %i MB' % options['size'])
+    print('')
+    print('read size     loop returns        time    throughput')
+
+    for read_size in options['read-sizes']:
+        returns, seconds = _run(options, read_size)
+        print('%9i %16i %8.2f s %8.1f MB/s' % (
+            read_size, returns, seconds, options['size'] / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Benchmark for redraws during fast typing and background redraw requests.
+
+Runs a command line interface in a pseudo terminal. A background thread calls
+`request_redraw` in a loop, while characters are typed with a short delay
+between them (like key repeat). Then Enter is pressed. Reports how many
+renders were requested and performed, how many bytes were written to the
+terminal, and how long it took until the input was returned.
+
+This is done with `min_redraw_interval=0` (render for every request) and with
+the default interval.
+
+Usage::
+
+    python benchmarks/redraw.py [--keystrokes=300] [--delay-us=2000] [--redraw-requests-per-second=1000]
+"""
+from __future__ import unicode_literals, print_function
+
+import fcntl
+import os
+import pty
+import select
+import struct
+import sys
+import termios
+import time
+
+
+def _parse_args(argv):
+    options = {'keystrokes': 300, 'delay-us': 2000, 'redraw-requests-per-second': 1000}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = float(value) if name == 'min-redraw-interval' else int(value)
+    return options
+
+
+def _child(options):
+    """
+    Run the command line interface. (In the pseudo terminal.)
+    """
+    from prompt_toolkit import CommandLineInterface
+
+    kwargs = {}
+    if 'min-redraw-interval' in options:
+        kwargs['min_redraw_interval'] = options['min-redraw-interval']
+
+    cli = CommandLineInterface(**kwargs)
+    delay = 1. / options['redraw-requests-per-second']
+
+    def on_read_start():
+        def run():
+            while cli.is_reading_input:
+                time.sleep(delay)
+                cli.request_redraw()
+        cli.run_in_executor(run)
+    cli.onReadInputStart += on_read_start
+
+    cli.read_input()
+
+    sys.stderr.write('%i %i\n' % (cli.renders_requested, cli.renders_performed))
+
+
+def _run(options, min_redraw_interval):
+    args = [sys.executable, __file__, '--child=1']
+    args.extend('--%s=%s' % (k, v) for k, v in options.items())
+    if min_redraw_interval is not None:
+        args.append('--min-redraw-interval=%s' % min_redraw_interval)
+
+    stderr_read, stderr_write = os.pipe()
+
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.dup2(stderr_write, 2)
+        os.execv(sys.executable, args)
+
+    os.close(stderr_write)
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack(str('HHHH'), 24, 80, 0, 0))
+
+    output = [0]
+
+    def read_output(timeout):
+        end = time.time() + timeout
+        while True:
+            r, _, _ = select.select([fd], [], [], max(0, end - time.time()))
+            if not r:
+                return
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                return
+            if not data:
+                return
+            output[0] += len(data)
+
+            # Answer cursor position requests.
+            if b'\x1b[6n' in data:
+                os.write(fd, b'\x1b[1;1R')
+
+    read_output(.5)
+    output[0] = 0
+
+    start = time.time()
+    for i in range(options['keystrokes']):
+        os.write(fd, b'x')
+        read_output(options['delay-us'] / 1000000.)
+    os.write(fd, b'\r')
+
+    result = b''
+    while not result.endswith(b'\n'):
+        r, _, _ = select.select([fd, stderr_read], [], [], 10)
+        if fd in r:
+            read_output(0)
+        if stderr_read in r:
+            data = os.read(stderr_read, 1024)
+            if not data:
+                break
+            result += data
+
+    seconds = time.time() - start
+    os.waitpid(pid, 0)
+    os.close(fd)
+    os.close(stderr_read)
+
+    requested, performed = result.split()
+    return int(requested), int(performed), output[0], seconds
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    if options.pop('child', None):
+        _child(options)
+        return
+
+    print('Keystrokes:      %i (%i us apart)' % (options['keystrokes'], options['delay-us']))
+    print('Redraw requests: %i/s' % options['redraw-requests-per-second'])
+    print('')
+    print('                        requested  performed       bytes      time')
+
+    for name, min_redraw_interval in (('no interval', 0), ('default interval', None)):
+        requested, performed, output, seconds = _run(options, min_redraw_interval)
+        print('%-22s %10i %10i %11i %7.0f ms' % (name, requested, performed, output, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
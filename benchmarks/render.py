@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Benchmark for the renderer.
+
+Simulates typing at the end of a long multiline input on a large terminal:
+every "keystroke" fills a new `Screen` and diffs it against the previous one,
+like `Renderer.render` does. Reports the time per render and the memory that
+is allocated for every `Screen`.
+
+The time of `output_screen_diff` alone is also reported for a keystroke that
+only moves the cursor and for typing in the middle of the screen.
+
+Usage::
+
+    python benchmarks/render.py [--rows=80] [--columns=250] [--renders=50]
+"""
+from __future__ import unicode_literals, print_function
+
+import gc
+import sys
+import timeit
+
+from pygments.styles.default import DefaultStyle
+from pygments.token import Token
+
+from prompt_toolkit.renderer import Screen, Size, Point, output_screen_diff
+from prompt_toolkit.terminal.vt100_output import Vt100_Output
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+class _NullStdout(object):
+    """ Stdout replacement that drops everything. """
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+def _create_text(rows, columns):
+    line = ('def function(a, b): return a + b  ' * columns)[:columns - 1]
+    return '\n'.join(line for i in range(rows - 1))
+
+
+def _fill_screen(size, text):
+    screen = Screen(size)
+    screen.write_highlighted([(Token.Name, text), (Token, ' ')])
+    return screen
+
+
+def _parse_args(argv):
+    options = {'rows': 80, 'columns': 250, 'renders': 50}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+    size = Size(rows=options['rows'], columns=options['columns'])
+    text = _create_text(options['rows'], options['columns'])
+    output = Vt100_Output(_NullStdout())
+
+    state = {'screen': _fill_screen(size, text), 'text': text}
+    output_screen_diff(output, state['screen'], Point(0, 0), style=DefaultStyle)
+
+    def render():
+        # Type one character at the end of the input.
+        state['text'] += 'x'
+        screen = _fill_screen(size, state['text'])
+        output_screen_diff(output, screen, Point(0, 0), state['screen'],
+                           style=DefaultStyle)
+        state['screen'] = screen
+        output._buffer = []
+
+    # Time per render.
+    renders = options['renders']
+    seconds = min(timeit.repeat(render, number=renders, repeat=3)) / renders
+
+    print('Terminal size:         %ix%i' % (size.columns, size.rows))
+    print('Time per render:       %.2f ms' % (seconds * 1000))
+
+    # Time per diff.
+    lines = text.split('\n')
+    middle = len(lines) // 2
+    typed_text = '\n'.join(lines[:middle] + ['x' + lines[middle][1:]] + lines[middle + 1:])
+
+    for name, new_text in [('cursor movement', text), ('typing in the middle', typed_text)]:
+        previous_screen = _fill_screen(size, text)
+        screen = _fill_screen(size, new_text)
+
+        def diff():
+            output_screen_diff(output, screen, Point(0, 0), previous_screen,
+                               style=DefaultStyle)
+            output._buffer = []
+
+        seconds = min(timeit.repeat(diff, number=renders, repeat=3)) / renders
+        print('Time per diff (%s): %.3f ms' % (name, seconds * 1000))
+
+    # Memory per screen.
+    if tracemalloc:
+        gc.collect()
+        tracemalloc.start()
+        screen = _fill_screen(size, text)
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sum(s.count for s in tracemalloc.take_snapshot().statistics('filename'))
+        tracemalloc.stop()
+
+        print('Memory per screen:     %.1f KiB' % (current / 1024.))
+        print('Blocks per screen:     %i' % blocks)
+
+        gc.collect()
+        tracemalloc.start()
+        render()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print('Peak memory per render: %.1f KiB' % (peak / 1024.))
+
+
+if __name__ == '__main__':
+    main()
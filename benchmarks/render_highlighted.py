@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Benchmark for the styling of the output.
+
+Renders a Pygments-highlighted Python buffer of 200 lines from scratch (no
+previous screen to diff against), so that every change of token has to be
+translated into terminal attributes.
+
+Usage::
+
+    python benchmarks/render_highlighted.py [--lines=200] [--renders=50]
+"""
+from __future__ import unicode_literals, print_function
+
+import sys
+import timeit
+
+from pygments.lexers import PythonLexer
+from pygments.styles.default import DefaultStyle
+
+from prompt_toolkit.renderer import Screen, Size, Point, output_screen_diff
+from prompt_toolkit.terminal.vt100_output import Vt100_Output
+
+_CODE = '''
+class Point(object):
+    """ A point in a two dimensional space. """
+    def __init__(self, x=0, y=0):
+        self.x = x  # Horizontal position.
+        self.y = y
+
+    def distance_to(self, other):
+        return ((self.x - other.x) ** 2 + (self.y - other.y) ** 2) ** .5
+
+'''
+
+
+def _parse_args(argv):
+    options = {'lines': 200, 'renders': 50}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    code_lines = _CODE.split('\n')
+    text = '\n'.join(code_lines[i % len(code_lines)] for i in range(options['lines']))
+
+    lexer = PythonLexer(stripnl=False, stripall=False, ensurenl=False)
+    tokens = list(lexer.get_tokens(text))
+
+    size = Size(rows=options['lines'], columns=120)
+    screen = Screen(size)
+    screen.write_highlighted(tokens)
+
+    output = Vt100_Output(None)
+
+    def render():
+        output_screen_diff(output, screen, Point(0, 0), style=DefaultStyle)
+        output._buffer = []
+
+    renders = options['renders']
+    seconds = min(timeit.repeat(render, number=renders, repeat=3)) / renders
+
+    print('Lines:                %i' % options['lines'])
+    print('Tokens:               %i' % len(tokens))
+    print('Time per full render: %.2f ms' % (seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
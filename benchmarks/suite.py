@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+"""
+Benchmark suite with scripted terminal sessions.
+
+Every scenario replays a key stream, as it would arrive from a terminal,
+against a `CommandLineInterface` with buffers of increasing size. Every chunk
+of the stream goes through the `InputStream`, the key bindings and the
+renderer, like in `read_input`. The output is written to a fake stdout on top
+of a pseudo terminal of 120x40. (The terminal size comes from the pty, the
+output is only counted.)
+
+Scenarios:
+
+- ``typing``: Type a line of Python code at the end of a Python buffer.
+- ``paste``: Bracketed pastes of ten lines at the end of the buffer.
+- ``vi``: Vi motions (``j``, ``k``, ``w``, ``b``, ``$``, ``0``, ``G``,
+  ``gg``, ``dd``, ``u``) in a Python buffer.
+- ``ctrl_r``: Reverse incremental search in a history of `size` entries,
+  aborted with Ctrl-G.
+- ``completion``: Tab through a completion menu of `size` completions.
+
+For every scenario and size, the latency of every chunk (from feeding the
+input until the output was flushed) and the number of bytes written to the
+terminal are reported. The results are compared with a stored baseline: more
+bytes than in the baseline, and latencies that are more than `threshold` times
+the baseline are reported as regressions. (The exit code is 1 in that case.)
+Latencies that are less than `min-difference` milliseconds slower than the
+baseline are never regressions: for sub-millisecond latencies, the ratio is
+mostly noise.
+
+The latencies are the median of `runs` runs. The stored baseline is saved
+with more runs (``--runs=9``), so that it's less noisy.
+
+This measures the prompt_toolkit of this source tree, not an installed one.
+
+Usage::
+
+    python benchmarks/suite.py [--sizes=10,100,1000] [--runs=3] [--threshold=1.5]
+                               [--min-difference=1]
+                               [--baseline=benchmarks/suite_baseline.json]
+                               [--save-baseline=benchmarks/suite_baseline.json]
+"""
+from __future__ import unicode_literals, print_function
+
+import fcntl
+import json
+import os
+import pty
+import struct
+import sys
+import termios
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pygments.lexers import PythonLexer
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.history import History
+from prompt_toolkit.key_bindings.emacs import emacs_bindings
+from prompt_toolkit.key_bindings.vi import vi_bindings
+from prompt_toolkit.layout import Layout
+from prompt_toolkit.layout.menus import CompletionsMenu
+from prompt_toolkit.line import Line
+from prompt_toolkit.terminal.vt100_input import InputStream
+
+_DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'suite_baseline.json')
+
+_ROWS = 40
+_COLUMNS = 120
+
+
+def _parse_args(argv):
+    options = {
+        'sizes': [10, 100, 1000],
+        'runs': 3,
+        'threshold': 1.5,
+        'min-difference': 1.,
+        'baseline': _DEFAULT_BASELINE,
+        'save-baseline': None,
+    }
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        if name == 'sizes':
+            options[name] = [int(v) for v in value.split(',')]
+        elif name == 'runs':
+            options[name] = int(value)
+        elif name in ('threshold', 'min-difference'):
+            options[name] = float(value)
+        else:
+            options[name] = value
+    return options
+
+
+class _Stdout(object):
+    """
+    Fake stdout, which counts the bytes that are written to it. `fileno`
+    returns the pty, for the terminal size.
+    """
+    def __init__(self, fd):
+        self.fd = fd
+        self.bytes_written = 0
+
+    def fileno(self):
+        return self.fd
+
+    def write(self, data):
+        self.bytes_written += len(data.encode('utf-8'))
+
+    def flush(self):
+        pass
+
+
+class _WordCompleter(Completer):
+    """
+    Completer that yields `count` words for every input.
+    """
+    def __init__(self, count):
+        self.words = ['variable_%04i' % i for i in range(count)]
+
+    def get_completions(self, document):
+        word = document.get_word_before_cursor()
+        for w in self.words:
+            if w.startswith(word):
+                yield Completion(w, -len(word))
+
+
+def _python_text(lines):
+    """
+    Python source code of the given amount of lines.
+    """
+    result = []
+    for i in range(lines):
+        if i % 10 == 0:
+            result.append('def function_%i(a, b=%i):' % (i, i))
+        elif i % 10 == 5:
+            result.append('    """ Docstring of line %i. """' % i)
+        else:
+            result.append('    value = [x ** 2 for x in range(%i) if x %% 3]  # Comment.' % i)
+    return '\n'.join(result)
+
+
+# Every session returns the `CommandLineInterface` keyword arguments for the
+# given size, the initial text of the input and the key stream, as a list of
+# chunks. A chunk is the input of one read from the terminal.
+
+def _typing_session(size):
+    chunks = list('\n    result = function_0(value, b=[1, 2, 3])  # Typed.')
+    return dict(line=Line(is_multiline=True), layout=Layout(lexer=PythonLexer)), _python_text(size), chunks
+
+
+def _paste_session(size):
+    paste = '\x1b[200~%s\x1b[201~' % _python_text(10).replace('\n', '\r')
+    return dict(line=Line(is_multiline=True), layout=Layout(lexer=PythonLexer)), _python_text(size), [paste] * 10
+
+
+def _vi_session(size):
+    chunks = ['\x1b', 'g', 'g'] + ['j'] * 10 + ['w'] * 5 + ['b'] * 5 + ['$', '0'] + \
+             ['k'] * 5 + ['G'] + ['d', 'd', 'u'] + ['g', 'g']
+    return dict(line=Line(is_multiline=True), layout=Layout(lexer=PythonLexer),
+                key_binding_factories=[vi_bindings]), _python_text(size), chunks
+
+
+def _ctrl_r_session(size):
+    history = History()
+    for i in range(size):
+        history.append('result = function_%i(value, b=[%i])' % (i, i))
+
+    chunks = []
+    for query in ('function_1', 'b=[5', 'value'):
+        chunks.extend(['\x12'] + list(query) + ['\x12', '\x12', '\x07'])
+
+    return dict(line=Line(history=history), key_binding_factories=[emacs_bindings]), '', chunks
+
+
+def _completion_session(size):
+    line = Line(completer=_WordCompleter(size))
+    layout = Layout(menus=[CompletionsMenu()])
+
+    chunks = []
+    for prefix in ('v', 'variable_0', 'variable_00'):
+        chunks.extend(list('x = ' + prefix) + ['\t'] * 5 + ['\x15'])
+
+    return dict(line=line, layout=layout, key_binding_factories=[emacs_bindings],
+                create_async_autocompleters=False), '', chunks
+
+
+_SCENARIOS = [
+    ('typing', _typing_session),
+    ('paste', _paste_session),
+    ('vi', _vi_session),
+    ('ctrl_r', _ctrl_r_session),
+    ('completion', _completion_session),
+]
+
+
+def _percentile(values, percentile):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100.))]
+
+
+def _run(session, size, slave):
+    """
+    Replay the session. Return the list of latencies and the number of bytes
+    written.
+    """
+    kwargs, text, chunks = session(size)
+
+    stdout = _Stdout(slave)
+    cli = CommandLineInterface(stdout=stdout, **kwargs)
+    cli.line.reset(initial_value=text)
+    inputstream = InputStream(cli.input_processor)
+
+    cli.renderer.render(cli)
+    stdout.bytes_written = 0
+
+    latencies = []
+    for chunk in chunks:
+        start = time.time()
+        inputstream.feed(chunk)
+        inputstream.flush()
+        cli.renderer.render(cli)
+        latencies.append(time.time() - start)
+
+    return latencies, stdout.bytes_written
+
+
+def run_suite(sizes, runs):
+    """
+    Run all the scenarios. Return a dictionary that maps 'scenario/size' to a
+    dictionary with the number of chunks, the p50, p99 and max latency (in
+    milliseconds, the median of `runs` runs for each) and the bytes written.
+    (The median, not the best run: the best of more runs is faster, so a
+    baseline with more runs would be biased.)
+    """
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack(str('HHHH'), _ROWS, _COLUMNS, 0, 0))
+
+    results = {}
+    try:
+        for name, session in _SCENARIOS:
+            for size in sizes:
+                run_results = []
+                for run in range(runs):
+                    latencies, bytes_written = _run(session, size, slave)
+                    run_results.append({
+                        'chunks': len(latencies),
+                        'p50': _percentile(latencies, 50) * 1000,
+                        'p99': _percentile(latencies, 99) * 1000,
+                        'max': max(latencies) * 1000,
+                        'bytes': bytes_written,
+                    })
+
+                result = run_results[0]
+                for key in ('p50', 'p99', 'max'):
+                    result[key] = _percentile([r[key] for r in run_results], 50)
+                results['%s/%i' % (name, size)] = result
+    finally:
+        os.close(master)
+        os.close(slave)
+
+    return results
+
+
+def _sort_key(key):
+    name, size = key.split('/')
+    return [n for n, _ in _SCENARIOS].index(name), int(size)
+
+
+def compare(results, baseline, threshold, min_difference):
+    """
+    Return the list of regressions: (key, description) tuples.
+
+    :param min_difference: Latencies that are slower than the baseline by less
+        than this (in milliseconds) are not reported.
+    """
+    regressions = []
+    for key in sorted(results, key=_sort_key):
+        if key not in baseline:
+            continue
+
+        if results[key]['bytes'] > baseline[key]['bytes']:
+            regressions.append((key, 'bytes: %i instead of %i' % (
+                results[key]['bytes'], baseline[key]['bytes'])))
+
+        # Only the median. (p99 and max of a few dozen chunks are noise.)
+        ratio = results[key]['p50'] / max(baseline[key]['p50'], .001)
+        difference = results[key]['p50'] - baseline[key]['p50']
+        if ratio > threshold and difference >= min_difference:
+            regressions.append((key, 'p50: %.2f ms instead of %.2f ms (%.1fx)' % (
+                results[key]['p50'], baseline[key]['p50'], ratio)))
+    return regressions
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    baseline = None
+    if options['baseline'] and os.path.exists(options['baseline']):
+        with open(options['baseline'], 'r') as f:
+            baseline = json.load(f)
+
+    results = run_suite(options['sizes'], options['runs'])
+
+    print('Terminal: %ix%i, median of %i runs' % (_COLUMNS, _ROWS, options['runs']))
+    print('')
+    print('scenario/size      chunks        p50        p99        max      bytes   baseline p50')
+
+    for key in sorted(results, key=_sort_key):
+        r = results[key]
+        if baseline and key in baseline:
+            ratio = '%7.2f ms (%.2fx)' % (baseline[key]['p50'], r['p50'] / max(baseline[key]['p50'], .001))
+        else:
+            ratio = ''
+        print('%-17s %7i %7.2f ms %7.2f ms %7.2f ms %10i   %s' % (
+            key, r['chunks'], r['p50'], r['p99'], r['max'], r['bytes'], ratio))
+
+    if options['save-baseline']:
+        with open(options['save-baseline'], 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('')
+        print('Saved baseline to %s' % options['save-baseline'])
+
+    elif baseline:
+        regressions = compare(results, baseline, options['threshold'], options['min-difference'])
+        print('')
+        if regressions:
+            print('Regressions (threshold %.1fx, at least %.1f ms):' % (
+                options['threshold'], options['min-difference']))
+            for key, description in regressions:
+                print('  %-17s %s' % (key, description))
+            sys.exit(1)
+        else:
+            print('No regressions compared to %s (threshold %.1fx, at least %.1f ms).' % (
+                options['baseline'], options['threshold'], options['min-difference']))
+
+
+if __name__ == '__main__':
+    main()
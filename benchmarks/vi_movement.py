@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Benchmark for cursor movement in Vi navigation mode.
+
+Loads a document of 10k lines into a command line interface with the Vi key
+bindings, and feeds cursor movement keys (j, k, w, b, $, 0, arrow keys, ...)
+through the input processor.
+
+Usage::
+
+    python benchmarks/vi_movement.py [--lines=10000] [--keystrokes=2000]
+"""
+from __future__ import unicode_literals, print_function
+
+import io
+import sys
+import time
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.enums import InputMode
+from prompt_toolkit.key_binding import KeyPress
+from prompt_toolkit.key_bindings.vi import vi_bindings
+from prompt_toolkit.keys import Keys
+
+
+def _parse_args(argv):
+    options = {'lines': 10000, 'keystrokes': 2000}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    cli = CommandLineInterface(stdout=io.StringIO(), key_binding_factories=[vi_bindings])
+    cli.line.text = '\n'.join('    value_%i = compute(%i, other_value)' % (i, i)
+                              for i in range(options['lines']))
+    cli.line.cursor_position = len(cli.line.text) // 2
+
+    processor = cli.input_processor
+    processor.input_mode = InputMode.VI_NAVIGATION
+
+    keys = (
+        [KeyPress(k, k) for k in 'jjjkkwwwbb$0'] +
+        [KeyPress(Keys.Up, ''), KeyPress(Keys.Down, ''), KeyPress(Keys.Left, ''), KeyPress(Keys.Right, '')]
+    )
+
+    keystrokes = options['keystrokes']
+
+    start = time.time()
+    for i in range(keystrokes):
+        processor.feed_key(keys[i % len(keys)])
+    seconds = time.time() - start
+
+    print('Lines:                %i' % options['lines'])
+    print('Keystrokes:           %i' % keystrokes)
+    print('Time per key press:   %.1f us' % (seconds * 1000000 / keystrokes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark for the width of characters and strings.
+
+Measures the time to load the width table (on first use), against building
+the previous cache of `wcwidth` values for the first 64000 code points (at
+import time of `prompt_toolkit.renderer`). Then measures the width of a mixed
+text with ASCII, CJK, emoji and CJK Extension B characters:
+
+- per character, with the previous cache and `wcwidth` as fallback;
+- per character, with `get_cwidth`;
+- for the whole text at once, with `get_width`.
+
+The previous implementation requires the `wcwidth` package.
+
+Usage::
+
+    python benchmarks/width.py [--chars=1000000] [--line-length=80]
+"""
+from __future__ import unicode_literals, print_function
+
+import random
+import subprocess
+import sys
+import time
+
+import six
+from wcwidth import wcwidth
+
+from prompt_toolkit import width
+
+
+def _parse_args(argv):
+    options = {'chars': 1000000, 'line-length': 80}
+    for arg in argv:
+        name, _, value = arg.lstrip('-').partition('=')
+        options[name] = int(value)
+    return options
+
+
+def _create_text(count):
+    """
+    Return a random text of words (1 to 6 characters) in a random script,
+    separated by spaces. About half of the words are ASCII.
+    """
+    random.seed(0)
+    ranges = [
+        (0x20, 0x7e),  # ASCII
+        (0x20, 0x7e),
+        (0x4e00, 0x9fff),  # CJK
+        (0x3041, 0x3096),  # Hiragana
+    ]
+    if sys.maxunicode > 0xffff:
+        ranges.extend([
+            (0x1f600, 0x1f64f),  # Emoji
+            (0x20000, 0x2a6df),  # CJK Extension B
+        ])
+
+    words = []
+    length = 0
+    while length < count:
+        first, last = random.choice(ranges)
+        word = ''.join(six.unichr(random.randint(first, last)) for i in range(random.randint(1, 6)))
+        words.append(word)
+        length += len(word) + 1
+
+    return ' '.join(words)[:count]
+
+
+def _import_time(module):
+    """
+    Time to import `module` in a new process. (Best of a few runs.)
+    """
+    code = 'import time; t = time.time(); import %s; print(time.time() - t)' % module
+    return min(float(subprocess.check_output([sys.executable, '-c', code])) for i in range(5))
+
+
+def main(argv=None):
+    options = _parse_args(sys.argv[1:] if argv is None else argv)
+
+    # Loading.
+    start = time.time()
+    cache = [wcwidth(six.unichr(i)) for i in range(0, 64000)]
+    eager_seconds = time.time() - start
+
+    start = time.time()
+    width._load()
+    load_seconds = time.time() - start
+
+    print('Previous cache (64000 code points):   %7.1f ms' % (eager_seconds * 1000))
+    print('Loading the table (all code points):  %7.1f ms' % (load_seconds * 1000))
+    print('Import of prompt_toolkit.renderer:    %7.1f ms' % (_import_time('prompt_toolkit.renderer') * 1000))
+    print('')
+
+    # Throughput.
+    text = _create_text(options['chars'])
+    line_length = options['line-length']
+    lines = [text[i:i + line_length] for i in range(0, len(text), line_length)]
+
+    def previous_get_width(c):
+        try:
+            return cache[ord(c)]
+        except IndexError:
+            return wcwidth(c)
+
+    def per_char_previous():
+        return sum(max(0, previous_get_width(c)) for c in text)
+
+    def per_char_get_cwidth():
+        get_cwidth = width.get_cwidth
+        return sum(max(0, get_cwidth(c)) for c in text)
+
+    def get_width_lines():
+        get_width = width.get_width
+        return sum(get_width(l) for l in lines)
+
+    def get_width_text():
+        return width.get_width(text)
+
+    print('Text: %i characters (%i lines)' % (len(text), len(lines)))
+    print('')
+    print('                             width   Mchars/s')
+
+    for name, func in [('per char, previous', per_char_previous),
+                       ('per char, get_cwidth', per_char_get_cwidth),
+                       ('get_width, per line', get_width_lines),
+                       ('get_width, whole text', get_width_text)]:
+        start = time.time()
+        result = func()
+        seconds = time.time() - start
+        print('%-24s %10i %10.1f' % (name, result, len(text) / seconds / 1000000))
+
+
+if __name__ == '__main__':
+    main()
@@ -6,24 +6,24 @@ Author: Jonathan Slenders
 from __future__ import unicode_literals
 
 import errno
+import functools
 import os
 import six
 import sys
 import signal
+import time
 
 from .key_binding import InputProcessor
 from .enums import InputMode
 from .key_binding import Registry
-from .key_bindings.emacs import emacs_bindings
 from .line import Line
 from .layout import Layout
 from .layout.prompt import DefaultPrompt
 from .renderer import Renderer
+from .eventloop.executor import ThreadPoolExecutor
 from .utils import EventHook, DummyContext
 from .history import History
 
-from pygments.styles.default import DefaultStyle
-
 import weakref
 
 if sys.platform == 'win32':
@@ -75,21 +75,41 @@ class CommandLineInterface(object):
     :param stdin: Input stream, by default sys.stdin
     :param stdout: Output stream, by default sys.stdout
     :param layout: :class:`Layout` instance.
-    :param style: :class:`Layout` instance.
+    :param style: Pygments style class. (By default `DefaultStyle`.)
     :param create_async_autocompleters: Boolean. If True, autocompletions will
         be generated asynchronously while you type.
+    :param min_redraw_interval: Minimum time between two renders, in seconds.
+        Redraw requests in between are merged into one render at the end of
+        the interval.
+    :param profiler: :class:`~prompt_toolkit.profiler.Profiler` instance, for
+        collecting the timings and counters of every frame.
     """
     def __init__(self, stdin=None, stdout=None,
                  layout=None,
                  line=None,
-                 style=DefaultStyle,
+                 style=None,
                  key_binding_factories=None,
                  create_async_autocompleters=True,
-                 renderer_factory=Renderer):
+                 renderer_factory=Renderer,
+                 min_redraw_interval=1. / 60,
+                 profiler=None):
+
+        if style is None:
+            from pygments.styles.default import DefaultStyle as style
 
         self.stdin = stdin or sys.stdin
         self.stdout = stdout or sys.stdout
         self.style = style
+        self.min_redraw_interval = min_redraw_interval
+        self.profiler = profiler
+
+        #: Number of times that a redraw was requested, and number of times
+        #: that we actually rendered.
+        self.renders_requested = 0
+        self.renders_performed = 0
+
+        self._last_render_time = 0
+        self._redraw_scheduled = False
 
         #: The `Line` instance.
         line = line or Line()
@@ -107,22 +127,21 @@ class CommandLineInterface(object):
                                          stdout=self.stdout,
                                          style=self.style)
 
-        key_binding_factories = key_binding_factories or [emacs_bindings]
+        if not key_binding_factories:
+            from .key_bindings.emacs import emacs_bindings
+            key_binding_factories = [emacs_bindings]
 
         #: The `InputProcessor` instance.
         self.input_processor = self._create_input_processor(key_binding_factories)
 
-        # Handle events.
-        if create_async_autocompleters:
-            for n, l in self.lines.items():
-                if l.completer:
-                    l.onTextInsert += self._create_async_completer(n)
-
-        self._reset()
-
         # Event loop.
         self.eventloop = None
 
+        #: The executor for `run_in_executor`. It's shared by the event loops
+        #: of all the `read_input` calls, so that callbacks which are still
+        #: waiting when the input ends run anyway.
+        self.executor = ThreadPoolExecutor()
+
         # Events
 
         #: Called when there is no input for x seconds.
@@ -132,6 +151,14 @@ class CommandLineInterface(object):
         self.onReadInputStart = EventHook()
         self.onReadInputEnd = EventHook()
 
+        # Handle events.
+        if create_async_autocompleters:
+            for n, l in self.lines.items():
+                if l.completer:
+                    l.onTextInsert += self._create_async_completer(n)
+
+        self._reset()
+
     @property
     def is_reading_input(self):
         return bool(self.eventloop)
@@ -178,10 +205,37 @@ class CommandLineInterface(object):
         """
         Render the command line again. (Not thread safe!)
         (From other threads, or if unsure, use `request_redraw`.)
+
+        When the previous render was less than `min_redraw_interval` ago, the
+        render is postponed until the end of that interval. Other requests in
+        the meantime don't cause extra renders.
         """
+        self.renders_requested += 1
+
+        if self._redraw_scheduled:
+            return
+
+        delay = self._last_render_time + self.min_redraw_interval - time.time()
+
+        if delay > 0 and self.eventloop:
+            self._redraw_scheduled = True
+            self.eventloop.call_later(delay, self._scheduled_redraw)
+        else:
+            self._render()
+
+    def _scheduled_redraw(self):
+        self._redraw_scheduled = False
+        self._render()
+
+    def _render(self):
+        """
+        Render now. (Not thread safe!)
+        """
+        self._last_render_time = time.time()
+        self.renders_performed += 1
         self.renderer.render(self)
 
-    def run_in_executor(self, callback):
+    def run_in_executor(self, callback, priority=0, key=None):
         """
         Run a long running function in a background thread.
         (This is recommended for code that could block the `read_input` event
@@ -189,8 +243,11 @@ class CommandLineInterface(object):
         Similar to Twisted's ``deferToThread``.
 
         :param callback: The callable that should run in the executor.
+        :param priority: Waiting callbacks with a higher priority run first.
+        :param key: When given, a callback with the same key that is still
+            waiting for a thread is dropped.
         """
-        self.eventloop.run_in_executor(callback)
+        self.eventloop.run_in_executor(callback, priority=priority, key=key)
 
     def call_from_executor(self, callback):
         """
@@ -220,6 +277,50 @@ class CommandLineInterface(object):
             self.renderer.request_absolute_cursor_position()
         self.call_from_executor(do_in_event_loop)
 
+    def _process_input(self, on_abort, on_exit, reset):
+        """
+        Handle the exit, abort and return flags after the event loop processed
+        input, and render.
+
+        Returns a (done, result) tuple: `done` is True when `read_input` has to
+        return `result`. Raises `Exit` or `Abort` when the action is
+        `AbortAction.RAISE_EXCEPTION`.
+        """
+        # If the exit flag has been set.
+        if self._exit_flag:
+            if on_exit != AbortAction.IGNORE:
+                self._render()
+
+            if on_exit == AbortAction.RAISE_EXCEPTION:
+                raise Exit()
+            elif on_exit == AbortAction.RETURN_NONE:
+                return True, None
+            elif on_exit == AbortAction.RETRY:
+                reset()
+                self.renderer.request_absolute_cursor_position()
+
+        # If the abort flag has been set.
+        if self._abort_flag:
+            if on_abort != AbortAction.IGNORE:
+                self._render()
+
+            if on_abort == AbortAction.RAISE_EXCEPTION:
+                raise Abort()
+            elif on_abort == AbortAction.RETURN_NONE:
+                return True, None
+            elif on_abort == AbortAction.RETRY:
+                reset()
+                self.renderer.request_absolute_cursor_position()
+
+        # If a return value has been set.
+        if self._return_code:
+            self._render()
+            return True, self._return_code
+
+        # Now render the current layout to the output.
+        self._redraw()
+        return False, None
+
     def read_input(self, initial_value='', initial_input_mode=InputMode.INSERT,
                    on_abort=AbortAction.RETRY, on_exit=AbortAction.IGNORE):
         """
@@ -234,9 +335,12 @@ class CommandLineInterface(object):
             raise Exception('Already reading input. Read_input is not thread safe.')
 
         # Create new event loop.
-        self.eventloop = EventLoop(self.input_processor, self.stdin)
+        self.eventloop = EventLoop(self.input_processor, self.stdin, executor=self.executor)
         self.eventloop.onInputTimeout += lambda: self.onInputTimeout.fire()
 
+        self.eventloop.profiler = self.profiler
+        self.input_processor.profiler = self.profiler
+
         try:
             def reset():
                 self._reset(initial_value=initial_value,
@@ -249,55 +353,108 @@ class CommandLineInterface(object):
             with raw_mode(self.stdin.fileno()):
                 self.renderer.request_absolute_cursor_position()
 
-                self._redraw()
+                self._render()
 
                 with (DummyContext() if sys.platform == 'win32' else
                       call_on_sigwinch(self._on_resize)):
                     while True:
                         self.eventloop.loop()
 
-                        # If the exit flag has been set.
-                        if self._exit_flag:
-                            if on_exit != AbortAction.IGNORE:
-                                self.renderer.render(self)
-
-                            if on_exit == AbortAction.RAISE_EXCEPTION:
-                                raise Exit()
-                            elif on_exit == AbortAction.RETURN_NONE:
-                                return None
-                            elif on_exit == AbortAction.RETRY:
-                                reset()
-                                self.renderer.request_absolute_cursor_position()
-
-                        # If the abort flag has been set.
-                        if self._abort_flag:
-                            if on_abort != AbortAction.IGNORE:
-                                self.renderer.render(self)
-
-                            if on_abort == AbortAction.RAISE_EXCEPTION:
-                                raise Abort()
-                            elif on_abort == AbortAction.RETURN_NONE:
-                                return None
-                            elif on_abort == AbortAction.RETRY:
-                                reset()
-                                self.renderer.request_absolute_cursor_position()
-
-                        # If a return value has been set.
-                        if self._return_code:
-                            self.renderer.render(self)
-                            return self._return_code
-
-                        # Now render the current layout to the output.
-                        self._redraw()
+                        done, result = self._process_input(on_abort, on_exit, reset)
+                        if done:
+                            return result
 
         finally:
-            # Close event loop
+            # Close event loop. (A scheduled redraw is dropped with it.)
             self.eventloop.close()
             self.eventloop = None
+            self._redraw_scheduled = False
+
+            # Trigger onReadInputEnd event.
+            self.onReadInputEnd.fire()
+
+    def read_input_async(self, initial_value='', initial_input_mode=InputMode.INSERT,
+                         on_abort=AbortAction.RETRY, on_exit=AbortAction.IGNORE,
+                         loop=None):
+        """
+        Like `read_input`, but on an asyncio event loop, so that other tasks
+        keep running while we read the input. Returns an asyncio `Future` for
+        the result::
+
+            result = await cli.read_input_async()
+
+        (Python 3 only, not on Windows.)
+
+        :param loop: The asyncio event loop. (By default the current one.)
+        """
+        from .eventloop.asyncio_posix import AsyncioEventLoop
+
+        if self.is_reading_input:
+            raise Exception('Already reading input. Read_input is not thread safe.')
+
+        self.eventloop = eventloop = AsyncioEventLoop(self.input_processor, self.stdin, loop=loop,
+                                                      executor=self.executor)
+        self.eventloop.onInputTimeout += lambda: self.onInputTimeout.fire()
+
+        self.eventloop.profiler = self.profiler
+        self.input_processor.profiler = self.profiler
+
+        future = eventloop.asyncio_loop.create_future()
+
+        def reset():
+            self._reset(initial_value=initial_value,
+                        initial_input_mode=initial_input_mode)
+        reset()
+
+        # Trigger onReadInputStart event.
+        self.onReadInputStart.fire()
+
+        terminal_mode = raw_mode(self.stdin.fileno())
+        terminal_mode.__enter__()
+
+        eventloop.asyncio_loop.add_signal_handler(signal.SIGWINCH, self._on_resize)
+
+        def done(result=None, exception=None):
+            eventloop.asyncio_loop.remove_signal_handler(signal.SIGWINCH)
+            terminal_mode.__exit__()
+
+            # Close event loop. (A scheduled redraw is dropped with it.)
+            eventloop.close()
+            self.eventloop = None
+            self._redraw_scheduled = False
 
             # Trigger onReadInputEnd event.
             self.onReadInputEnd.fire()
 
+            if not future.done():
+                if exception is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(exception)
+
+        def on_input():
+            try:
+                finished, result = self._process_input(on_abort, on_exit, reset)
+            except Exception as e:
+                done(exception=e)
+            else:
+                if finished:
+                    done(result)
+
+        def on_future_done(f):
+            # When the caller cancels the future.
+            if self.eventloop is eventloop:
+                done()
+
+        future.add_done_callback(on_future_done)
+        eventloop.onInput += on_input
+
+        self.renderer.request_absolute_cursor_position()
+        self._render()
+        eventloop.start()
+
+        return future
+
     def set_exit(self):
         self._exit_flag = True
 
@@ -373,17 +530,21 @@ class CommandLineInterface(object):
         """
         Create function for asynchronous autocompletion while typing.
         (Autocomplete in other thread.)
+
+        The completions are added to the `CompletionState` in batches, while
+        the completer generates them. When the text changes, the running
+        completer is cancelled. (It stops at the next completion it yields.)
+        Only one completer runs at the same time for every line: when the text
+        changes while it's running, it runs again for the latest text when it
+        is done.
         """
         line = self.lines[line_name]
-        complete_thread_running = [False]  # By ref.
+        current_job = [None]  # By ref.
+        restart = [False]  # By ref.
 
         def async_completer():
             document = line.document
 
-            # Don't start two threads at the same time.
-            if complete_thread_running[0]:
-                return
-
             # Don't complete when we already have completions.
             if line.complete_state:
                 return
@@ -393,30 +554,112 @@ class CommandLineInterface(object):
             if not line.text or char.isspace():
                 return
 
-            # Otherwise, get completions in other thread.
-            complete_thread_running[0] = True
+            # Don't start two completers at the same time. (The completer
+            # doesn't have to be thread safe, and the old one would take the
+            # CPU time of the new one.) Cancel the running one, and start
+            # again when it's done.
+            if current_job[0]:
+                current_job[0].cancelled = True
+                restart[0] = True
+                return
 
-            def run():
-                completions = list(line.completer.get_completions(document))
-                complete_thread_running[0] = False
-
-                def callback():
-                    """
-                    Set the new complete_state in a safe way. Don't replace an
-                    existing complete_state if we had one. (The user could have
-                    pressed 'Tab' in the meantime. Also don't set it if the text
-                    was changed in the meantime.
-                    """
+            # Get completions in other thread.
+            job = _CompletionJob()
+            current_job[0] = job
+
+            def add_completions(completions):
+                """
+                Set the new complete_state, or extend it, in a safe way. Don't
+                replace an existing complete_state if we had one. (The user
+                could have pressed 'Tab' in the meantime. Also don't set it if
+                the text was changed in the meantime.
+                """
+                if job.cancelled:
+                    return
+
+                if job.complete_state is None:
                     # Set completions if the text was not yet changed.
                     if line.text == document.text and \
                             line.cursor_position == document.cursor_position and \
                             not line.complete_state:
                         line._start_complete(go_to_first=False, completions=completions)
+                        job.complete_state = line.complete_state
                         self._redraw()
                     else:
-                        # Otherwise, restart thread.
+                        # Otherwise, restart.
                         async_completer()
-                self.call_from_executor(callback)
 
-            self.run_in_executor(run)
+                elif line.complete_state is job.complete_state:
+                    line.complete_state.current_completions.extend(completions)
+                    self._redraw()
+                else:
+                    # The completions have been closed or replaced.
+                    job.cancelled = True
+
+            def done():
+                # (Unless the input ended in the meantime.)
+                if current_job[0] is not job:
+                    return
+
+                current_job[0] = None
+
+                if restart[0]:
+                    restart[0] = False
+                    async_completer()
+
+            def run():
+                try:
+                    # The text could have changed before this job started.
+                    if job.cancelled:
+                        return
+
+                    completions = []
+                    last_batch_time = time.time()
+
+                    for c in line.completer.get_completions(document):
+                        if job.cancelled:
+                            return
+
+                        completions.append(c)
+
+                        if time.time() - last_batch_time >= _COMPLETION_BATCH_INTERVAL:
+                            self.call_from_executor(functools.partial(add_completions, completions))
+                            completions = []
+                            last_batch_time = time.time()
+
+                    if completions:
+                        self.call_from_executor(functools.partial(add_completions, completions))
+                finally:
+                    self.call_from_executor(done)
+
+            self.run_in_executor(run, priority=1)
+
+        def read_input_end():
+            # A job that is still waiting or running when the input ends
+            # can't call `done` anymore. Forget about it, or we wouldn't
+            # start a completer during the next `read_input`.
+            if current_job[0]:
+                current_job[0].cancelled = True
+                current_job[0] = None
+            restart[0] = False
+
+        self.onReadInputEnd += read_input_end
         return async_completer
+
+
+#: Completions that are generated asynchronously are sent to the event loop
+#: in batches, at most this often (in seconds).
+_COMPLETION_BATCH_INTERVAL = .02
+
+
+class _CompletionJob(object):
+    """
+    State of one asynchronous completion. (Shared between the thread that
+    runs the completer and the event loop.)
+    """
+    def __init__(self):
+        #: Set to `True` in the event loop, to stop the completer.
+        self.cancelled = False
+
+        #: The `CompletionState`, once the first completions have arrived.
+        self.complete_state = None
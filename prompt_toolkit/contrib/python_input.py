@@ -31,7 +31,6 @@ from prompt_toolkit.selection import SelectionType
 from prompt_toolkit.validation import Validator, ValidationError
 from prompt_toolkit.layout.margins import LeftMarginWithLineNumbers
 
-import jedi
 import platform
 import re
 import sys
@@ -448,6 +447,8 @@ class PythonValidator(Validator):
 
 
 def get_jedi_script_from_document(document, locals, globals):
+    import jedi  # Importing Jedi is 'slow'.
+
     try:
         return jedi.Interpreter(
             document.text,
@@ -518,6 +519,7 @@ class PythonCommandLineInterface(CommandLineInterface):
             input_processors=[BracketsMismatchProcessor()],
             min_height=7,
             lexer=PythonLexer,
+            incremental_lexing=True,
             left_margin=PythonLeftMargin(),
             menus=[CompletionsMenu()] if autocompletion_style == AutoCompletionStyle.POPUP_MENU else [],
             bottom_toolbars=[
@@ -601,6 +603,6 @@ class PythonCommandLineInterface(CommandLineInterface):
                 else:
                     on_input_timeout()
 
-            self.run_in_executor(run)
+            self.run_in_executor(run, key='signatures')
 
         self.onInputTimeout += on_input_timeout
@@ -2,7 +2,10 @@
 """
 from __future__ import unicode_literals
 
+import bisect
+import collections
 import re
+import weakref
 
 from .selection import SelectionType
 
@@ -24,6 +27,50 @@ _FIND_CURRENT_BIG_WORD_RE = re.compile('^([^\s]+)')
 _FIND_CURRENT_BIG_WORD_INCLUDE_TRAILING_WHITESPACE_RE = re.compile('^([^\s]+\s*)')
 
 
+class _ImmutableLineList(list):
+    """
+    Some protection for our 'lines' list, which is assumed to be immutable in
+    the cache. (Useful for detecting obvious bugs.) Like for a tuple,
+    modifying it raises `TypeError`.
+    """
+    def _error(self, *a, **kw):
+        raise TypeError('The lines of a Document are immutable.')
+
+    __setitem__ = _error
+    __delitem__ = _error
+    __iadd__ = _error
+    __imul__ = _error
+    append = _error
+    extend = _error
+    insert = _error
+    pop = _error
+    remove = _error
+    reverse = _error
+    sort = _error
+
+
+class _DocumentCache(object):
+    """
+    Data that's computed from the text of a document, shared by all the
+    `Document` instances with the same text.
+    """
+    def __init__(self):
+        #: List of lines for the Document text.
+        self.lines = None
+
+        #: List of index positions, pointing to the start of all the lines.
+        self.line_indexes = None
+
+
+#: Maps the text of documents to their `_DocumentCache`. (`Line.document`
+#: creates a new `Document` on every call, often for the same text.)
+_text_to_document_cache = weakref.WeakValueDictionary()
+
+#: Keep the caches of the most recent texts alive, even when no `Document`
+#: refers to them anymore.
+_recent_document_caches = collections.deque(maxlen=4)
+
+
 class Document(object):
     """
     This is a immutable class around the text and cursor position, and contains
@@ -36,13 +83,20 @@ class Document(object):
     :param cursor_position: int
     :param selection: :class:`SelectionState`
     """
-    __slots__ = ('text', 'cursor_position', 'selection')
+    __slots__ = ('text', 'cursor_position', 'selection', '_cache')
 
     def __init__(self, text='', cursor_position=0, selection=None):
         self.text = text
         self.cursor_position = cursor_position
         self.selection = selection
 
+        try:
+            self._cache = _text_to_document_cache[text]
+        except KeyError:
+            self._cache = _DocumentCache()
+            _text_to_document_cache[text] = self._cache
+            _recent_document_caches.append(self._cache)
+
     @property
     def current_char(self):
         """ Return character under cursor, or None """
@@ -64,19 +118,43 @@ class Document(object):
     @property
     def current_line_before_cursor(self):
         """ Text from the start of the line until the cursor. """
-        return self.text_before_cursor.split('\n')[-1]
+        row = self.cursor_position_row
+        return self.text[self._line_start_indexes[row]:self.cursor_position]
 
     @property
     def current_line_after_cursor(self):
         """ Text from the cursor until the end of the line. """
-        return self.text_after_cursor.split('\n')[0]
+        row = self.cursor_position_row
+        return self.lines[row][max(0, self.cursor_position - self._line_start_indexes[row]):]
 
     @property
     def lines(self):
         """
-        Array of all the lines.
+        Array of all the lines. (Shared between documents with the same text,
+        so don't modify it.)
         """
-        return self.text.split('\n')
+        if self._cache.lines is None:
+            self._cache.lines = _ImmutableLineList(self.text.split('\n'))
+
+        return self._cache.lines
+
+    @property
+    def _line_start_indexes(self):
+        """
+        Sorted list of the indexes where the lines start.
+        """
+        if self._cache.line_indexes is None:
+            indexes = [0]
+            append = indexes.append
+            pos = 0
+
+            for line in self.lines[:-1]:
+                pos += len(line) + 1
+                append(pos)
+
+            self._cache.line_indexes = indexes
+
+        return self._cache.line_indexes
 
     @property
     def lines_from_current(self):
@@ -95,7 +173,7 @@ class Document(object):
     def current_line(self):
         """ Return the text on the line where the cursor is. (when the input
         consists of just one line, it equals `text`. """
-        return self.current_line_before_cursor + self.current_line_after_cursor
+        return self.lines[self.cursor_position_row]
 
     @property
     def leading_whitespace_in_current_line(self):
@@ -118,32 +196,36 @@ class Document(object):
         """
         Current row. (0-based.)
         """
-        return len(self.text_before_cursor.split('\n')) - 1
+        return bisect.bisect_right(self._line_start_indexes, self.cursor_position) - 1
 
     @property
     def cursor_position_col(self):
         """
         Current column. (0-based.)
         """
-        return len(self.current_line_before_cursor)
+        position = min(self.cursor_position, len(self.text))
+        return position - self._line_start_indexes[self.cursor_position_row]
 
     def translate_index_to_position(self, index):  # TODO: make this 0-based indexed!!!
         """
         Given an index for the text, return the corresponding (row, col) tuple.
         """
-        text_before_position = self.text[:index]
-
-        row = len(text_before_position.split('\n'))
-        col = len(text_before_position.split('\n')[-1])
+        index = max(0, min(index, len(self.text)))
+        row = bisect.bisect_right(self._line_start_indexes, index) - 1
 
-        return row, col
+        return row + 1, index - self._line_start_indexes[row]
 
     def translate_row_col_to_index(self, row, col):
         """
         Given a (row, col) tuple, return the corresponding index.
         (Row and col params are 0-based.)
         """
-        return len('\n'.join(self.lines[:row])) + len('\n') + col
+        line_start_indexes = self._line_start_indexes
+
+        if row < len(line_start_indexes):
+            return line_start_indexes[row] + col
+        else:
+            return len(self.text) + len('\n') + col
 
     @property
     def is_cursor_at_the_end(self):
@@ -371,23 +453,11 @@ class Document(object):
         """
         assert count >= 1
 
-        count = min(self.text_before_cursor.count('\n'), count)
+        row = self.cursor_position_row
+        count = min(row, count)
 
         if count:
-            pos = self.cursor_position_col
-
-            lines = self.text_before_cursor.split('\n')
-            skip_lines = '\n'.join(lines[-count-1:])
-            new_line = lines[-count-1]
-
-            # When the current line is longer then the previous, move to the
-            # last character of the previous line.
-            if pos > len(new_line):
-                return - len(skip_lines) + len(new_line)
-
-            # Otherwise find the corresponding position in the previous line.
-            else:
-                return - len(skip_lines) + pos
+            return self._get_position_in_row(row - count)
         return 0
 
     def get_cursor_down_position(self, count=1):
@@ -397,26 +467,21 @@ class Document(object):
         """
         assert count >= 1
 
-        count = min(self.text_after_cursor.count('\n'), count)
+        row = self.cursor_position_row
+        count = min(self.line_count - 1 - row, count)
 
         if count:
-            pos = self.cursor_position_col
-
-            lines = self.text_after_cursor.split('\n')
-            skip_lines = '\n'.join(lines[:count])
-            new_line = lines[count]
-
-            # When the current line is longer then the previous, move to the
-            # last character of the next line.
-            if pos > len(new_line):
-                return len(skip_lines) + len(new_line) + 1
-
-            # Otherwise find the corresponding position in the next line.
-            else:
-                return len(skip_lines) + pos + 1
-
+            return self._get_position_in_row(row + count)
         return 0
 
+    def _get_position_in_row(self, row):
+        """
+        Relative cursor position for the current column in another row. (Or
+        the end of that row, when it's shorter.)
+        """
+        column = min(self.cursor_position_col, len(self.lines[row]))
+        return self._line_start_indexes[row] + column - self.cursor_position
+
     @property
     def matching_bracket_position(self):
         """
@@ -0,0 +1,105 @@
+"""
+Event loop on top of an asyncio event loop. (Python 3 only.)
+"""
+from __future__ import unicode_literals
+
+import asyncio
+
+from ..terminal.vt100_input import InputStream
+from ..utils import EventHook
+from .base import BaseEventLoop
+from .posix import PosixEventLoop, _fileno
+
+__all__ = (
+    'AsyncioEventLoop',
+)
+
+
+class AsyncioEventLoop(BaseEventLoop):
+    """
+    Event loop that runs on an asyncio event loop, together with the other
+    tasks of the application. Unlike the other event loops, it doesn't have a
+    blocking `loop` method: stdin is watched with the `add_reader` of the
+    asyncio loop, and `onInput` is fired every time that input has been
+    processed.
+
+    `call_from_executor`, `call_later` and `add_reader` map onto the asyncio
+    loop. `run_in_executor` uses our own executor, like the other event loops,
+    so that the `priority` and `key` arguments are respected.
+
+    :param loop: The asyncio event loop. (By default the current one.)
+    :param executor: The executor for `run_in_executor`. (By default a new
+        :class:`.ThreadPoolExecutor`.)
+    """
+    stdin_decoder_cls = PosixEventLoop.stdin_decoder_cls
+    stdin_read_size = PosixEventLoop.stdin_read_size
+
+    # Reading stdin works the same as in the `PosixEventLoop`.
+    _read_from_stdin = PosixEventLoop._read_from_stdin
+    _process_stdin = PosixEventLoop._process_stdin
+
+    def __init__(self, input_processor, stdin, loop=None, executor=None):
+        super(AsyncioEventLoop, self).__init__(input_processor, stdin, executor=executor)
+
+        self.asyncio_loop = loop or asyncio.get_event_loop()
+        self.inputstream = InputStream(self.input_processor)
+
+        #: Fired after input has been processed.
+        self.onInput = EventHook()
+
+        self._readers = {}
+        self._input_received = False
+        self._stdin_decoder = self.stdin_decoder_cls()
+        self._input_timeout_timer = None
+
+    def start(self):
+        """
+        Start reading from stdin.
+        """
+        self.add_reader(self.stdin, self._stdin_ready)
+        self._start_input_timeout()
+
+    def _start_input_timeout(self):
+        if self._input_timeout_timer:
+            self._input_timeout_timer.cancel()
+
+        # Fire the input timeout event when there is no input for a while.
+        self._input_timeout_timer = self.call_later(self.input_timeout, self.onInputTimeout.fire)
+
+    def _stdin_ready(self):
+        self._process_stdin()
+
+        if self._input_received:
+            self._input_received = False
+            self._start_input_timeout()
+            self.onInput.fire()
+
+    def loop(self):
+        raise NotImplementedError('Use `start` and the asyncio event loop.')
+
+    def call_from_executor(self, callback):
+        self.asyncio_loop.call_soon_threadsafe(callback)
+
+    def call_later(self, delay, callback):
+        return self.asyncio_loop.call_later(delay, callback)
+
+    def add_reader(self, fd, callback):
+        fd = _fileno(fd)
+        self._readers[fd] = callback
+        self.asyncio_loop.add_reader(fd, callback)
+
+    def remove_reader(self, fd):
+        fd = _fileno(fd)
+
+        if fd in self._readers:
+            del self._readers[fd]
+            self.asyncio_loop.remove_reader(fd)
+
+    def close(self):
+        super(AsyncioEventLoop, self).close()
+
+        for fd in list(self._readers):
+            self.remove_reader(fd)
+
+        if self._input_timeout_timer:
+            self._input_timeout_timer.cancel()
@@ -1,7 +1,13 @@
 from __future__ import unicode_literals
 
 from ..utils import EventHook
+from .executor import ThreadPoolExecutor
+
+import collections
+import heapq
+import itertools
 import threading
+import time
 
 __all__ = (
     'BaseEventLoop',
@@ -12,7 +18,13 @@ class BaseEventLoop(object):
     #: When to trigger the `onInputTimeout` event.
     input_timeout = .5
 
-    def __init__(self, input_processor, stdin):
+    #: Maximum number of threads for `run_in_executor`.
+    executor_max_workers = 4
+
+    #: :class:`~prompt_toolkit.profiler.Profiler` or `None`.
+    profiler = None
+
+    def __init__(self, input_processor, stdin, executor=None):
         self.stdin = stdin
         self.input_processor = input_processor
 
@@ -22,33 +34,135 @@ class BaseEventLoop(object):
         #:   of the function below the cursor position in the case of a REPL.
         self.onInputTimeout = EventHook()
 
-        self._calls_from_executor = []
+        #: The executor for `run_in_executor`. Any object with a `submit`
+        #: and `shutdown` method like :class:`.ThreadPoolExecutor` will do.
+        #: (When it's given, it's not ours to shut down in `close`.)
+        self.executor = executor or ThreadPoolExecutor(max_workers=self.executor_max_workers)
+        self._owns_executor = executor is None
+
+        #: Callbacks from `call_from_executor`, processed in one batch.
+        self._calls_from_executor = collections.deque()
+
+        #: (Reentrant, because `call_from_executor` is also called from the
+        #: SIGWINCH handler, which can interrupt the main thread while it
+        #: holds this lock.)
+        self._calls_from_executor_lock = threading.RLock()
+        self._wakeup_pending = False
         self.closed = False
 
+        #: Heap of (time, sequence number, `_Timer`) tuples.
+        self._timers = []
+        self._timer_counter = itertools.count()
+
     def loop(self):
         raise NotImplementedError
 
     def close(self):
         self.closed = True
 
-    def run_in_executor(self, callback):
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    def run_in_executor(self, callback, priority=0, key=None):
         """
         Run a long running function in a background thread.
         (This is recommended for code that could block the `read_input` event
         loop.)
         Similar to Twisted's ``deferToThread``.
-        """
-        class _Thread(threading.Thread):
-            def run(t):
-                callback()
 
-        _Thread().start()
+        :param priority: Waiting callbacks with a higher priority run first.
+        :param key: When given, a callback with the same key that is still
+            waiting for a thread is dropped.
+        """
+        self.executor.submit(callback, priority=priority, key=key)
 
     def call_from_executor(self, callback):
         raise NotImplementedError
 
+    def call_later(self, delay, callback):
+        """
+        Call `callback` in the event loop after `delay` seconds.
+        (Not thread safe! From other threads, use `call_from_executor`.)
+
+        Returns a timer object with a `cancel` method.
+        """
+        timer = _Timer(callback)
+        heapq.heappush(self._timers, (time.time() + delay, next(self._timer_counter), timer))
+        return timer
+
+    def add_reader(self, fd, callback):
+        """
+        Call `callback` (without arguments) in the event loop every time that
+        this file descriptor (or object with a `fileno` method) is ready for
+        reading.
+        """
+        raise NotImplementedError
+
+    def remove_reader(self, fd):
+        """
+        Stop watching this file descriptor.
+        """
+        raise NotImplementedError
+
+    def _get_timeout(self):
+        """
+        Return the number of seconds until the next timer, or `None` when
+        there are no timers.
+        """
+        timers = self._timers
+
+        while timers and timers[0][2].cancelled:
+            heapq.heappop(timers)
+
+        if timers:
+            return max(0, timers[0][0] - time.time())
+
+    def _run_timers(self):
+        """
+        Call the callbacks of the timers that are due.
+        """
+        now = time.time()
+        while self._timers and self._timers[0][0] <= now:
+            timer = heapq.heappop(self._timers)[2]
+
+            if not timer.cancelled:
+                timer.callback()
+
+    def _queue_call_from_executor(self, callback):
+        """
+        Add a callback to the queue for `process_queued_calls_from_executor`.
+        (Thread safe.)
+
+        Returns `True` when the event loop has to be woken up. That is only
+        the case for the first call after the last batch was taken, otherwise
+        a wakeup is already pending.
+        """
+        # (`deque.append` is thread safe.)
+        self._calls_from_executor.append(callback)
+
+        if not self._wakeup_pending:
+            with self._calls_from_executor_lock:
+                if not self._wakeup_pending:
+                    self._wakeup_pending = True
+                    return True
+        return False
+
     def process_queued_calls_from_executor(self):
-        # Process calls from executor.
-        calls_from_executor, self._calls_from_executor = self._calls_from_executor, []
-        for c in calls_from_executor:
-            c()
+        # Calls that are queued from now on, will wake up the event loop
+        # again. (Clear the wakeup itself before calling this.) This doesn't
+        # need the lock, storing an attribute is atomic.
+        self._wakeup_pending = False
+
+        # Process the queued calls in one batch.
+        calls_from_executor = self._calls_from_executor
+        for i in range(len(calls_from_executor)):
+            calls_from_executor.popleft()()
+
+
+class _Timer(object):
+    def __init__(self, callback):
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
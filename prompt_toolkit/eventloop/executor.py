@@ -0,0 +1,142 @@
+"""
+Bounded pool of worker threads for `run_in_executor`.
+"""
+from __future__ import unicode_literals
+
+import heapq
+import itertools
+import threading
+
+__all__ = (
+    'ThreadPoolExecutor',
+)
+
+
+class _Job(object):
+    def __init__(self, callback, priority, key):
+        self.callback = callback
+        self.priority = priority
+        self.key = key
+
+        #: Set when a newer job with the same key replaces this one.
+        self.cancelled = False
+
+
+class ThreadPoolExecutor(object):
+    """
+    Run callables in a bounded number of worker threads.
+
+    Threads are started when needed (up to `max_workers`), and they are kept
+    for the next jobs until `shutdown` is called. (The jobs that are still
+    waiting at that point run first.) Waiting jobs with a higher
+    priority are started first. When a job is submitted with a `key` and a job
+    with the same key is still waiting, that one is dropped. (E.g. only the
+    completion for the latest input is useful.)
+
+    Note that a job that runs forever occupies a worker until the end.
+
+    :param max_workers: Maximum number of threads.
+    """
+    def __init__(self, max_workers=4):
+        assert max_workers > 0
+        self.max_workers = max_workers
+
+        self._condition = threading.Condition()
+
+        #: Heap of (-priority, sequence number, job) tuples.
+        self._queue = []
+        self._counter = itertools.count()
+
+        #: Maps keys to waiting jobs.
+        self._jobs_by_key = {}
+
+        self._threads = []
+        self._idle_count = 0
+        self._shutdown = False
+
+        # Statistics.
+        self.threads_started = 0
+        self.jobs_submitted = 0
+        self.jobs_coalesced = 0
+
+    def submit(self, callback, priority=0, key=None):
+        """
+        Schedule `callback` to be called in a worker thread.
+
+        :param priority: Jobs with a higher priority are started first.
+        :param key: When given, a waiting job with the same key is dropped.
+        """
+        job = _Job(callback, priority, key)
+
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('Cannot submit jobs after shutdown.')
+
+            self.jobs_submitted += 1
+
+            if key is not None:
+                previous = self._jobs_by_key.get(key)
+                if previous is not None:
+                    previous.cancelled = True
+                    self.jobs_coalesced += 1
+                self._jobs_by_key[key] = job
+
+            heapq.heappush(self._queue, (-priority, next(self._counter), job))
+
+            if len(self._queue) > self._idle_count and len(self._threads) < self.max_workers:
+                self._start_thread()
+            else:
+                self._condition.notify()
+
+    def _start_thread(self):
+        thread = threading.Thread(target=self._worker)
+        thread.daemon = True
+        self._threads.append(thread)
+        self.threads_started += 1
+        thread.start()
+
+    def _get_job(self):
+        """
+        Wait for the next job. Return `None` after `shutdown`, when no jobs
+        are waiting anymore.
+        """
+        with self._condition:
+            self._idle_count += 1
+            try:
+                while True:
+                    while self._queue:
+                        job = heapq.heappop(self._queue)[2]
+
+                        if job.key is not None and self._jobs_by_key.get(job.key) is job:
+                            del self._jobs_by_key[job.key]
+
+                        if not job.cancelled:
+                            return job
+
+                    if self._shutdown:
+                        return None
+
+                    self._condition.wait()
+            finally:
+                self._idle_count -= 1
+
+    def _worker(self):
+        while True:
+            job = self._get_job()
+            if job is None:
+                return
+
+            try:
+                job.callback()
+            except Exception:
+                import traceback
+                traceback.print_exc()
+
+    def shutdown(self):
+        """
+        Stop the threads once the waiting jobs have run. (This doesn't wait
+        for them.) Submitting jobs after this raises `RuntimeError`.
+        """
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
@@ -4,6 +4,13 @@ import fcntl
 import select
 import signal
 import errno
+import threading
+import time
+
+try:
+    import selectors
+except ImportError:
+    selectors = None
 
 from codecs import getincrementaldecoder
 from ..terminal.vt100_input import InputStream
@@ -19,74 +26,132 @@ __all__ = (
 class PosixEventLoop(BaseEventLoop):
     stdin_decoder_cls = getincrementaldecoder('utf-8')
 
-    def __init__(self, input_processor, stdin):
-        super(PosixEventLoop, self).__init__(input_processor, stdin)
+    #: Maximum number of bytes to read from stdin at once.
+    stdin_read_size = 64 * 1024
+
+    def __init__(self, input_processor, stdin, executor=None):
+        super(PosixEventLoop, self).__init__(input_processor, stdin, executor=executor)
 
         self.inputstream = InputStream(self.input_processor)
 
-        # Create a pipe for inter thread communication.
-        self._schedule_pipe = os.pipe()
-        fcntl.fcntl(self._schedule_pipe[0], fcntl.F_SETFL, os.O_NONBLOCK)
+        #: Maps file descriptors to the callbacks of `add_reader`.
+        self._readers = {}
+        self._selector = _create_selector()
+
+        # Set when `loop` has to return.
+        self._input_received = False
+
+        # For waking up the event loop from other threads.
+        self._waker = _Waker()
 
         # Create incremental decoder for decoding stdin.
         # We can not just do `os.read(stdin.fileno(), 1024).decode('utf-8')`, because
         # it could be that we are in the middle of a utf-8 byte sequence.
         self._stdin_decoder = self.stdin_decoder_cls()
 
+        self.add_reader(self.stdin, self._process_stdin)
+        self.add_reader(self._waker, self._process_calls_from_executor)
+
     def loop(self):
         """
-        The input 'event loop'.
+        The input 'event loop'. Returns after input has been processed.
         """
         if self.closed:
             raise Exception('Event loop already closed.')
 
-        timeout = self.input_timeout
+        # Fire the input timeout event when there is no input for a while.
+        input_timeout_timer = self.call_later(self.input_timeout, self.onInputTimeout.fire)
+
+        try:
+            while not self._input_received:
+                for fd in self._selector.select(self._get_timeout()):
+                    # (A previous callback can remove a reader.)
+                    callback = self._readers.get(fd)
+                    if callback:
+                        callback()
+
+                self._run_timers()
+        finally:
+            input_timeout_timer.cancel()
+            self._input_received = False
+
+    def add_reader(self, fd, callback):
+        """
+        Call `callback` (without arguments) in the event loop every time that
+        this file descriptor (or object with a `fileno` method) is ready for
+        reading.
+        """
+        fd = _fileno(fd)
+
+        if fd in self._readers:
+            self._selector.unregister(fd)
+
+        self._readers[fd] = callback
+        self._selector.register(fd)
+
+    def remove_reader(self, fd):
+        """
+        Stop watching this file descriptor.
+        """
+        fd = _fileno(fd)
+
+        if fd in self._readers:
+            del self._readers[fd]
+            self._selector.unregister(fd)
+
+    def _process_stdin(self):
+        # Read and feed all the input that is available right now, so that we
+        # return (and render) only once for a burst of input, like a paste or
+        # fast input over SSH.
+        profiler = self.profiler
+        if profiler:
+            start = time.time()
 
         while True:
-            r, w, x = _select([self.stdin, self._schedule_pipe[0]], [], [], timeout)
+            c = self._read_from_stdin()
 
-            # If we got a character, feed it to the input stream. If we got
-            # none, it means we got a repaint request.
-            if self.stdin in r:
-                c = self._read_from_stdin()
+            if c:
+                self.inputstream.feed(c)
 
-                if c:
-                    # Feed input text.
-                    self.inputstream.feed(c)
+            if c is None or not _select([self.stdin], [], [], 0)[0]:
+                break
 
-                    # Immediately flush the input.
-                    self.inputstream.flush()
+        # Flush the input.
+        self.inputstream.flush()
 
-                return
+        if profiler:
+            profiler.add_time('input', start)
 
-            # If we receive something on our "call_from_executor" pipe, process
-            # these callbacks in a thread safe way.
-            elif self._schedule_pipe[0] in r:
-                # Flush all the pipe content.
-                os.read(self._schedule_pipe[0], 1024)
+        # Don't return (and render) in the middle of a bracketed paste, wait
+        # for the rest of the pasted text.
+        if not self.inputstream.in_bracketed_paste:
+            self._input_received = True
 
-                # Process calls from executor.
-                calls_from_executor, self._calls_from_executor = self._calls_from_executor, []
-                for c in calls_from_executor:
-                    c()
-            else:
-                # Fire input timeout event.
-                self.onInputTimeout.fire()
-                timeout = None
+    def _process_calls_from_executor(self):
+        # Clear the wakeup before taking the queued calls. (Calls that are
+        # queued after that, are either in this batch or send a new wakeup.)
+        self._waker.clear()
+
+        # Process calls from executor in a thread safe way.
+        self.process_queued_calls_from_executor()
 
     def _read_from_stdin(self):
         """
-        Read the input and return it.
+        Read the input and return it. Return `None` when nothing could be read.
+        (At the end of the file, or when interrupted.)
         """
         # Note: the following works better than wrapping `self.stdin` like
         #       `codecs.getreader('utf-8')(stdin)` and doing `read(1)`.
         #       Somehow that causes some latency when the escape
         #       character is pressed. (Especially on combination with the `select`.
         try:
-            bytes = os.read(self.stdin.fileno(), 1024)
+            bytes = os.read(self.stdin.fileno(), self.stdin_read_size)
         except OSError:
             # In case of SIGWINCH
-            bytes = b''
+            return None
+
+        if not bytes:
+            return None
 
         try:
             return self._stdin_decoder.decode(bytes)
@@ -103,21 +168,142 @@ class PosixEventLoop(BaseEventLoop):
         Call this function in the main event loop.
         Similar to Twisted's ``callFromThread``.
         """
-        self._calls_from_executor.append(callback)
-
-        if self._schedule_pipe:
-            os.write(self._schedule_pipe[1], b'x')
+        # Only wake up the event loop when no wakeup is pending yet. Otherwise,
+        # this callback runs in the same batch as the previous ones. (After
+        # `close`, the waker does nothing.)
+        if self._queue_call_from_executor(callback):
+            self._waker.wake()
 
     def close(self):
         super(PosixEventLoop, self).close()
 
-        # Close pipes.
-        schedule_pipe = self._schedule_pipe
-        self._schedule_pipe = None
+        self._selector.close()
+        self._readers = {}
+
+        self._waker.close()
+
+
+def _fileno(fd):
+    """
+    Return the file descriptor of a file object, or the integer itself.
+    """
+    return fd if isinstance(fd, int) else fd.fileno()
+
+
+class _Waker(object):
+    """
+    File descriptor that becomes readable when `wake` is called, for waking
+    up the selector from other threads. Uses an eventfd when available
+    (Linux, Python 3.10+), a pipe otherwise.
+
+    `wake` and `close` are thread safe: after `close`, `wake` doesn't write
+    anymore. (The file descriptor could belong to another file by then.)
+    """
+    def __init__(self):
+        if hasattr(os, 'eventfd'):
+            self._read_fd = self._write_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+            self._eventfd = True
+        else:
+            self._read_fd, self._write_fd = os.pipe()
+            self._eventfd = False
+
+            for fd in (self._read_fd, self._write_fd):
+                fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+        self.closed = False
 
-        if schedule_pipe:
-            os.close(schedule_pipe[0])
-            os.close(schedule_pipe[1])
+        # (Reentrant, because `wake` is also called from the SIGWINCH handler,
+        # which can interrupt the main thread in `close`.)
+        self._lock = threading.RLock()
+
+    def fileno(self):
+        return self._read_fd
+
+    def wake(self):
+        with self._lock:
+            if self.closed:
+                return
+
+            try:
+                if self._eventfd:
+                    os.eventfd_write(self._write_fd, 1)
+                else:
+                    os.write(self._write_fd, b'x')
+            except OSError:
+                # Full (EAGAIN), so it's readable anyway.
+                pass
+
+    def clear(self):
+        try:
+            if self._eventfd:
+                os.eventfd_read(self._read_fd)
+            else:
+                while os.read(self._read_fd, 1024):
+                    pass
+        except OSError:
+            # Nothing left to read. (EAGAIN)
+            pass
+
+    def close(self):
+        with self._lock:
+            if not self.closed:
+                self.closed = True
+                os.close(self._read_fd)
+
+                if self._write_fd != self._read_fd:
+                    os.close(self._write_fd)
+
+
+def _create_selector():
+    if selectors is None:
+        return _SelectSelector()
+    else:
+        return _Selector()
+
+
+class _Selector(object):
+    """
+    Wrapper around the best selector of the `selectors` module. (epoll on
+    Linux, kqueue on BSD/OS X.)
+    """
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+
+    def register(self, fd):
+        self._selector.register(fd, selectors.EVENT_READ)
+
+    def unregister(self, fd):
+        self._selector.unregister(fd)
+
+    def select(self, timeout):
+        """
+        Wait until file descriptors are ready for reading, and return them.
+        """
+        return [key.fd for key, mask in self._selector.select(timeout)]
+
+    def close(self):
+        self._selector.close()
+
+
+class _SelectSelector(object):
+    """
+    Same interface, using `select.select`. (When the `selectors` module is
+    not available, on Python 2.)
+    """
+    def __init__(self):
+        self._fds = []
+
+    def register(self, fd):
+        self._fds.append(fd)
+
+    def unregister(self, fd):
+        self._fds.remove(fd)
+
+    def select(self, timeout):
+        return _select(self._fds, [], [], timeout)[0]
+
+    def close(self):
+        pass
 
 
 def _select(*args, **kwargs):
@@ -16,8 +16,8 @@ WAIT_TIMEOUT = 0x00000102
 
 
 class Win32EventLoop(BaseEventLoop):
-    def __init__(self, input_processor, stdin):
-        super(Win32EventLoop, self).__init__(input_processor, stdin)
+    def __init__(self, input_processor, stdin, executor=None):
+        super(Win32EventLoop, self).__init__(input_processor, stdin, executor=executor)
         self._event = _create_event()
         self._console_input_reader = ConsoleInputReader()
 
@@ -29,26 +29,30 @@ class Win32EventLoop(BaseEventLoop):
         if self.closed:
             raise Exception('Event loop already closed.')
 
-        timeout = int(1000 * self.input_timeout)
+        # Fire the input timeout event when there is no input for a while.
+        input_timeout_timer = self.call_later(self.input_timeout, self.onInputTimeout.fire)
 
-        while True:
-            handle = _wait_for_handles([self._event, self._console_input_reader.handle], timeout)
+        try:
+            while True:
+                timeout = self._get_timeout()
+                timeout = -1 if timeout is None else int(1000 * timeout)
 
-            if handle == self._event:
-                ret = windll.kernel32.ResetEvent(self._event)
-                self.process_queued_calls_from_executor()
-                return
+                handle = _wait_for_handles([self._event, self._console_input_reader.handle], timeout)
 
-            elif handle == self._console_input_reader.handle:
-                keys = self._console_input_reader.read()
-                for k in keys:
-                    self.input_processor.feed_key(k)
-                return
+                if handle == self._event:
+                    ret = windll.kernel32.ResetEvent(self._event)
+                    self.process_queued_calls_from_executor()
+                    return
 
-            else:
-                # Fire input timeout event.
-                self.onInputTimeout.fire()
-                timeout = -1
+                elif handle == self._console_input_reader.handle:
+                    keys = self._console_input_reader.read()
+                    for k in keys:
+                        self.input_processor.feed_key(k)
+                    return
+
+                self._run_timers()
+        finally:
+            input_timeout_timer.cancel()
 
     def close(self):
         super(Win32EventLoop, self).close()
@@ -61,11 +65,10 @@ class Win32EventLoop(BaseEventLoop):
         Call this function in the main event loop.
         Similar to Twisted's ``callFromThread``.
         """
-        # Append to list of pending callbacks.
-        self._calls_from_executor.append(callback)
-
-        # Set Windows event.
-        windll.kernel32.SetEvent(self._event)
+        # Append to the queue of pending callbacks, and set the Windows event
+        # when it was empty.
+        if self._queue_call_from_executor(callback):
+            windll.kernel32.SetEvent(self._event)
 
 
 def _wait_for_handles(handles, timeout=-1):
@@ -0,0 +1,167 @@
+"""
+Text storage with cheap edits at the cursor position, for large inputs.
+"""
+from __future__ import unicode_literals
+
+__all__ = (
+    'GapBuffer',
+)
+
+#: Small chunks are merged while typing, up to this size.
+_CHUNK_SIZE = 256
+
+#: When the text is assembled and there are more chunks than this, they are
+#: merged.
+_MAX_CHUNKS = 1024
+
+
+class GapBuffer(object):
+    """
+    Mutable text, stored as two lists of string chunks: the text before the
+    "gap" and the text after it. The gap is at the position of the last edit.
+
+    Inserting and deleting text at the gap is O(1) amortized. Moving the gap
+    is proportional to the distance (in chunks). Big chunks are split in
+    halves when the gap has to move into them, so that going back and forth
+    near the cursor stays cheap.
+
+    The `text` property assembles the string. (That's O(n), but the result
+    is cached until the next edit.)
+
+    :param text: The initial text.
+    """
+    def __init__(self, text=''):
+        self.set_text(text)
+
+    def set_text(self, text):
+        """
+        Replace the whole text.
+        """
+        #: Chunks before the gap, in order.
+        self._before = [text] if text else []
+
+        #: Chunks after the gap, in reversed order. (The last one comes right
+        #: after the gap.)
+        self._after = []
+
+        self._gap = len(text)
+        self._length = len(text)
+        self._text = text
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def text(self):
+        if self._text is None:
+            chunks = self._before + self._after[::-1]
+            self._text = ''.join(chunks)
+
+            if len(chunks) > _MAX_CHUNKS:
+                self._before = [self._text[:self._gap]]
+                self._after = [self._text[self._gap:]]
+
+        return self._text
+
+    def insert(self, position, data):
+        """
+        Insert `data` at this position.
+        """
+        if not data:
+            return
+
+        self._move_gap(position)
+
+        before = self._before
+        if before and len(before[-1]) < _CHUNK_SIZE and len(data) < _CHUNK_SIZE:
+            before[-1] += data
+        else:
+            before.append(data)
+
+        self._gap += len(data)
+        self._length += len(data)
+        self._text = None
+
+    def delete(self, start, end):
+        """
+        Delete the text between these positions. Return the deleted text.
+        """
+        start = max(0, start)
+        end = min(end, self._length)
+
+        if start >= end:
+            return ''
+
+        self._move_gap(end)
+        deleted = ''.join(self._pop_before(end - start))
+
+        self._gap = start
+        self._length -= len(deleted)
+        self._text = None
+        return deleted
+
+    def _move_gap(self, position):
+        position = max(0, min(position, self._length))
+
+        if position < self._gap:
+            chunks = self._pop_before(self._gap - position)
+            self._after.extend(reversed(chunks))
+
+        elif position > self._gap:
+            chunks = self._pop_after(position - self._gap)
+            self._before.extend(chunks)
+
+        self._gap = position
+
+    def _pop_before(self, count):
+        """
+        Remove `count` characters from the end of the text before the gap.
+        Return them as a list of chunks (in order).
+        """
+        chunks = self._before
+        result = []
+
+        while count:
+            chunk = chunks.pop()
+
+            if len(chunk) <= count:
+                result.append(chunk)
+                count -= len(chunk)
+            elif len(chunk) > _CHUNK_SIZE and count < len(chunk) // 2:
+                # Split big chunks first, so that we don't have to copy it
+                # again on the next call.
+                half = len(chunk) // 2
+                chunks.append(chunk[:half])
+                chunks.append(chunk[half:])
+            else:
+                chunks.append(chunk[:-count])
+                result.append(chunk[-count:])
+                count = 0
+
+        result.reverse()
+        return result
+
+    def _pop_after(self, count):
+        """
+        Remove `count` characters from the start of the text after the gap.
+        Return them as a list of chunks (in order).
+        """
+        chunks = self._after
+        result = []
+
+        while count:
+            chunk = chunks.pop()
+
+            if len(chunk) <= count:
+                result.append(chunk)
+                count -= len(chunk)
+            elif len(chunk) > _CHUNK_SIZE and count < len(chunk) // 2:
+                half = len(chunk) // 2
+                chunks.append(chunk[half:])
+                chunks.append(chunk[:half])
+            else:
+                chunks.append(chunk[count:])
+                result.append(chunk[:count])
+                count = 0
+
+        return result
@@ -1,11 +1,59 @@
 from __future__ import unicode_literals
 
-import datetime
+import array
+import bisect
+import operator
 import os
+import re
 
 __all__ = ('History', 'FileHistory')
 
 
+def _search_entries(corpus, offsets, needle, start, end, backwards, contains, base=0):
+    """
+    Search for `needle` in the `corpus` (a string that contains all the
+    entries, one after the other) and return the index of the entry that
+    contains it. Only the entries in the range [start, end) are searched.
+
+    :param offsets: Sorted sequence with the offsets of the entries in the
+                    corpus.
+    :param backwards: Return the last entry instead of the first.
+    :param contains: Callable that receives an index and returns True when the
+                     entry really contains the text. (The corpus can contain
+                     matches that span several entries.)
+    :param base: The offset where the corpus starts. (When it is only a part
+                 of the text that `offsets` refers to.)
+    """
+    if start >= end:
+        return None
+
+    low = offsets[start] - base
+    high = offsets[end] - base if end < len(offsets) else len(corpus)
+
+    while True:
+        if backwards:
+            position = corpus.rfind(needle, low, high)
+        else:
+            position = corpus.find(needle, low, high)
+
+        if position < 0:
+            return None
+
+        index = bisect.bisect_right(offsets, position + base) - 1
+
+        if contains(index):
+            return index
+
+        # Every match in this entry spans the next entry. Continue before or
+        # after it.
+        if backwards:
+            high = offsets[index] - base + len(needle) - 1
+        elif index + 1 < len(offsets):
+            low = offsets[index + 1] - base
+        else:
+            return None
+
+
 class History(object):
     """
     Base ``History`` class that keeps a list of all strings in memory.
@@ -13,6 +61,12 @@ class History(object):
     def __init__(self):
         self.strings = []
 
+        # Search index: all the strings joined together (each followed by a
+        # null character), and the offsets of the strings in there. This is
+        # extended before searching, when strings have been appended.
+        self._search_text = ''
+        self._search_offsets = array.array(str('L'))
+
     def append(self, string):
         self.strings.append(string)
 
@@ -22,42 +76,200 @@ class History(object):
     def __len__(self):
         return len(self.strings)
 
+    def _update_search_index(self):
+        count = len(self._search_offsets)
+
+        if count < len(self.strings):
+            new_strings = self.strings[count:]
+            offset = len(self._search_text)
+
+            for string in new_strings:
+                self._search_offsets.append(offset)
+                offset += len(string) + 1
+
+            self._search_text += '\x00'.join(new_strings) + '\x00'
+
+    def find(self, text, start=0, end=None):
+        """
+        Return the index of the first string in the range [start, end) that
+        contains `text`. Return `None` if nothing was found.
+        """
+        return self._find(text, start, end, False)
+
+    def find_backwards(self, text, start=0, end=None):
+        """
+        Return the index of the last string in the range [start, end) that
+        contains `text`. Return `None` if nothing was found.
+        """
+        return self._find(text, start, end, True)
+
+    def _find(self, text, start, end, backwards):
+        self._update_search_index()
+
+        if end is None:
+            end = len(self)
+
+        return _search_entries(self._search_text, self._search_offsets, text,
+                               max(0, start), min(end, len(self)), backwards,
+                               lambda index: text in self[index])
+
+
+# Regex matching the start of an entry in the history file (except at the
+# start of the file): a line that doesn't start with '+', followed by one that
+# does. The match ends at that '+'.
+_FILE_ENTRY_START_RE = re.compile(br'\n(?:[^+\n][^\n]*)?\n(?=\+)')
+
+# Regex matching one entry in the history file: a group of consecutive lines
+# that start with '+'.
+_FILE_ENTRY_RE = re.compile(br'(?:\+.*\n?)+')
+
 
 class FileHistory(History):
     """
     ``History`` class that stores all strings in a file.
+
+    The file is not kept in memory. At construction, we read it in blocks
+    and only look up where the entries are. The entries are read from the
+    file when they are accessed, and searching reads it again in blocks. (We
+    don't memory map the file: when another process truncates or rewrites it,
+    like another shell that saves its history, accessing the mapping would
+    crash with SIGBUS. Reading only returns less data.)
     """
+    #: The number of decoded entries to keep in memory.
+    cache_size = 64
+
+    #: The number of bytes to read at once, when loading and searching.
+    block_size = 1024 * 1024
+
     def __init__(self, filename):
-        super(FileHistory, self).__init__()
         self.filename = filename
 
+        #: Offsets of the entries in the file. (Of the first '+'.)
+        self._starts = array.array(str('L'))
+
+        #: The file, opened for reading, or `None`.
+        self._file = None
+
+        #: The size of the file when it was loaded.
+        self._size = 0
+
+        #: Strings that were appended after loading the file.
+        self._appended = []
+
+        #: Recently decoded entries.
+        self._cache = {}
+
         self._load()
 
     def _load(self):
-        lines = []
+        if not os.path.exists(self.filename):
+            return
 
-        def add():
-            if lines:
-                # Join and drop trailing newline.
-                string = ''.join(lines)[:-1]
+        # Keep the file open. (When it's replaced by another file, we keep
+        # reading the one that the offsets belong to.)
+        self._file = f = open(self.filename, 'rb')
 
-                self.strings.append(string)
+        # The first entry can start at the first or the second line.
+        first_line = f.readline()
+        if first_line[:1] == b'+':
+            self._starts.append(0)
+        elif f.read(1) == b'+':
+            self._starts.append(len(first_line))
 
-        if os.path.exists(self.filename):
-            with open(self.filename, 'rb') as f:
-                for line in f:
-                    line = line.decode('utf-8')
+        f.seek(0)
 
-                    if line.startswith('+'):
-                        lines.append(line[1:])
-                    else:
-                        add()
-                        lines = []
+        # Find the other entries, one block at a time. Every match that starts
+        # before the second to last newline of the buffer is complete, the rest of
+        # the buffer is searched again with the next block.
+        # This is the only thing we do for every entry at startup, so keep it
+        # out of the Python interpreter loop.
+        data = b''
+        data_offset = 0
 
-                add()
+        while True:
+            block = f.read(self.block_size)
+            data += block
+
+            if block:
+                last_newline = data.rfind(b'\n')
+                newline = data.rfind(b'\n', 0, last_newline)
+                if newline < 0:
+                    continue
+                end = last_newline + 1
+            else:
+                end = len(data)
+
+            self._starts.extend(map(data_offset.__add__, map(
+                operator.methodcaller('end'), _FILE_ENTRY_START_RE.finditer(data, 0, end))))
+
+            if not block:
+                break
+
+            data = data[newline:]
+            data_offset += newline
+
+        self._size = data_offset + len(data)
+
+    def close(self):
+        """
+        Close the file. (The entries that were read from it can't be accessed
+        anymore.)
+        """
+        if self._file:
+            self._file.close()
+
+    def _read(self, offset, size):
+        """
+        Read `size` bytes at this offset from the file. (Less at the end of
+        the file.)
+        """
+        if hasattr(os, 'pread'):
+            return os.pread(self._file.fileno(), size, offset)
+        else:
+            self._file.seek(offset)
+            return self._file.read(size)
+
+    def _entry_end(self, index):
+        """
+        The offset in the file where the entry at this index ends. (That is,
+        where the next entry starts.)
+        """
+        return self._starts[index + 1] if index + 1 < len(self._starts) else self._size
+
+    def _read_entry(self, index):
+        """
+        Read and decode the entry at this index from the file.
+        """
+        try:
+            return self._cache[index]
+        except KeyError:
+            start = self._starts[index]
+            match = _FILE_ENTRY_RE.match(self._read(start, self._entry_end(index) - start))
+
+            # (Nothing when the file was truncated or rewritten.)
+            data = match.group(0).decode('utf-8', 'replace') if match else '\n'
+
+            # Drop the '+' at the start of every line, and the trailing
+            # newline.
+            string = data[1:].replace('\n+', '\n')[:-1]
+
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[index] = string
+
+            return string
+
+    @property
+    def strings(self):
+        """
+        List of all the strings. (This reads the whole file.)
+        """
+        return [self[i] for i in range(len(self))]
 
     def append(self, string):
-        super(FileHistory, self).append(string)
+        import datetime
+
+        self._appended.append(string)
 
         # Save to file.
         with open(self.filename, 'ab') as f:
@@ -66,3 +278,81 @@ class FileHistory(History):
             write('\n# %s\n' % datetime.datetime.now())
             for line in string.split('\n'):
                 write('+%s\n' % line)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(len(self)))]
+
+        if key < 0:
+            key += len(self)
+
+        if 0 <= key < len(self._starts):
+            return self._read_entry(key)
+        elif key >= 0:
+            return self._appended[key - len(self._starts)]
+        else:
+            raise IndexError('history index out of range')
+
+    def __len__(self):
+        return len(self._starts) + len(self._appended)
+
+    def _find(self, text, start, end, backwards):
+        # Search the file itself, so that no index has to be built. In the
+        # file, every line of an entry starts with '+'.
+        file_count = len(self._starts)
+
+        if end is None:
+            end = len(self)
+
+        start = max(0, start)
+        end = min(end, len(self))
+
+        needle = text.encode('utf-8').replace(b'\n', b'\n+')
+        contains = lambda index: text in self[index]
+        starts = self._starts
+
+        def find_in_block(first, last):
+            # Search the entries in the range [first, last).
+            offset = starts[first]
+            data = self._read(offset, self._entry_end(last - 1) - offset)
+            return _search_entries(data, starts, needle, first, last, backwards, contains, base=offset)
+
+        def find_in_file():
+            # Read blocks of about `block_size` bytes, made of whole entries.
+            # (A match in an entry doesn't span two blocks.)
+            file_end = min(end, file_count)
+
+            if backwards:
+                last = file_end
+                while last > start:
+                    first = bisect.bisect_left(
+                        starts, self._entry_end(last - 1) - self.block_size, start, last - 1)
+                    result = find_in_block(first, last)
+                    if result is not None:
+                        return result
+                    last = first
+            else:
+                first = start
+                while first < file_end:
+                    last = bisect.bisect_left(
+                        starts, starts[first] + self.block_size, first + 1, file_end)
+                    result = find_in_block(first, last)
+                    if result is not None:
+                        return result
+                    first = last
+
+        def find_in_appended():
+            indexes = range(max(start, file_count), end)
+            if backwards:
+                indexes = reversed(indexes)
+
+            for i in indexes:
+                if text in self[i]:
+                    return i
+
+        if backwards:
+            result = find_in_appended()
+            return find_in_file() if result is None else result
+        else:
+            result = find_in_file()
+            return find_in_appended() if result is None else result
@@ -10,6 +10,7 @@ from __future__ import unicode_literals
 from .keys import Keys
 from .enums import InputMode
 
+import time
 import weakref
 
 __all__ = (
@@ -52,6 +53,9 @@ class InputProcessor(object):
         # registered in the registry.
 
     """
+    #: :class:`~prompt_toolkit.profiler.Profiler` or `None`.
+    profiler = None
+
     def __init__(self, registry):
         self._registry = registry
         self.reset()
@@ -102,45 +106,26 @@ class InputProcessor(object):
         that would handle this.
         """
         keys = tuple(k.key for k in key_presses)
-        bindings = self._registry.key_bindings
-
-        # Try match, with mode flag
-        with_mode = [b for b in bindings if b.keys == keys and b.input_mode == self.input_mode]
-        if with_mode:
-            return with_mode
-
-        # Try match without mode.
-        without_mode = [b for b in bindings if b.keys == keys and b.input_mode is None]
-        if without_mode:
-            return without_mode
+        get_bindings = self._registry.get_bindings_for_keys
 
-        # Try match, where the last key is replaced with 'Any', with mode.
-        keys_any = tuple(keys[:-1] + (Keys.Any,))
+        # Try match, with mode flag, then without mode. After that, try the
+        # same where the last key is replaced with 'Any'.
+        keys_any = keys[:-1] + (Keys.Any,)
 
-        with_mode_any = [b for b in bindings if b.keys == keys_any and b.input_mode == self.input_mode]
-        if with_mode_any:
-            return with_mode_any
-
-        # Try match, where the last key is replaced with 'Any', without mode.
-        without_mode_any = [b for b in bindings if b.keys == keys_any and b.input_mode is None]
-        if without_mode_any:
-            return without_mode_any
-
-        return []
+        return (get_bindings(keys, self.input_mode) or
+                get_bindings(keys, None) or
+                get_bindings(keys_any, self.input_mode) or
+                get_bindings(keys_any, None))
 
     def _is_prefix_of_longer_match(self, key_presses):
         """
         For a list of :class:`KeyPress` instances. Return True if there is any
         handler that is bound to a suffix of this keys.
         """
-        keys = [k.key for k in key_presses]
-
-        for b in self._registry.key_bindings:
-            if b.input_mode in (None, self.input_mode):
-                if len(b.keys) > len(keys) and list(b.keys[:len(key_presses)]) == keys:
-                    return True
+        keys = tuple(k.key for k in key_presses)
+        is_prefix = self._registry.is_prefix_of_longer_binding
 
-        return False
+        return is_prefix(keys, self.input_mode) or is_prefix(keys, None)
 
     def _process(self):
         buffer = []
@@ -182,6 +167,9 @@ class InputProcessor(object):
         """
         Send a new :class:`KeyPress` into this processor.
         """
+        if self.profiler:
+            self.profiler.count('keys')
+
         self._process_coroutine.send(key_press)
 
     def _call_handler(self, handler, key_sequence=None):
@@ -190,8 +178,16 @@ class InputProcessor(object):
 
         event = Event(weakref.ref(self), arg=arg, key_sequence=key_sequence,
                       previous_key_sequence=self._previous_key_sequence)
+
+        profiler = self.profiler
+        if profiler:
+            start = time.time()
+
         handler.call(event)
 
+        if profiler:
+            profiler.add_time('key_handlers', start)
+
         for h in self._registry.after_handler_callbacks:
             h(event)
 
@@ -274,6 +270,14 @@ class Registry(object):
         self.key_bindings = []
         self.after_handler_callbacks = []
 
+        #: Index of the key bindings. Maps (input_mode, keys) to the list of
+        #: bindings for exactly this key sequence, in order of registration.
+        self._bindings_for_keys = {}
+
+        #: Set of (input_mode, keys) tuples that are the start of a longer
+        #: key binding.
+        self._prefixes = set()
+
     def add_binding(self, *keys, **kwargs):
         """
         Decorator for annotating key bindings.
@@ -283,9 +287,36 @@ class Registry(object):
         assert keys
 
         def decorator(func):
-            self.key_bindings.append(_Binding(keys, func, input_mode=input_mode))
+            binding = _Binding(keys, func, input_mode=input_mode)
+            self.key_bindings.append(binding)
+
+            # Update index.
+            self._bindings_for_keys.setdefault((input_mode, keys), []).append(binding)
+
+            for i in range(1, len(keys)):
+                self._prefixes.add((input_mode, keys[:i]))
+
             return func
         return decorator
 
+    def get_bindings_for_keys(self, keys, input_mode):
+        """
+        Return the list of bindings for exactly this key sequence in this
+        input mode. (Bindings without input mode are only returned when
+        `input_mode` is `None`.)
+
+        :param keys: tuple of `Keys` instances.
+        """
+        return self._bindings_for_keys.get((input_mode, keys), [])
+
+    def is_prefix_of_longer_binding(self, keys, input_mode):
+        """
+        True when a binding for this input mode exists that starts with this
+        key sequence, but is longer.
+
+        :param keys: tuple of `Keys` instances.
+        """
+        return (input_mode, keys) in self._prefixes
+
     def add_after_handler_callback(self, callback):
         self.after_handler_callbacks.append(callback)
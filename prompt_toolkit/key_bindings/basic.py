@@ -240,6 +240,24 @@ def basic_bindings(registry, cli_ref):
         """
         line.insert_text(event.data * event.arg)
 
+    @handle(Keys.BracketedPaste)
+    def _(event):
+        """
+        Pasted text. (Only when the terminal supports bracketed paste.) All of
+        it is inserted at once.
+        """
+        # Terminals send '\r' as line ending.
+        data = event.data.replace('\r\n', '\n').replace('\r', '\n')
+        line.insert_text(data)
+
+    @handle(Keys.BracketedPaste, in_mode=InputMode.SYSTEM)
+    def _(event):
+        """
+        Pasted text at the system prompt.
+        """
+        data = event.data.replace('\r\n', '\n').replace('\r', '\n')
+        system_line.insert_text(data)
+
     @handle(Keys.CPRResponse)
     def _(event):
         """
@@ -403,6 +403,15 @@ def emacs_bindings(registry, cli_ref):
         search_line.insert_text(event.data)
         line.set_search_text(search_line.text)
 
+    @handle(Keys.BracketedPaste, in_mode=InputMode.INCREMENTAL_SEARCH)
+    def _(event):
+        """
+        Pasted text in isearch. (The lines are joined, the search string is
+        one line.)
+        """
+        search_line.insert_text(' '.join(event.data.splitlines()))
+        line.set_search_text(search_line.text)
+
     @handle(Keys.ControlJ, in_mode=InputMode.INCREMENTAL_SEARCH)
     @handle(Keys.ControlM, in_mode=InputMode.INCREMENTAL_SEARCH)
     def _(event):
@@ -923,6 +923,15 @@ def vi_bindings(registry, cli_ref):
         search_line.insert_text(event.data)
         line.set_search_text(search_line.text)
 
+    @handle(Keys.BracketedPaste, in_mode=InputMode.VI_SEARCH)
+    def _(event):
+        """
+        Pasted text after the / or ? prompt. (The lines are joined, the search
+        string is one line.)
+        """
+        search_line.insert_text(' '.join(event.data.splitlines()))
+        line.set_search_text(search_line.text)
+
     @handle(Keys.ControlJ, in_mode=InputMode.VI_SEARCH)
     @handle(Keys.ControlM, in_mode=InputMode.VI_SEARCH)
     def _(event):
@@ -94,3 +94,4 @@ class Keys(object):
 
     # Special
     CPRResponse = Key('<Cursor-Position-Response>')
+    BracketedPaste = Key('<Bracketed-Paste>')
@@ -5,6 +5,9 @@ from __future__ import unicode_literals
 
 from pygments.token import Token
 from ..renderer import Screen, Size, Point, Char
+from .lexers import IncrementalLexer
+
+import time
 
 
 __all__ = (
@@ -54,6 +57,9 @@ class Layout(object):
                              highlighting mismatches of brackets in case of
                              Python input.)
     :param menus: List of `Menu` classes or `None`.
+    :param incremental_lexing: When `True`, only re-lex the lines of the input
+                               that changed, instead of the whole text. (This
+                               is faster for large inputs.)
     """
     def __init__(self,
                  before_input=None,
@@ -66,7 +72,8 @@ class Layout(object):
                  lexer=None,
                  min_height=0,
                  show_tildes=False,
-                 line_name='default'):
+                 line_name='default',
+                 incremental_lexing=False):
 
         self.before_input = before_input
         self.after_input = after_input
@@ -84,6 +91,9 @@ class Layout(object):
                 stripnl=False,
                 stripall=False,
                 ensurenl=False)
+
+            if incremental_lexing:
+                self.lexer = IncrementalLexer(self.lexer)
         else:
             self.lexer = None
 
@@ -111,8 +121,13 @@ class Layout(object):
         Tokenize input text for highlighting.
         """
         line = self._line(cli)
+        profiler = cli.profiler
 
         def get():
+            if profiler:
+                profiler.count('lexer_calls')
+                start = time.time()
+
             if self.lexer:
                 tokens = list(self.lexer.get_tokens(line.text))
             else:
@@ -120,8 +135,14 @@ class Layout(object):
 
             for p in self.input_processors:
                 tokens = p.process_tokens(tokens)
+
+            if profiler:
+                profiler.add_time('lexer', start)
             return tokens
 
+        if profiler:
+            profiler.count('token_cache_lookups')
+
         return self._token_lru_cache.get(line.text, get)
 
     def get_highlighted_characters(self, line):
@@ -230,8 +251,7 @@ class Layout(object):
                 self.left_margin.write(cli, screen, y, y + self.vertical_scroll)
 
             # Write line content.
-            for x in range(0, temp_screen.size.columns):
-                screen._buffer[y + top_margin][x + left_margin_width] = temp_screen._buffer[y + self.vertical_scroll][x]
+            screen.copy_row_from(temp_screen, y + self.vertical_scroll, y + top_margin, left_margin_width)
 
         screen.cursor_position = Point(y=temp_screen.cursor_position.y - self.vertical_scroll + top_margin,
                                        x=temp_screen.cursor_position.x + left_margin_width)
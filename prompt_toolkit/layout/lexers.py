@@ -0,0 +1,387 @@
+"""
+Incremental lexing of the input text.
+"""
+from __future__ import unicode_literals
+
+from pygments.token import Token, Error, _TokenType
+
+from ..utils import common_prefix_length, common_suffix_length
+
+import itertools
+import re
+
+__all__ = (
+    'IncrementalLexer',
+)
+
+
+def _literal_prefix(regex):
+    """
+    Return the literal text that every match of this compiled regular
+    expression starts with. (Like the quote of a string, or the opening of a
+    comment.) Returns an empty string when we don't know.
+    """
+    pattern = regex.pattern
+
+    if regex.flags & (re.IGNORECASE | re.VERBOSE):
+        return ''
+
+    # Alternatives at the top level can start with anything.
+    depth = 0
+    in_class = False
+    escaped = False
+    for c in pattern:
+        if escaped:
+            escaped = False
+        elif c == '\\':
+            escaped = True
+        elif in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return ''
+
+    result = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            char = pattern[i + 1]
+            i += 2
+        elif c in '.^$*+?{}[]|()\\':
+            break
+        else:
+            char = c
+            i += 1
+
+        # This character is optional.
+        if i < len(pattern) and pattern[i] in '*?{':
+            break
+
+        result.append(char)
+
+        if i < len(pattern) and pattern[i] == '+':
+            break
+
+    return ''.join(result)
+
+
+def _may_match_newline(regex):
+    """
+    Tell whether this compiled regular expression could match a newline.
+    This is a rough check of the pattern, which errs on the side of `True`.
+    """
+    pattern = regex.pattern
+    dotall = bool(regex.flags & re.DOTALL) or '(?s' in pattern
+
+    # Escape sequences that match a newline, and the ones that we don't check.
+    newline_escapes = 'nsWD'
+    unknown_escapes = 'xuUN'
+
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+
+        if c == '\\':
+            if pattern[i + 1:i + 2] in newline_escapes + unknown_escapes:
+                return True
+            i += 2
+
+        elif c == '[':
+            # Character class.
+            i += 1
+            negated = pattern[i:i + 1] == '^'
+            if negated:
+                i += 1
+
+            contains_newline = False
+            start = i
+            while i < len(pattern) and (pattern[i] != ']' or i == start):
+                if pattern[i] == '\\':
+                    escape = pattern[i + 1:i + 2]
+                    if escape in unknown_escapes or (
+                            pattern[i + 2:i + 3] == '-' and pattern[i + 3:i + 4] not in ('', ']')):
+                        return True
+                    contains_newline = contains_newline or escape in newline_escapes
+                    i += 2
+                elif pattern[i + 1:i + 2] == '-' and pattern[i + 2:i + 3] not in ('', ']'):
+                    # Range.
+                    if pattern[i + 2] == '\\':
+                        return True
+                    contains_newline = contains_newline or pattern[i] <= '\n' <= pattern[i + 2]
+                    i += 3
+                else:
+                    contains_newline = contains_newline or pattern[i] == '\n'
+                    i += 1
+
+            if contains_newline != negated:
+                return True
+            i += 1
+
+        elif c == '\n' or (c == '.' and dotall):
+            return True
+
+        else:
+            i += 1
+
+    return False
+
+
+def _lex_with_states(tokendefs, lexer, text, stack):
+    """
+    Run the state machine of a Pygments `RegexLexer` over `text`, starting
+    with the given state stack. This is the loop of
+    `RegexLexer.get_tokens_unprocessed`, except that it also reports the state
+    of the lexer, and where the lexer could have looked ahead.
+
+    :param tokendefs: Like `lexer._tokens`, but with a fourth item for every
+        rule: the `_literal_prefix` of its regular expression when it could
+        match a newline, or an empty string.
+
+    Yields (token, value, stack, looked_ahead) tuples. For the last token of
+    every match, `stack` is the state stack after that match (a tuple). For
+    the other tokens it's `None`. `looked_ahead` is `True` for the first token
+    of a match when a rule was tried before, that started to match here but
+    failed. (Like an unterminated string or comment.) Such a rule could have
+    looked ahead up to the end of the text.
+    """
+    pos = 0
+    statestack = list(stack)
+    statetokens = tokendefs[statestack[-1]]
+
+    looked_ahead = False
+
+    while True:
+        for rexmatch, action, new_state, prefix in statetokens:
+            m = rexmatch(text, pos)
+            if m:
+                if action is None:
+                    tokens = []
+                elif type(action) is _TokenType:
+                    tokens = [(action, m.group())]
+                else:
+                    tokens = [(t, v) for _, t, v in action(lexer, m)]
+
+                pos = m.end()
+
+                if new_state is not None:
+                    # State transition.
+                    if isinstance(new_state, tuple):
+                        for state in new_state:
+                            if state == '#pop':
+                                if len(statestack) > 1:
+                                    statestack.pop()
+                            elif state == '#push':
+                                statestack.append(statestack[-1])
+                            else:
+                                statestack.append(state)
+                    elif isinstance(new_state, int):
+                        # Pop, but keep at least one state on the stack.
+                        if abs(new_state) >= len(statestack):
+                            del statestack[1:]
+                        else:
+                            del statestack[new_state:]
+                    elif new_state == '#push':
+                        statestack.append(statestack[-1])
+                    else:
+                        assert False, 'wrong state def: %r' % new_state
+
+                    statetokens = tokendefs[statestack[-1]]
+
+                if tokens:
+                    for i, (t, v) in enumerate(tokens[:-1]):
+                        yield t, v, None, looked_ahead and i == 0
+
+                    t, v = tokens[-1]
+                    yield t, v, tuple(statestack), looked_ahead and len(tokens) == 1
+                    looked_ahead = False
+                break
+
+            elif prefix and text.startswith(prefix, pos):
+                looked_ahead = True
+        else:
+            # None of the rules matched.
+            try:
+                if text[pos] == '\n':
+                    # At EOL, reset state to "root".
+                    statestack = ['root']
+                    statetokens = tokendefs['root']
+                    yield Token.Text.Whitespace, '\n', ('root', ), True
+                    looked_ahead = False
+                    pos += 1
+                    continue
+
+                yield Error, text[pos], tuple(statestack), True
+                looked_ahead = False
+                pos += 1
+            except IndexError:
+                break
+
+
+class IncrementalLexer(object):
+    """
+    Wrapper around a Pygments lexer that only re-lexes the lines that changed
+    since the previous call.
+
+    For every line, we remember the tokens and the state stack of the lexer at
+    the start of that line. After an edit, lexing restarts from the last line
+    before the first changed line that starts at a token boundary in the root
+    state, and stops as soon as the lexer arrives at an unchanged line that
+    starts at a token boundary in the same state as before. The tokens of all
+    the following lines are reused.
+
+    A single token can span several lines, while the lexer stays in the same
+    state. (Like a string or comment that is matched by one regular
+    expression.) When such a rule was tried, but didn't find the end of the
+    token, it looked ahead into the following lines, and it could match
+    after an edit in any of these. So, we also remember the lines where that
+    happened, and restart before them. (We only know this for rules that
+    start with a literal text, like a quote, and for the positions where no
+    rule matched at all.)
+
+    This only works for lexers that run the `RegexLexer` state machine as-is.
+    For all other lexers (and lexer options that preprocess the input), the
+    whole text is lexed on every call.
+
+    :param lexer: Pygments lexer instance.
+    """
+    def __init__(self, lexer):
+        from pygments.lexer import RegexLexer
+
+        self.lexer = lexer
+
+        self._is_incremental = (
+            isinstance(lexer, RegexLexer) and
+            getattr(type(lexer).get_tokens_unprocessed, '__func__', type(lexer).get_tokens_unprocessed) is
+            getattr(RegexLexer.get_tokens_unprocessed, '__func__', RegexLexer.get_tokens_unprocessed) and
+            not lexer.filters and not lexer.stripnl and not lexer.stripall and
+            not lexer.ensurenl and not lexer.tabsize)
+
+        if self._is_incremental:
+            self._tokendefs = dict(
+                (state, [(rexmatch, action, new_state,
+                          _literal_prefix(rexmatch.__self__) if _may_match_newline(rexmatch.__self__) else '')
+                         for rexmatch, action, new_state in rules])
+                for state, rules in lexer._tokens.items())
+
+        self.reset()
+
+    def reset(self):
+        #: The text of every line. (Without the line ending.)
+        self._line_texts = []
+
+        #: For every line, the state stack of the lexer at the start of that
+        #: line, or `None` when a token crosses the start of that line.
+        self._line_stacks = []
+
+        #: For every line, the list of (Token, text) tuples. (Including the
+        #: line ending.)
+        self._line_tokens = []
+
+        #: For every line, whether the lexer could have looked ahead into the
+        #: following lines from there.
+        self._line_lookaheads = []
+
+    def get_tokens(self, text):
+        """
+        Return the list of (Token, text) tuples for this text.
+        """
+        # The preprocessing of Pygments replaces '\r' and removes the byte
+        # order mark. These texts are rare, just lex them completely.
+        if not self._is_incremental or '\r' in text or text.startswith('\ufeff'):
+            return list(self.lexer.get_tokens(text))
+
+        self._update(text.split('\n'))
+        return list(itertools.chain.from_iterable(self._line_tokens))
+
+    def _update(self, new_lines):
+        """
+        Update the cached tokens for these new lines.
+        """
+        old_lines = self._line_texts
+        old_stacks = self._line_stacks
+
+        # Find the first changed line and the amount of unchanged lines at the
+        # end.
+        prefix = common_prefix_length(old_lines, new_lines)
+
+        if prefix == len(old_lines) == len(new_lines):
+            return
+
+        suffix = min(common_suffix_length(old_lines, new_lines),
+                     len(old_lines) - prefix, len(new_lines) - prefix)
+
+        # Restart at the last line before the first changed line that starts
+        # at a token boundary in the root state. Not just at the line before
+        # the change: a rule that was tried before could have looked ahead
+        # into the changed line. (For instance, to find the end of a multiline
+        # string.) When that could have happened before, restart at or before
+        # the first line where it did. When no such line is found, this
+        # lexes the whole text again.
+        start = max(0, min(prefix - 1, len(old_lines) - 1))
+        if True in self._line_lookaheads[:start]:
+            start = self._line_lookaheads.index(True)
+
+        while start > 0 and old_stacks[start] != ('root', ):
+            start -= 1
+
+        stack = ('root', )
+
+        # From this line on, we can reuse the old lines.
+        resync_from = len(new_lines) - suffix
+        delta = len(new_lines) - len(old_lines)
+
+        stacks = [stack]
+        tokens = [[]]
+        lookaheads = [False]
+        line = start
+
+        for token, value, state, looked_ahead in _lex_with_states(
+                self._tokendefs, self.lexer, '\n'.join(new_lines[start:]), stack):
+            if looked_ahead:
+                lookaheads[-1] = True
+
+            if '\n' not in value:
+                tokens[-1].append((token, value))
+                continue
+
+            parts = value.split('\n')
+
+            for i, part in enumerate(parts[:-1]):
+                tokens[-1].append((token, part + '\n'))
+
+                # Start of the next line. We only know the state of the lexer
+                # when the token ended here. (Otherwise, the token crosses the
+                # start of this line.)
+                line += 1
+                next_stack = state if i == len(parts) - 2 and not parts[-1] else None
+
+                if (line >= resync_from and next_stack is not None and
+                        next_stack == old_stacks[line - delta]):
+                    # Same line, same state, and a token boundary at the start
+                    # of the line before and now: reuse everything that
+                    # follows.
+                    self._line_texts = new_lines
+                    self._line_stacks = old_stacks[:start] + stacks + old_stacks[line - delta:]
+                    self._line_tokens = (self._line_tokens[:start] + tokens +
+                                         self._line_tokens[line - delta:])
+                    self._line_lookaheads = (self._line_lookaheads[:start] + lookaheads +
+                                             self._line_lookaheads[line - delta:])
+                    return
+
+                stacks.append(next_stack)
+                tokens.append([])
+                lookaheads.append(False)
+
+            if parts[-1]:
+                tokens[-1].append((token, parts[-1]))
+
+        self._line_texts = new_lines
+        self._line_stacks = old_stacks[:start] + stacks
+        self._line_tokens = self._line_tokens[:start] + tokens
+        self._line_lookaheads = self._line_lookaheads[:start] + lookaheads
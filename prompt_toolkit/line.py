@@ -8,14 +8,13 @@ from .completion import Completion
 from .validation import ValidationError
 from .document import Document
 from .enums import IncrementalSearchDirection
+from .gap_buffer import GapBuffer
 from .history import History
 from .selection import SelectionType, SelectionState
 from .utils import EventHook
 
 import os
 import six
-import subprocess
-import tempfile
 
 __all__ = (
     'ClipboardData',
@@ -101,6 +100,90 @@ class _IncrementalSearchState(object):
         self.isearch_direction = direction
 
 
+class _WorkingLines(object):
+    """
+    The working lines of a `Line`: all the entries of the history, followed by
+    the new input. The user can edit the entries, but that doesn't change the
+    history. (Entries are only copied when they are modified.)
+
+    :param history: :class:`~prompt_toolkit.history.History` instance.
+    :param initial_value: The text of the new input.
+    """
+    def __init__(self, history, initial_value=''):
+        self._history = history
+
+        # Entries that are appended to the history after this point are not
+        # part of the working lines.
+        self._history_length = len(history)
+
+        #: Maps indexes to modified entries.
+        self._modified = {self._history_length: initial_value}
+
+    def __len__(self):
+        return self._history_length + 1
+
+    def _check_index(self, index):
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError('working lines index out of range')
+
+        return index
+
+    def __getitem__(self, index):
+        index = self._check_index(index)
+
+        try:
+            return self._modified[index]
+        except KeyError:
+            return self._history[index]
+
+    def __setitem__(self, index, value):
+        self._modified[self._check_index(index)] = value
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def find(self, text, start):
+        """
+        Return the index of the first line, starting at `start`, that contains
+        `text`, or `None`.
+        """
+        # Search the history. (Skip entries that were modified.)
+        index = start
+        while True:
+            index = self._history.find(text, index, self._history_length)
+            if index is None or index not in self._modified:
+                break
+            index += 1
+
+        # Compare with the modified entries.
+        for i, value in self._modified.items():
+            if i >= start and (index is None or i < index) and text in value:
+                index = i
+
+        return index
+
+    def find_backwards(self, text, end):
+        """
+        Return the index of the last line before `end` that contains `text`,
+        or `None`.
+        """
+        index = end
+        while True:
+            index = self._history.find_backwards(text, 0, min(index, self._history_length))
+            if index is None or index not in self._modified:
+                break
+
+        for i, value in self._modified.items():
+            if i < end and (index is None or i > index) and text in value:
+                index = i
+
+        return index
+
+
 class Line(object):
     """
     The core data structure that holds the text and cursor position of the
@@ -118,8 +201,13 @@ class Line(object):
                         line a multiline input. If so, the `InputStreamHandler`
                         can decide to insert newlines when pressing [Enter].
                         (Instead of accepting the input.)
+    :attr gap_buffer: Boolean. When `True`, store the text in a
+                      :class:`~prompt_toolkit.gap_buffer.GapBuffer`. Inserting
+                      and deleting at the cursor position then don't have to
+                      copy the whole text, which is faster for large inputs.
     """
-    def __init__(self, completer=None, history=None, validator=None, tempfile_suffix='', is_multiline=False):
+    def __init__(self, completer=None, history=None, validator=None, tempfile_suffix='',
+                 is_multiline=False, gap_buffer=False):
         self.completer = completer
         self.validator = validator
         self.is_multiline = is_multiline
@@ -134,6 +222,10 @@ class Line(object):
 
         self.__cursor_position = 0
 
+        #: `GapBuffer` that holds the text of the current working line, or
+        #: `None`. (In that case, it's in `_working_lines`.)
+        self._gap_buffer = GapBuffer() if gap_buffer else None
+
         # Events
         self.onTextChanged = EventHook()
         self.onTextInsert = EventHook()
@@ -164,21 +256,30 @@ class Line(object):
         #: Ctrl-C should reset this, and copy the whole history back in here.
         #: Enter should process the current command and append to the real
         #: history.
-        self._working_lines = self._history.strings[:]
-        self._working_lines.append(initial_value)
+        self._working_lines = _WorkingLines(self._history, initial_value)
         self.__working_index = len(self._working_lines) - 1
 
+        if self._gap_buffer is not None:
+            self._gap_buffer.set_text(initial_value)
+
     # <getters/setters>
 
     @property
     def text(self):
-        return self._working_lines[self.working_index]
+        if self._gap_buffer is not None:
+            return self._gap_buffer.text
+        else:
+            return self._working_lines[self.working_index]
 
     @text.setter
     def text(self, value):
         assert isinstance(value, six.text_type), 'Got %r' % value
-        original_value = self._working_lines[self.working_index]
-        self._working_lines[self.working_index] = value
+        original_value = self.text
+
+        if self._gap_buffer is not None:
+            self._gap_buffer.set_text(value)
+        else:
+            self._working_lines[self.working_index] = value
 
         if value != original_value:
             self._text_changed()
@@ -207,6 +308,11 @@ class Line(object):
 
     @working_index.setter
     def working_index(self, value):
+        if self._gap_buffer is not None:
+            # Store the text of the working line that we leave.
+            self._working_lines[self.__working_index] = self._gap_buffer.text
+            self._gap_buffer.set_text(self._working_lines[value])
+
         self.__working_index = value
         self._text_changed()
 
@@ -221,6 +327,24 @@ class Line(object):
 
     # End of <getters/setters>
 
+    def _replace_text(self, start, end, data):
+        """
+        Replace the text between `start` and `end` with `data`. Return the
+        text that was replaced. (The cursor position is not changed.)
+        """
+        if self._gap_buffer is not None:
+            deleted = self._gap_buffer.delete(start, end)
+            self._gap_buffer.insert(start, data)
+
+            if deleted != data:
+                self._text_changed()
+        else:
+            text = self.text
+            deleted = text[start:end]
+            self.text = text[:start] + data + text[end:]
+
+        return deleted
+
     @property
     def document(self):
         """
@@ -335,8 +459,7 @@ class Line(object):
         deleted = ''
 
         if self.cursor_position > 0:
-            deleted = self.text[self.cursor_position - count:self.cursor_position]
-            self.text = self.text[:self.cursor_position - count] + self.text[self.cursor_position:]
+            deleted = self._replace_text(max(0, self.cursor_position - count), self.cursor_position, '')
             self.cursor_position -= len(deleted)
 
         return deleted
@@ -345,13 +468,7 @@ class Line(object):
         """
         Delete one character. Return deleted character.
         """
-        if self.cursor_position < len(self.text):
-            deleted = self.document.text_after_cursor[:count]
-            self.text = self.text[:self.cursor_position] + \
-                self.text[self.cursor_position + len(deleted):]
-            return deleted
-        else:
-            return ''
+        return self._replace_text(self.cursor_position, self.cursor_position + count, '')
 
     def join_next_line(self):
         """
@@ -476,6 +593,9 @@ class Line(object):
         current_line = self.document.current_line_before_cursor.lstrip()
 
         for i, string in enumerate(self._working_lines):
+            if i == self.working_index:
+                string = self.text
+
             for j, l in enumerate(string.split('\n')):
                 l = l.strip()
                 if l and l.startswith(current_line):
@@ -622,9 +742,9 @@ class Line(object):
             if '\n' in overwritten_text:
                 overwritten_text = overwritten_text[:overwritten_text.find('\n')]
 
-            self.text = self.text[:self.cursor_position] + data + self.text[self.cursor_position+len(overwritten_text):]
+            self._replace_text(self.cursor_position, self.cursor_position + len(overwritten_text), data)
         else:
-            self.text = self.text[:self.cursor_position] + data + self.text[self.cursor_position:]
+            self._replace_text(self.cursor_position, self.cursor_position, data)
 
         if move_cursor:
             self.cursor_position += len(data)
@@ -743,15 +863,15 @@ class Line(object):
                 found = True
             else:
                 # No match, go back in the history.
-                for i in range(self.working_index - 1, -1, -1):
+                i = self._working_lines.find_backwards(isearch_text, self.working_index)
+                if i is not None:
                     document = Document(self._working_lines[i], len(self._working_lines[i]))
                     new_index = document.find_backwards(isearch_text)
-                    if new_index is not None:
-                        self.working_index = i
-                        self.cursor_position = len(self._working_lines[i]) + new_index
-                        self.isearch_state.no_match_from_index = None
-                        found = True
-                        break
+
+                    self.working_index = i
+                    self.cursor_position = len(self._working_lines[i]) + new_index
+                    self.isearch_state.no_match_from_index = None
+                    found = True
         else:
             # Try find at the current input.
             new_index = self.document.find(isearch_text)
@@ -761,18 +881,15 @@ class Line(object):
                 found = True
             else:
                 # No match, go forward in the history.
-                for i in range(self.working_index + 1, len(self._working_lines)):
+                i = self._working_lines.find(isearch_text, self.working_index + 1)
+                if i is not None:
                     document = Document(self._working_lines[i], 0)
                     new_index = document.find(isearch_text, include_current_position=True)
-                    if new_index is not None:
-                        self.working_index = i
-                        self.cursor_position = new_index
-                        self.isearch_state.no_match_from_index = None
-                        found = True
-                        break
-                else:
-                    # If no break: we didn't found a match.
-                    found = False
+
+                    self.working_index = i
+                    self.cursor_position = new_index
+                    self.isearch_state.no_match_from_index = None
+                    found = True
 
         return found
 
@@ -793,6 +910,8 @@ class Line(object):
         """
         Open code in editor.
         """
+        import tempfile
+
         # Write to temporary file
         descriptor, filename = tempfile.mkstemp(self.tempfile_suffix)
         os.write(descriptor, self.text.encode('utf-8'))
@@ -811,6 +930,8 @@ class Line(object):
 
     def _open_file_in_editor(self, filename):
         """ Call editor executable. """
+        import subprocess
+
         # If the 'EDITOR' environment variable has been set, use that one.
         # Otherwise, fall back to the first available editor that we can find.
         editor = os.environ.get('EDITOR')
@@ -0,0 +1,256 @@
+"""
+Instrumentation of the input and render pipeline.
+
+::
+
+    profiler = Profiler()
+    profiler.onFrame += lambda frame: print(frame.latency, frame.phases)
+
+    cli = CommandLineInterface(profiler=profiler)
+
+A frame covers the work from the first key press after the previous render
+until the output of the next render has been flushed. For every frame, the
+time spent in every phase and a few counters are collected:
+
+Phases:
+
+- ``input``: Parsing the input and processing the key presses. (Including
+  the key handlers.)
+- ``key_handlers``: The key handlers.
+- ``layout``: Writing the layout to the screen. (Including the lexer.)
+- ``lexer``: Lexing the input text.
+- ``diff``: Comparing the screen with the previous one.
+- ``flush``: Writing the output to the terminal.
+
+Counters: ``keys``, ``lexer_calls``, ``token_cache_lookups`` (a lookup that
+didn't result in a lexer call is a cache hit), ``rows_changed``,
+``cells_diffed`` and ``chars_written``.
+
+Without a profiler, the instrumented code only does an ``if profiler`` check
+for every phase.
+
+A session can be recorded to a file with `FrameRecorder` and summarized
+with::
+
+    python -m prompt_toolkit.profiler session.log
+"""
+from __future__ import unicode_literals, print_function
+
+import json
+import math
+import sys
+import time
+
+from .utils import EventHook
+
+__all__ = (
+    'Frame',
+    'Profiler',
+    'FrameRecorder',
+    'summarize',
+)
+
+#: Order of the phases in the summary.
+_PHASES = ['input', 'key_handlers', 'layout', 'lexer', 'diff', 'flush']
+
+
+class Frame(object):
+    """
+    Record of the work for one rendered frame.
+
+    :param start: Time of the first key press or phase of this frame.
+    """
+    def __init__(self, start, end=None, phases=None, counters=None):
+        self.start = start
+        self.end = end
+
+        #: Maps phase names to seconds.
+        self.phases = phases or {}
+
+        #: Maps counter names to numbers.
+        self.counters = counters or {}
+
+    @property
+    def latency(self):
+        """
+        Seconds from the start of the frame until the output was flushed.
+        """
+        return self.end - self.start
+
+    @property
+    def keys(self):
+        return self.counters.get('keys', 0)
+
+    def to_dict(self):
+        return {
+            'start': self.start,
+            'end': self.end,
+            'phases': self.phases,
+            'counters': self.counters,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['start'], data['end'], data['phases'], data['counters'])
+
+    def __repr__(self):
+        return 'Frame(latency=%r, phases=%r, counters=%r)' % (
+            self.latency, self.phases, self.counters)
+
+
+class Profiler(object):
+    """
+    Collects the timings and counters of every frame. The `onFrame` event is
+    fired with the :class:`.Frame` after every render.
+    """
+    def __init__(self):
+        #: Called with the :class:`.Frame` when its output has been flushed.
+        self.onFrame = EventHook()
+
+        #: Number of frames so far.
+        self.frame_count = 0
+
+        self._frame = None
+
+    def _get_frame(self, start):
+        frame = self._frame
+
+        if frame is None:
+            frame = self._frame = Frame(start)
+
+        # (Phases can be nested. The outer one is added last.)
+        elif start < frame.start:
+            frame.start = start
+
+        return frame
+
+    def add_time(self, phase, start):
+        """
+        Add the time since `start` (a ``time.time()`` value) to this phase of
+        the current frame.
+        """
+        frame = self._get_frame(start)
+        frame.phases[phase] = frame.phases.get(phase, 0) + time.time() - start
+
+    def count(self, counter, amount=1):
+        """
+        Increase this counter of the current frame.
+        """
+        frame = self._get_frame(time.time())
+        frame.counters[counter] = frame.counters.get(counter, 0) + amount
+
+    def end_frame(self):
+        """
+        End the current frame, after its output has been flushed.
+        """
+        frame = self._get_frame(time.time())
+        frame.end = time.time()
+
+        self._frame = None
+        self.frame_count += 1
+        self.onFrame.fire(frame)
+
+
+class FrameRecorder(object):
+    """
+    `onFrame` handler that appends every frame as a line of JSON to a file.
+
+    ::
+
+        profiler.onFrame += FrameRecorder('session.log')
+    """
+    def __init__(self, filename):
+        self.filename = filename
+
+    def __call__(self, frame):
+        with open(self.filename, 'a') as f:
+            f.write(json.dumps(frame.to_dict()) + '\n')
+
+    def read(self):
+        """
+        Return the recorded frames.
+        """
+        with open(self.filename, 'r') as f:
+            return [Frame.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+def _percentile(values, percentile):
+    """
+    Nearest-rank percentile of a sorted list.
+    """
+    if not values:
+        return 0
+    index = int(math.ceil(percentile / 100. * len(values))) - 1
+    return values[max(0, min(len(values) - 1, index))]
+
+
+def summarize(frames):
+    """
+    Summarize a list of frames. Latencies only take the frames with key
+    presses into account.
+
+    Returns a dictionary with:
+
+    - ``frames`` and ``key_frames``: the number of frames (with key presses).
+    - ``latency``: a (p50, p99, max) tuple of the keystroke-to-flush latency.
+    - ``phases``: maps phases to (p50, p99, max) tuples.
+    - ``counters``: maps counters to (total, average per frame) tuples.
+    """
+    key_frames = [f for f in frames if f.keys]
+
+    def stats(values):
+        values = sorted(values)
+        return (_percentile(values, 50), _percentile(values, 99), values[-1] if values else 0)
+
+    phases = set()
+    counters = set()
+    for f in frames:
+        phases.update(f.phases)
+        counters.update(f.counters)
+
+    return {
+        'frames': len(frames),
+        'key_frames': len(key_frames),
+        'latency': stats(f.latency for f in key_frames),
+        'phases': dict((p, stats(f.phases.get(p, 0) for f in key_frames)) for p in phases),
+        'counters': dict((c, (sum(f.counters.get(c, 0) for f in frames),
+                              sum(f.counters.get(c, 0) for f in frames) / float(len(frames) or 1)))
+                         for c in counters),
+    }
+
+
+def main(argv=None):
+    """
+    Print the summary of a recorded session.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+
+    if len(argv) != 1:
+        print('Usage: python -m prompt_toolkit.profiler <session.log>')
+        sys.exit(1)
+
+    summary = summarize(FrameRecorder(argv[0]).read())
+
+    print('Frames: %i (%i with key presses)' % (summary['frames'], summary['key_frames']))
+    print('')
+    print('                      p50         p99         max')
+
+    def print_stats(name, values):
+        print('%-14s %8.2f ms %8.2f ms %8.2f ms' % ((name, ) + tuple(v * 1000 for v in values)))
+
+    print_stats('latency', summary['latency'])
+
+    phases = summary['phases']
+    for name in _PHASES + sorted(set(phases) - set(_PHASES)):
+        if name in phases:
+            print_stats('  ' + name, phases[name])
+
+    print('')
+    print('                    total   per frame')
+
+    for name, (total, average) in sorted(summary['counters'].items()):
+        print('%-20s %8i %11.1f' % (name, total, average))
+
+
+if __name__ == '__main__':
+    main()
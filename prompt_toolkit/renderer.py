@@ -4,19 +4,16 @@ Renders the command line on the console.
 """
 from __future__ import unicode_literals
 import sys
-import six
 import errno
+import time
 
-from collections import defaultdict, namedtuple
+from collections import namedtuple
 
 from pygments.style import Style
 from pygments.token import Token
 
-
-try:
-    from wcwidth import wcwidth
-except ImportError:
-    from .libs.wcwidth import wcwidth
+from .utils import common_prefix_length, common_suffix_length
+from .width import get_cwidth, get_width
 
 
 if sys.platform == 'win32':
@@ -35,18 +32,27 @@ __all__ = (
 Point = namedtuple('Point', 'y x')
 Size = namedtuple('Size', 'rows columns')
 
-#: Cache for wcwidth sizes.
-_CHAR_SIZES_CACHE = [wcwidth(six.unichr(i)) for i in range(0, 64000)]
+#: Cache for the widths of cell values.
+_CHAR_WIDTHS = {}
 
 
-def _get_width(c):
+def _get_char_width(char):
     """
-    Return width of character. Wrapper around ``wcwidth``.
+    Return the width of a (possibly mapped, so multi-character) cell value.
     """
     try:
-        return _CHAR_SIZES_CACHE[ord(c)]
-    except IndexError:
-        return wcwidth(c)
+        return _CHAR_WIDTHS[char]
+    except KeyError:
+        # We use the `max(0, ...` because some non printable control
+        # characters, like e.g. Ctrl-underscore get a -1 wcwidth value.
+        # It can be possible that these characters end up in the input text.
+        if len(char) == 1:
+            width = max(0, get_cwidth(char))
+        else:
+            width = get_width(char)
+
+        _CHAR_WIDTHS[char] = width
+        return width
 
 
 class Char(object):
@@ -99,28 +105,41 @@ class Char(object):
         self.z_index = z_index
 
     def get_width(self):
-        # We use the `max(0, ...` because some non printable control
-        # characters, like e.g. Ctrl-underscore get a -1 wcwidth value.
-        # It can be possible that these characters end up in the input text.
-        char = self.char
-        if len(char) == 1:
-            return max(0, _get_width(char))
-        else:
-            return max(0, sum([_get_width(c) for c in char]))
+        return _get_char_width(self.char)
+
+    def __eq__(self, other):
+        return (isinstance(other, Char) and self.char == other.char and
+                self.token == other.token and self.z_index == other.z_index)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
 
     def __repr__(self):
         return 'Char(%r, %r, %r)' % (self.char, self.token, self.z_index)
 
 
+#: Cell value that is stored in the second cell of a double width character.
+#: (The first cell contains the character itself.)
+_WIDE_CHAR_PLACEHOLDER = ''
+
+
 class Screen(object):
     """
     Two dimentional buffer for the output.
 
-    :param style: Pygments style.
-    :param grayed: True when all tokes should be replaced by `Token.Aborted`
+    The cells are stored row-major, without allocating an object per cell: for
+    every row there is one list with the characters, one with the tokens and
+    one with the z-indexes. A row is only as long as its right-most written
+    cell; everything after that (and every cell that was never written) is
+    equal to ``Char()``.
+
+    :param size: :class:`Size` instance.
     """
     def __init__(self, size):
-        self._buffer = defaultdict(lambda: defaultdict(Char))
+        self._chars = []
+        self._tokens = []
+        self._z_indexes = []
+
         self._cursor_mappings = {}  # Map `source_string_index` of input data to (row, col) screen output.
         self._x = 0
         self._y = 0
@@ -132,23 +151,85 @@ class Screen(object):
 
     @property
     def current_height(self):
-        if not self._buffer:
-            return 1
-        else:
-            return max(self._buffer.keys()) + 1
+        return len(self._chars) or 1
 
     def get_cursor_position(self):
         return self.cursor_position
 
+    def get_char(self, y, x):
+        """
+        Return the :class:`.Char` at position (y, x).
+        """
+        try:
+            return Char(self._chars[y][x], self._tokens[y][x], self._z_indexes[y][x])
+        except IndexError:
+            return Char()
+
+    def _allocate_row(self, y):
+        """
+        Make sure that row `y` (and all the rows above) exist.
+        """
+        while len(self._chars) <= y:
+            self._chars.append([])
+            self._tokens.append([])
+            self._z_indexes.append([])
+
+    def _write_cell(self, y, x, char, token, z_index):
+        """
+        Write a (display mapped) character to a cell, unless the cell has a
+        higher z-index.
+        """
+        if y >= len(self._chars):
+            self._allocate_row(y)
+
+        chars = self._chars[y]
+        width = len(chars)
+
+        if x < width:
+            z_indexes = self._z_indexes[y]
+            if z_index >= z_indexes[x]:
+                chars[x] = char
+                self._tokens[y][x] = token
+                z_indexes[x] = z_index
+        else:
+            tokens = self._tokens[y]
+            z_indexes = self._z_indexes[y]
+
+            # Fill up the row with empty cells.
+            if x > width:
+                chars.extend([' '] * (x - width))
+                tokens.extend([Token] * (x - width))
+                z_indexes.extend([0] * (x - width))
+
+            chars.append(char)
+            tokens.append(token)
+            z_indexes.append(z_index)
+
+    def _write_char_at_pos(self, y, x, char, token, z_index):
+        """
+        Write a (display mapped) character at position (y, x) and return its
+        width. For double width characters, the second cell gets a
+        placeholder, so that if this character gets deleted afterwards, the
+        ``output_screen_diff`` will notice that this cell changed as well.
+        """
+        char_width = _get_char_width(char)
+        self._write_cell(y, x, char, token, z_index)
+
+        if char_width > 1 and x + 1 < self.size.columns:
+            self._write_cell(y, x + 1, _WIDE_CHAR_PLACEHOLDER, token, z_index)
+
+        return char_width
+
     def write_char(self, char, token, string_index=None,
-                   set_cursor_position=False, z_index=False):
+                   set_cursor_position=False, z_index=0):
         """
         Write char to current cursor position and move cursor.
         """
         assert len(char) == 1
 
-        char_obj = Char(char, token, z_index)
-        char_width = char_obj.get_width()
+        # If this character has to be displayed otherwise, take that one.
+        display_char = Char.display_mappings.get(char, char)
+        char_width = _get_char_width(display_char)
 
         # In case there is no more place left at this line, go first to the
         # following line. (Also in case of double-width characters.)
@@ -172,15 +253,12 @@ class Screen(object):
 
         # Insertion of a 'visible' character.
         else:
-            if char_obj.z_index >= self._buffer[self._y][self._x].z_index:
-                self._buffer[self._y][self._x] = char_obj
+            self._write_cell(self._y, self._x, display_char, token, z_index)
 
-            # When we have a double width character, store this byte in the
-            # second cell. So that if this character gets deleted afterwarsd,
-            # the ``output_screen_diff`` will notice that this byte is also
-            # gone and redraw both cells.
+            # When we have a double width character, store a placeholder in
+            # the second cell. (See `_write_char_at_pos`.)
             if char_width > 1:
-                self._buffer[self._y][self._x+1] = Char(six.unichr(0))
+                self._write_cell(self._y, self._x + 1, _WIDE_CHAR_PLACEHOLDER, token, z_index)
 
             # Move position
             self._x += char_width
@@ -196,8 +274,7 @@ class Screen(object):
         """
         # Add char to buffer
         if x < self.size.columns:
-            if char_obj.z_index >= self._buffer[y][x].z_index:
-                self._buffer[y][x] = char_obj
+            self._write_char_at_pos(y, x, char_obj.char, char_obj.token, char_obj.z_index)
 
     def write_highlighted_at_pos(self, y, x, data, z_index=0):
         """
@@ -206,11 +283,17 @@ class Screen(object):
 
         :param data: Enumerable of (Token, text) tuples.
         """
+        columns = self.size.columns
+        get_mapping = Char.display_mappings.get
+
         for token, text in data:
             for c in text:
-                char_obj = Char(c, token, z_index)
-                self.write_at_pos(y, x, char_obj)
-                x += char_obj.get_width()
+                c = get_mapping(c, c)
+
+                if x < columns:
+                    x += self._write_char_at_pos(y, x, c, token, z_index)
+                else:
+                    x += _get_char_width(c)
 
     def write_highlighted(self, data):
         """
@@ -220,160 +303,511 @@ class Screen(object):
             for c in text:
                 self.write_char(c, token=token)
 
+    def copy_row_from(self, source, source_y, y, x=0):
+        """
+        Copy row `source_y` of the `source` screen to position (y, x) of this
+        screen. Cells are overwritten regardless of their z-index.
+        (Truncate when the row doesn't fit.)
+
+        :param source: :class:`.Screen` instance.
+        """
+        if source_y >= len(source._chars):
+            return
+
+        length = min(len(source._chars[source_y]), self.size.columns - x)
+
+        if length > 0:
+            self._allocate_row(y)
 
-def output_screen_diff(output, screen, current_pos, previous_screen=None, last_char=None, accept_or_abort=False, style=None, grayed=False):
+            for rows, source_rows, empty in ((self._chars, source._chars, ' '),
+                                             (self._tokens, source._tokens, Token),
+                                             (self._z_indexes, source._z_indexes, 0)):
+                row = rows[y]
+                if len(row) < x:
+                    row.extend([empty] * (x - len(row)))
+                row[x:x + length] = source_rows[source_y][:length]
+
+
+class _TokenToAttrsCache(dict):
+    """
+    Cache that maps Pygments tokens to the terminal attributes for a style.
+    The values are (color, bgcolor, bold, underline) tuples, or `None` when
+    the style doesn't know the token.
+
+    :param style: Pygments style class.
+    :param grayed: True when all tokens should be replaced by `Token.Aborted`.
+    """
+    def __init__(self, style, grayed):
+        self.style = style
+        self.grayed = grayed
+
+    def __missing__(self, token):
+        # If grayed, replace token
+        if self.grayed:
+            token = Token.Aborted
+
+        try:
+            style = self.style.style_for_token(token)
+        except KeyError:
+            result = None
+        else:
+            result = (style['color'], style['bgcolor'],
+                      style.get('bold', False), style.get('underline', False))
+
+        self[token] = result
+        return result
+
+
+#: `_TokenToAttrsCache` instances for each (style, grayed) combination.
+#: (Pygments styles are classes that don't change, so when another style is
+#: used, it gets its own cache.)
+_TOKEN_TO_ATTRS_CACHES = {}
+
+
+def _get_token_to_attrs_cache(style, grayed):
+    """
+    Return the `_TokenToAttrsCache` for this style.
+    """
+    try:
+        return _TOKEN_TO_ATTRS_CACHES[style, grayed]
+    except KeyError:
+        result = _TOKEN_TO_ATTRS_CACHES[style, grayed] = _TokenToAttrsCache(style, grayed)
+        return result
+
+
+def _move_sequence_length(amount):
+    """
+    Length of the VT100 sequence that moves the cursor `amount` cells or rows.
+    (Like ``ESC [ 5 C``. For one cell, the amount is left out.)
+    """
+    if amount == 0:
+        return 0
+    elif amount == 1:
+        return 3
+    else:
+        return 3 + len(str(amount))
+
+
+def _find_row_shift(previous_chars, previous_tokens, new_chars, new_tokens, start):
+    """
+    Find rows of the previous screen that moved up or down, at or right after
+    row `start`. (The first row that changed. When a line was split or
+    joined, that row changed, and the rows after it moved.)
+
+    Returns a (position, amount, cells) tuple: the rows from `position` moved
+    `amount` rows down (up when negative), and `cells` is the number of
+    characters in those rows. `None` when no rows moved.
+    """
+    best = None
+
+    for position in (start, start + 1):
+        amounts = []
+
+        # Rows were deleted: the new row can be found further in the previous
+        # screen.
+        if position < len(new_chars):
+            try:
+                amounts.append(position - previous_chars.index(new_chars[position], position + 1))
+            except ValueError:
+                pass
+
+        # Rows were inserted.
+        if position < len(previous_chars):
+            try:
+                amounts.append(new_chars.index(previous_chars[position], position + 1) - position)
+            except ValueError:
+                pass
+
+        for amount in amounts:
+            previous_start = position + max(0, -amount)
+            new_start = position + max(0, amount)
+
+            count = min(common_prefix_length(previous_chars[previous_start:], new_chars[new_start:]),
+                        common_prefix_length(previous_tokens[previous_start:], new_tokens[new_start:]))
+            cells = sum(len(row) for row in new_chars[new_start:new_start + count])
+
+            if best is None or cells > best[2]:
+                best = (position, amount, cells)
+
+    return best
+
+
+def _find_cell_shift(previous_chars, previous_tokens, new_chars, new_tokens):
+    """
+    Find characters that were inserted or deleted in a row.
+
+    Returns a (position, amount, cells) tuple: `amount` cells were inserted
+    (deleted when negative) at `position`, and `cells` is the number of cells
+    after that, which moved.
+    """
+    start = min(common_prefix_length(new_chars, previous_chars),
+                common_prefix_length(new_tokens, previous_tokens))
+    cells = min(common_suffix_length(new_chars, previous_chars),
+                common_suffix_length(new_tokens, previous_tokens),
+                len(new_chars) - start, len(previous_chars) - start)
+
+    return start, len(new_chars) - len(previous_chars), cells
+
+
+def output_screen_diff(output, screen, current_pos, previous_screen=None, last_token=None, accept_or_abort=False, style=None, grayed=False, profiler=None,
+                       use_insert_delete=False, available_height=0):
     """
     Create diff of this screen with the previous screen.
+
+    :param profiler: :class:`~prompt_toolkit.profiler.Profiler` for counting
+        the changed rows and the compared cells, or `None`.
+    :param use_insert_delete: When True, the output supports inserting and
+        deleting characters and lines (the VT100 ICH, DCH, IL and DL
+        sequences). Characters and rows that moved are shifted on the terminal
+        instead of written again.
+    :param available_height: The amount of rows from the top of the output
+        until the bottom of the terminal, when known. (Otherwise 0.)
     """
-    #: Remember the last printed character.
-    last_char = [last_char]  # nonlocal
+    #: Remember the token of the last printed character. (`None` when the
+    #: attributes of the output are unknown.)
+    last_token = [last_token]  # nonlocal
     background_turned_on = [False]  # Nonlocal
 
     #: Variable for capturing the output.
     write = output.write
 
-    def move_cursor(new):
-        current_x, current_y = current_pos.x, current_pos.y
-
-        if new.y > current_y:
-            # Use newlines instead of CURSOR_DOWN, because this meight add new lines.
-            # CURSOR_DOWN will never create new lines at the bottom.
-            # Also reset attributes, otherwise the newline could draw a
-            # background color.
-            output.reset_attributes()
-            write('\r\n' * (new.y - current_y))
-            current_x = 0
-            output.cursor_forward(new.x)
-            last_char[0] = None  # Forget last char after resetting attributes.
-            return new
-        elif new.y < current_y:
-            output.cursor_up(current_y - new.y)
+    columns = screen.size.columns
 
-        if current_x >= screen.size.columns - 1:
-            write('\r')
-            output.cursor_forward(new.x)
-        elif new.x < current_x or current_x >= screen.size.columns - 1:
-            output.cursor_backward(current_x - new.x)
-        elif new.x > current_x:
-            output.cursor_forward(new.x - current_x)
+    #: The rows until this one exist on the terminal, so the cursor can move
+    #: down with CURSOR_DOWN instead of newlines. (Updated below.)
+    known_rows = [max(current_pos.y, available_height - 1)]  # nonlocal
 
-        return new
+    def reset_attributes(_=None):
+        output.reset_attributes()
+        last_token[0] = None  # Forget last char after resetting attributes.
 
-    def get_style_for_token(token, replace_if_grayed=True):
+    def may_draw_background():
         """
-        Get style
+        True when the current attributes could include a background color.
+        (Newlines, and inserted or deleted cells would draw it.)
         """
-        # If grayed, replace token
-        if grayed and replace_if_grayed:
-            token = Token.Aborted
+        token = last_token[0]
+        if token is None:
+            return True
 
-        try:
-            return style.style_for_token(token)
-        except KeyError:
+        attrs = attrs_for_token[token]
+        return bool(attrs and attrs[1])
+
+    def rewrite_text(y, start, end, token):
+        """
+        Text that moves the cursor from `start` to `end` on row `y`, by writing
+        the characters that are already displayed there again. `None` when
+        that's not possible: when the attributes are unknown or different from
+        those of the characters, or for double width characters.
+
+        (The cells before the next change of the diff, and all the cells of
+        the rows that were already done, display the new screen.)
+        """
+        if token is None or grayed:
             return None
 
-    def chars_are_equal(new_char, old_char):
+        if y < len(screen._chars):
+            chars = screen._chars[y]
+            tokens = screen._tokens[y]
+        else:
+            chars = tokens = []
+
+        result = []
+        for x in range(start, end):
+            if x < len(chars):
+                char = chars[x]
+                if tokens[x] != token or _get_char_width(char) != 1:
+                    return None
+                result.append(char)
+            elif token == Token:
+                result.append(' ')
+            else:
+                return None
+        return ''.join(result)
+
+    def horizontal_move(y, x, new_x, token):
         """
-        Test whether two `Char` instances are equal if printed.
+        Return a (cost, steps) tuple for the cheapest way to move from column
+        `x` (`None` when unknown) to `new_x` on row `y`, while the attributes
+        of `token` are active.
         """
-        new_token = Token.Aborted if grayed else new_char.token
+        # Carriage return and move forward.
+        best = (1 + _move_sequence_length(new_x), [(write, '\r'), (output.cursor_forward, new_x)])
+
+        if x is not None:
+            if new_x == x:
+                return 0, []
+            elif new_x > x:
+                cost = _move_sequence_length(new_x - x)
+                if cost < best[0]:
+                    best = (cost, [(output.cursor_forward, new_x - x)])
+            else:
+                # A backspace is one byte, a few of them are cheaper than
+                # CURSOR_BACKWARD.
+                amount = x - new_x
+                cost = 1 if amount == 1 else _move_sequence_length(amount)
+                if min(cost, amount) < best[0]:
+                    if amount < cost:
+                        best = (amount, [(output.cursor_backward, 1)] * amount)
+                    else:
+                        best = (cost, [(output.cursor_backward, amount)])
+
+        # Write the characters in between again. (Only when that can be
+        # cheaper: every character is at least one byte.)
+        for start, prefix in ((x, []), (0, [(write, '\r')])):
+            if start is not None and start <= new_x and len(prefix) + new_x - start < best[0]:
+                text = rewrite_text(y, start, new_x, token)
+                if text is not None:
+                    cost = len(prefix) + len(text.encode('utf-8'))
+                    if cost < best[0]:
+                        best = (cost, prefix + [(write, text)])
+
+        return best
+
+    def move_cursor(new):
+        """
+        Move the cursor with the least amount of bytes.
+        """
+        current_x, current_y = current_pos.x, current_pos.y
+        token = last_token[0]
+
+        # After writing the last column, the cursor stays in that column.
+        # (Autowrap is disabled.) We don't know where it is.
+        if current_x >= columns - 1:
+            current_x = None
 
-        # We ignore z-index, that does not matter if things get painted.
-        return new_char.char == old_char.char and new_token == old_char.token
+        if new.y == current_y:
+            cost, steps = horizontal_move(new.y, current_x, new.x, token)
 
-    def output_char(char):
+        elif new.y < current_y:
+            cost, steps = horizontal_move(new.y, current_x, new.x, token)
+            steps = [(output.cursor_up, current_y - new.y)] + steps
+
+        else:
+            # Use newlines, because this meight add new lines. CURSOR_DOWN
+            # will never create new lines at the bottom.
+            # Reset the attributes when they could include a background
+            # color, otherwise the newline could draw it.
+            if may_draw_background():
+                cost, steps = horizontal_move(new.y, 0, new.x, None)
+                steps = [(reset_attributes, None), (write, '\r\n' * (new.y - current_y))] + steps
+                cost += 4 + 2 * (new.y - current_y)
+            else:
+                cost, steps = horizontal_move(new.y, 0, new.x, token)
+                steps = [(write, '\r\n' * (new.y - current_y))] + steps
+                cost += 2 * (new.y - current_y)
+
+            # The cursor can only move down to rows that exist.
+            if new.y <= known_rows[0]:
+                down_cost, down_steps = horizontal_move(new.y, current_x, new.x, last_token[0])
+                down_cost += _move_sequence_length(new.y - current_y)
+
+                if down_cost < cost:
+                    steps = [(output.cursor_down, new.y - current_y)] + down_steps
+
+        for func, arg in steps:
+            func(arg)
+
+        known_rows[0] = max(known_rows[0], new.y)
+        return new
+
+    #: Terminal attributes for each token.
+    attrs_for_token = _get_token_to_attrs_cache(style, grayed)
+
+    def output_char(char, token):
         """
-        Write the output of this charact.r
+        Write the output of this character.
         """
         # If the last printed character has the same token, it also has the
         # same style, so we don't output it.
-        if last_char[0] and last_char[0].token == char.token:
-            write(char.char)
+        if last_token[0] is not None and last_token[0] == token:
+            write(char)
         else:
-            style = get_style_for_token(char.token)
+            attrs = attrs_for_token[token]
 
-            if style:
-                output.set_attributes(style['color'], style['bgcolor'],
-                                      bold=style.get('bold', False),
-                                      underline=style.get('underline', False))
+            if attrs:
+                output.set_attributes(*attrs)
 
                 # If we print something with a background color, remember that.
-                background_turned_on[0] = bool(style['bgcolor'])
+                background_turned_on[0] = bool(attrs[1])
             else:
                 # Reset previous style and output.
                 output.reset_attributes()
 
-            write(char.char)
-
-        last_char[0] = char
+            write(char)
 
+        last_token[0] = token
 
     # Disable autowrap
     if not previous_screen:
         output.disable_autowrap()
         output.reset_attributes()
+        last_token[0] = None
 
     # When the previous screen has a different size, redraw everything anyway.
     if not previous_screen or previous_screen.size != screen.size:
         current_pos = move_cursor(Point(0, 0))
         output.reset_attributes()
         output.erase_down()
+        last_token[0] = None
 
         previous_screen = Screen(screen.size)
 
+    # The rows of the previous screen with content were written before.
+    last_row = len(previous_screen._chars) - 1
+    while last_row > 0 and not previous_screen._chars[last_row]:
+        last_row -= 1
+    known_rows[0] = max(known_rows[0], last_row)
+
     # Get height of the screen.
-    # (current_height changes as we loop over _buffer, so remember the current value.)
     current_height = screen.current_height
 
+    #: The rows that are displayed on the terminal. (Rows that moved are
+    #: shifted below.)
+    previous_chars_rows = previous_screen._chars
+    previous_tokens_rows = previous_screen._tokens
+
+    # Rows that moved up or down: shift them with IL/DL. (Only when that
+    # doesn't push rows with content below the bottom of the terminal. The
+    # rows that come in at the bottom are empty.)
+    if use_insert_delete and not grayed:
+        start = min(common_prefix_length(screen._chars, previous_chars_rows),
+                    common_prefix_length(screen._tokens, previous_tokens_rows))
+        shift = _find_row_shift(previous_chars_rows, previous_tokens_rows,
+                                screen._chars, screen._tokens, start)
+
+        if shift:
+            position, amount, cells = shift
+
+            if (cells > 2 * _move_sequence_length(abs(amount)) and
+                    (amount < 0 or last_row + amount < available_height)):
+                current_pos = move_cursor(Point(y=position, x=0))
+                if may_draw_background():
+                    reset_attributes()
+
+                if amount > 0:
+                    output.insert_lines(amount)
+                    previous_chars_rows = previous_chars_rows[:position] + [[]] * amount + previous_chars_rows[position:]
+                    previous_tokens_rows = previous_tokens_rows[:position] + [[]] * amount + previous_tokens_rows[position:]
+                else:
+                    output.delete_lines(-amount)
+                    previous_chars_rows = previous_chars_rows[:position] + previous_chars_rows[position - amount:]
+                    previous_tokens_rows = previous_tokens_rows[:position] + previous_tokens_rows[position - amount:]
+
+    new_height = len(screen._chars)
+    previous_height = len(previous_chars_rows)
+
+    # When grayed, all the characters are printed with the `Token.Aborted`
+    # style.
+    aborted_token = Token.Aborted if grayed else None
+
     # Loop over the rows.
-    row_count = max(screen.current_height, previous_screen.current_height)
-    c = 0  # Column counter.
+    row_count = max(screen.current_height, previous_height or 1)
+
+    for y in range(0, row_count):
+        if y < new_height:
+            new_chars = screen._chars[y]
+            new_tokens = screen._tokens[y]
+        else:
+            new_chars = new_tokens = []
 
-    for y, r in enumerate(range(0, row_count)):
-        new_row = screen._buffer[r]
-        previous_row = previous_screen._buffer[r]
+        if y < previous_height:
+            previous_chars = previous_chars_rows[y]
+            previous_tokens = previous_tokens_rows[y]
+        else:
+            previous_chars = previous_tokens = []
+
+        # Skip the rows that didn't change. Comparing the lists happens in C,
+        # which is a lot cheaper than comparing the cells one by one.
+        if not grayed and new_chars == previous_chars and new_tokens == previous_tokens:
+            continue
+
+        new_width = len(new_chars)
+        previous_width = len(previous_chars)
+
+        # Characters that were inserted or deleted: shift the following cells
+        # with ICH/DCH. (Cells that come in at the end of the row are empty.)
+        if use_insert_delete and not grayed and new_width != previous_width:
+            position, amount, cells = _find_cell_shift(previous_chars, previous_tokens, new_chars, new_tokens)
+
+            if cells > 2 * _move_sequence_length(abs(amount)):
+                current_pos = move_cursor(Point(y=y, x=position))
+                if may_draw_background():
+                    reset_attributes()
+
+                if amount > 0:
+                    output.insert_characters(amount)
+                    previous_chars = previous_chars[:position] + [' '] * amount + previous_chars[position:]
+                    previous_tokens = previous_tokens[:position] + [Token] * amount + previous_tokens[position:]
+                else:
+                    output.delete_characters(-amount)
+                    previous_chars = previous_chars[:position] + previous_chars[position - amount:]
+                    previous_tokens = previous_tokens[:position] + previous_tokens[position - amount:]
+
+                previous_width = len(previous_chars)
+
+        # Cells after the end of the previous row are empty.
+        if previous_width < new_width:
+            previous_chars = previous_chars + [' '] * (new_width - previous_width)
+            previous_tokens = previous_tokens + [Token] * (new_width - previous_width)
+        elif previous_width > new_width:
+            previous_chars = previous_chars[:new_width]
+            previous_tokens = previous_tokens[:new_width]
+
+        # Only scan the span between the first and the last differing cell.
+        if grayed:
+            start, end = 0, new_width
+        else:
+            start = min(common_prefix_length(new_chars, previous_chars),
+                        common_prefix_length(new_tokens, previous_tokens))
+            end = new_width - min(common_suffix_length(new_chars, previous_chars),
+                                  common_suffix_length(new_tokens, previous_tokens))
 
-        new_max_line_len = max(new_row.keys()) if new_row else 0
-        previous_max_line_len = max(previous_row.keys()) if previous_row else 0
+        if profiler:
+            profiler.count('rows_changed')
+            profiler.count('cells_diffed', max(0, end - start))
 
         # Loop over the columns.
-        c = 0
-        while c < new_max_line_len + 1:
-            char_width = (new_row[c].get_width() or 1)
+        for c in range(start, end):
+            char = new_chars[c]
+            token = new_tokens[c]
 
-            if not chars_are_equal(new_row[c], previous_row[c]):
-                current_pos = move_cursor(Point(y=y, x=c))
-                output_char(new_row[c])
-                current_pos = current_pos._replace(x=current_pos.x + char_width)
+            # We ignore z-index, that does not matter if things get painted.
+            if char != previous_chars[c] or (aborted_token or token) != previous_tokens[c]:
+                # The second cell of a double width character is painted
+                # together with the first one.
+                if char == _WIDE_CHAR_PLACEHOLDER:
+                    continue
 
-            c += char_width
+                current_pos = move_cursor(Point(y=y, x=c))
+                output_char(char, token)
+                current_pos = current_pos._replace(x=current_pos.x + (_get_char_width(char) or 1))
 
         # If the new line is shorter, trim it
-        if previous_screen and new_max_line_len < previous_max_line_len:
-            current_pos = move_cursor(Point(y=y, x=new_max_line_len+1))
+        if new_width < previous_width:
+            current_pos = move_cursor(Point(y=y, x=new_width))
             output.reset_attributes()
             output.erase_end_of_line()
-            last_char[0] = None  # Forget last char after resetting attributes.
+            last_token[0] = None  # Forget last char after resetting attributes.
 
     # Move cursor:
     if accept_or_abort:
         current_pos = move_cursor(Point(y=current_height, x=0))
+        output.reset_attributes()
         output.erase_down()
+        output.enable_autowrap()
+        last_token[0] = None
     else:
         current_pos = move_cursor(screen.get_cursor_position())
 
-    if accept_or_abort:
-        output.reset_attributes()
-        output.enable_autowrap()
-
     # If the last printed character has a background color, always reset.
     # (Many terminals give weird artifacs on resize events when there is an
     # active background color.)
     if background_turned_on[0]:
         output.reset_attributes()
-        last_char[0] = None
+        last_token[0] = None
 
-    return current_pos, last_char[0]
+    return current_pos, last_token[0]
 
 
 class Renderer(object):
@@ -384,13 +818,34 @@ class Renderer(object):
 
         r = Renderer(layout)
         r.render(Render_context(...))
+
+    :param use_insert_delete: When True, characters and rows that moved are
+        shifted with the insert and delete sequences of the terminal (ICH,
+        DCH, IL and DL). Most terminals support these.
+    :param use_os_write: When True, every frame is encoded once and written
+        with `os.write` to the file descriptor of `stdout`, instead of through
+        the file object. (Which can split it into several writes, and fails
+        on non blocking file descriptors.)
+    :param synchronized_output: When True, every frame is wrapped in a
+        synchronized update (DEC mode 2026), so that the terminal doesn't
+        repaint halfway through a frame.
     """
-    def __init__(self, layout=None, stdout=None, style=None):
+    def __init__(self, layout=None, stdout=None, style=None, use_insert_delete=False,
+                 use_os_write=False, synchronized_output=False):
         self.layout = layout
         self.stdout = stdout or sys.stdout
         self._style = style or Style
         self._last_screen = None
 
+        #: Shift characters and rows that moved with the VT100 insert and
+        #: delete sequences, instead of writing them again. (Not for
+        #: Windows.)
+        self.use_insert_delete = use_insert_delete and sys.platform != 'win32'
+
+        #: Options of the `Vt100_Output`. (Not for Windows.)
+        self.use_os_write = use_os_write
+        self.synchronized_output = synchronized_output
+
         self.reset()
 
     def reset(self):
@@ -402,7 +857,7 @@ class Renderer(object):
         # difference. It's also to remember the last height. (To show for
         # instance a toolbar at the bottom position.)
         self._last_screen = None
-        self._last_char = None
+        self._last_token = None
 
         #: Space from the top of the layout, until the bottom of the terminal.
         #: We don't know this until a `report_absolute_cursor_row` call.
@@ -413,6 +868,16 @@ class Renderer(object):
         if sys.platform == 'win32':
             Output(self.stdout).scroll_buffer_to_prompt()
 
+    def _create_output(self):
+        """
+        Create the `Output` for writing a frame.
+        """
+        if sys.platform == 'win32':
+            return Output(self.stdout)
+        else:
+            return Output(self.stdout, use_os_write=self.use_os_write,
+                          synchronized_output=self.synchronized_output)
+
     def _write_and_flush(self, data):
         """
         Write to output stream and flush.
@@ -464,7 +929,11 @@ class Renderer(object):
         """
         Render the current interface to the output.
         """
-        output = Output(self.stdout)
+        profiler = cli.profiler
+        if profiler:
+            start = time.time()
+
+        output = self._create_output()
 
         # Create screen and write layout to it.
         screen = Screen(size=output.get_size())
@@ -475,16 +944,30 @@ class Renderer(object):
 
         accept_or_abort = cli.is_exiting or cli.is_aborting or cli.is_returning
 
+        if profiler:
+            profiler.add_time('layout', start)
+            start = time.time()
+
         # Process diff and write to output.
-        output_buffer = []
-        self._cursor_pos, self._last_char = output_screen_diff(
+        self._cursor_pos, self._last_token = output_screen_diff(
             output, screen, self._cursor_pos,
-            self._last_screen, self._last_char, accept_or_abort,
-            style=self._style, grayed=cli.is_aborting,
+            self._last_screen, self._last_token, accept_or_abort,
+            style=self._style, grayed=cli.is_aborting, profiler=profiler,
+            use_insert_delete=self.use_insert_delete,
+            available_height=self._min_available_height,
             )
         self._last_screen = screen
 
-        output.flush()
+        if profiler:
+            profiler.add_time('diff', start)
+            start = time.time()
+
+        written = output.flush()
+
+        if profiler:
+            profiler.add_time('flush', start)
+            profiler.count('chars_written', written)
+            profiler.end_frame()
 
     def erase(self):
         """
@@ -492,7 +975,7 @@ class Renderer(object):
         instance used for running a system command (while hiding the CLI) and
         later resuming the same CLI.)
         """
-        output = Output(self.stdout)
+        output = self._create_output()
 
         output.cursor_backward(self._cursor_pos.x)
         output.cursor_up(self._cursor_pos.y)
@@ -510,7 +993,7 @@ class Renderer(object):
         self.erase()
 
         # Send "Erase Screen" command and go to (0, 0).
-        output = Output(self.stdout)
+        output = self._create_output()
 
         output.erase_screen()
         output.cursor_goto(0, 0)
@@ -30,12 +30,47 @@ _cpr_response_re = re.compile('^' + re.escape('\x1b[') + r'\d+;\d+R$')
 # be shorter.)
 _cpr_response_prefix_re = re.compile('^' + re.escape('\x1b[') + r'[\d;]*$')
 
+# Marks the end of the pasted text in bracketed paste mode. (The start of the
+# pasted text is in the mappings.)
+_bracketed_paste_end = '\x1b[201~'
+
 
 class _Flush(object):
     """ Helper object to indicate flush operation to the parser. """
     pass
 
 
+class _TrieNode(object):
+    """
+    Node in the prefix tree of the escape sequences.
+
+    :attr children: Dictionary mapping the next character to a `_TrieNode`.
+    :attr key: The key (or tuple of keys) for the sequence that ends at this
+               node, or `None`.
+    """
+    __slots__ = ('children', 'key')
+
+    def __init__(self):
+        self.children = {}
+        self.key = None
+
+
+def _create_trie(mappings):
+    """
+    Compile the mappings of an `InputStream` into a prefix tree.
+    Returns the root `_TrieNode`.
+    """
+    root = _TrieNode()
+
+    for sequence, key in mappings.items():
+        node = root
+        for c in sequence:
+            node = node.children.setdefault(c, _TrieNode())
+        node.key = key
+
+    return root
+
+
 class InputStream(object):
     """
     Parser for VT100 input stream.
@@ -127,6 +162,9 @@ class InputStream(object):
         '\x1b[33~': Keys.F19,
         '\x1b[34~': Keys.F20,
 
+        # Start of the pasted text in bracketed paste mode.
+        '\x1b[200~': Keys.BracketedPaste,
+
         # Meta + arrow keys. Several terminals handle this differently.
         # The following sequences are for xterm and gnome-terminal.
         #     (Iterm sends ESC followed by the normal arrow_up/down/left/right
@@ -144,6 +182,7 @@ class InputStream(object):
 
     def __init__(self, input_processor):
         self._input_processor = input_processor
+        self._trie = _create_trie(self.mappings)
         self.reset()
 
         if _DEBUG_RENDERER_INPUT:
@@ -152,6 +191,18 @@ class InputStream(object):
     def reset(self, request=False):
         self._start_parser()
 
+        self._in_bracketed_paste = False
+        self._paste_chunks = []
+        self._paste_tail = ''
+
+    @property
+    def in_bracketed_paste(self):
+        """
+        True when we received the start, but not yet the end of a bracketed
+        paste.
+        """
+        return self._in_bracketed_paste
+
     def _start_parser(self):
         """
         Start the parser coroutine.
@@ -159,6 +210,20 @@ class InputStream(object):
         self._input_parser = self._input_parser_generator()
         self._input_parser.send(None)
 
+    def _find_node(self, prefix):
+        """
+        Return the node in the prefix tree for these characters, or `None`
+        when no sequence starts with them.
+        """
+        node = self._trie
+
+        for c in prefix:
+            node = node.children.get(c)
+            if node is None:
+                break
+
+        return node
+
     def _get_matches(self, prefix):
         """
         Return the keys that map to this prefix.
@@ -166,11 +231,14 @@ class InputStream(object):
         # (hard coded) If we match a CPR response, return Keys.CPRResponse.
         # (This one doesn't fit in the mappings, because it contains
         # integer variables.)
-        if _cpr_response_re.match(prefix):
+        if prefix.startswith('\x1b[') and _cpr_response_re.match(prefix):
             return [Keys.CPRResponse]
 
         # Otherwise, use the mappings.
-        return [v for k, v in self.mappings.items() if k == prefix]
+        node = self._find_node(prefix)
+        if node is not None and node.key is not None:
+            return [node.key]
+        return []
 
     def _is_prefix_of_longer_match(self, prefix):
         """
@@ -178,11 +246,12 @@ class InputStream(object):
         """
         # (hard coded) If this could be a prefix of a CPR response, return
         # True.
-        if _cpr_response_prefix_re.match(prefix):
+        if prefix.startswith('\x1b[') and _cpr_response_prefix_re.match(prefix):
             return True
 
         # If this could be a prefix of anything else, also return True.
-        return any(v for k, v in self.mappings.items() if k.startswith(prefix) and k != prefix)
+        node = self._find_node(prefix)
+        return node is not None and bool(node.children)
 
     def _input_parser_generator(self):
         """
@@ -241,9 +310,36 @@ class InputStream(object):
         if isinstance(key, tuple):
             for k in key:
                 self._call_handler(k, insert_text)
+        elif key == Keys.BracketedPaste:
+            # Collect the pasted text, instead of parsing it.
+            self._in_bracketed_paste = True
         else:
             self._input_processor.feed_key(KeyPress(key, insert_text))
 
+    def _feed_bracketed_paste(self, data):
+        """
+        Collect pasted text until the end of the bracketed paste is received,
+        then send all of it as one `Keys.BracketedPaste` key press.
+        """
+        # Only look for the end in the new data. (Plus the last characters we
+        # received before, in case the end marker was split.)
+        tail = self._paste_tail + data
+        self._paste_chunks.append(data)
+        self._paste_tail = tail[-len(_bracketed_paste_end):]
+
+        if _bracketed_paste_end in tail:
+            text = ''.join(self._paste_chunks)
+            end = text.index(_bracketed_paste_end, len(text) - len(tail))
+
+            self._in_bracketed_paste = False
+            self._paste_chunks = []
+            self._paste_tail = ''
+
+            self._input_processor.feed_key(KeyPress(Keys.BracketedPaste, text[:end]))
+
+            # Parse what follows.
+            self.feed(text[end + len(_bracketed_paste_end):])
+
     def feed(self, data):
         """
         Feed the input stream.
@@ -254,8 +350,16 @@ class InputStream(object):
             self.LOG.write(repr(data).encode('utf-8') + b'\n')
             self.LOG.flush()
 
-        for c in data:
-            self._input_parser.send(c)
+        if self._in_bracketed_paste:
+            self._feed_bracketed_paste(data)
+        else:
+            for i, c in enumerate(data):
+                self._input_parser.send(c)
+
+                # The start of a bracketed paste was received.
+                if self._in_bracketed_paste:
+                    self._feed_bracketed_paste(data[i + 1:])
+                    break
 
     def flush(self):
         """
@@ -278,7 +382,14 @@ class raw_mode(object):
 
         with raw_mode(stdin):
             ''' the pseudo-terminal stdin is now used in raw mode '''
+
+    This also enables bracketed paste mode, so that the terminal sends pasted
+    text between '\x1b[200~' and '\x1b[201~'.
     """
+    #: Escape sequences to send when entering and leaving this mode.
+    _enter_sequence = b'\x1b[?2004h'  # Enable bracketed paste.
+    _exit_sequence = b'\x1b[?2004l'  # Disable bracketed paste.
+
     def __init__(self, fileno):
         self.fileno = fileno
         self.attrs_before = termios.tcgetattr(fileno)
@@ -290,13 +401,14 @@ class raw_mode(object):
         termios.tcsetattr(self.fileno, termios.TCSANOW, newattr)
 
         # Put the terminal in cursor mode. (Instead of application mode.)
-        os.write(self.fileno, b'\x1b[?1l')
+        os.write(self.fileno, b'\x1b[?1l' + self._enter_sequence)
 
     def _patch(self, attrs):
         return attrs & ~(termios.ECHO | termios.ICANON | termios.IEXTEN | termios.ISIG)
 
     def __exit__(self, *a, **kw):
         termios.tcsetattr(self.fileno, termios.TCSANOW, self.attrs_before)
+        os.write(self.fileno, self._exit_sequence)
 
         # # Put the terminal in application mode.
         # self._stdout.write('\x1b[?1h')
@@ -308,6 +420,11 @@ class cooked_mode(raw_mode):
 
         with cooked_mode(stdin):
             ''' the pseudo-terminal stdin is now used in cooked mode. '''
+
+    (Bracketed paste is disabled, and enabled again when leaving.)
     """
+    _enter_sequence = b'\x1b[?2004l'
+    _exit_sequence = b'\x1b[?2004h'
+
     def _patch(self, attrs):
         return attrs | (termios.ECHO | termios.ICANON | termios.IEXTEN | termios.ISIG)
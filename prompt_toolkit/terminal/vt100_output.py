@@ -1,15 +1,17 @@
 from __future__ import unicode_literals
-from pygments.formatters.terminal256 import Terminal256Formatter, EscapeSequence
 
 import array
 import fcntl
+import os
+import select
 import six
 import termios
 import errno
 
 
-# Global variable to keep the colour table in memory.
-_tf = Terminal256Formatter()
+# Global variable to keep the colour table in memory. (Created on first use,
+# importing `pygments.formatters` is slow.)
+_tf = None
 
 #: If True: write the output of the renderer also to the following file. This
 #: is very useful for debugging. (e.g.: to see that we don't write more bytes
@@ -18,6 +20,34 @@ _DEBUG_RENDER_OUTPUT = False
 _DEBUG_RENDER_OUTPUT_FILENAME = '/tmp/prompt-toolkit-render-output'
 
 
+class _EscapeCodeCache(dict):
+    """
+    Cache for VT100 escape codes. It maps
+    (fgcolor, bgcolor, bold, underline) tuples to VT100 escape sequences.
+    (These include resetting the previous attributes.)
+    """
+    def __missing__(self, attrs):
+        global _tf
+        from pygments.formatters.terminal256 import Terminal256Formatter, EscapeSequence
+
+        if _tf is None:
+            _tf = Terminal256Formatter()
+
+        fgcolor, bgcolor, bold, underline = attrs
+
+        fg = _tf._color_index(fgcolor) if fgcolor else None
+        bg = _tf._color_index(bgcolor) if bgcolor else None
+
+        e = EscapeSequence(fg=fg, bg=bg, bold=bold, underline=underline)
+
+        result = '\x1b[0m' + e.color_string()
+        self[attrs] = result
+        return result
+
+
+_ESCAPE_CODE_CACHE = _EscapeCodeCache()
+
+
 def _get_size(fileno):
     # Thanks to fabric (fabfile.org), and
     # http://sqizit.bartletts.id.au/2011/02/14/pseudo-terminals-in-python/
@@ -39,10 +69,29 @@ def _get_size(fileno):
     return buf[0], buf[1]
 
 
+#: Begin and end of a synchronized update (DEC private mode 2026). The
+#: terminal doesn't repaint while it receives the output in between.
+#: (Terminals that don't know this mode ignore it.)
+_BEGIN_SYNCHRONIZED_UPDATE = '\x1b[?2026h'
+_END_SYNCHRONIZED_UPDATE = '\x1b[?2026l'
+
+
 class Vt100_Output(object):
-    def __init__(self, stdout):
+    """
+    :param stdout: The output file object.
+    :param use_os_write: When True, `flush` encodes the output once and
+        writes it with `os.write` to the file descriptor of `stdout`, usually
+        in one system call. (This also works for non blocking file
+        descriptors.)
+    :param synchronized_output: When True, the output of every `flush` is
+        wrapped in a synchronized update, so that the terminal draws it at
+        once.
+    """
+    def __init__(self, stdout, use_os_write=False, synchronized_output=False):
         self._buffer = []
         self.stdout = stdout
+        self.use_os_write = use_os_write
+        self.synchronized_output = synchronized_output
 
     def get_size(self):
         from ..renderer import Size
@@ -85,13 +134,7 @@ class Vt100_Output(object):
         """
         Create new style and output.
         """
-        fg = _tf._color_index(fgcolor) if fgcolor else None
-        bg = _tf._color_index(bgcolor) if bgcolor else None
-
-        e = EscapeSequence(fg=fg, bg=bg, bold=bold, underline=underline)
-
-        self.reset_attributes()
-        self.write(e.color_string())
+        self.write(_ESCAPE_CODE_CACHE[fgcolor, bgcolor, bold, underline])
 
     def disable_autowrap(self):
         self.write('\x1b[?7l')
@@ -137,18 +180,64 @@ class Vt100_Output(object):
         else:
             self.write('\x1b[%iD' % amount)
 
+    def insert_characters(self, amount):
+        """
+        Insert empty cells at the cursor position. (The following cells move
+        to the right.)
+        """
+        if amount == 1:
+            self.write('\x1b[@')
+        else:
+            self.write('\x1b[%i@' % amount)
+
+    def delete_characters(self, amount):
+        """
+        Delete cells at the cursor position. (The following cells move to the
+        left.)
+        """
+        if amount == 1:
+            self.write('\x1b[P')
+        else:
+            self.write('\x1b[%iP' % amount)
+
+    def insert_lines(self, amount):
+        """
+        Insert empty lines at the cursor position. (The following lines move
+        down.)
+        """
+        if amount == 1:
+            self.write('\x1b[L')
+        else:
+            self.write('\x1b[%iL' % amount)
+
+    def delete_lines(self, amount):
+        """
+        Delete lines at the cursor position. (The following lines move up.)
+        """
+        if amount == 1:
+            self.write('\x1b[M')
+        else:
+            self.write('\x1b[%iM' % amount)
+
     def flush(self):
         """
-        Write to output stream and flush.
+        Write to output stream and flush. Returns the number of characters
+        that were written.
         """
         if not self._buffer:
-            return
+            return 0
 
         data = ''.join(self._buffer)
 
+        if self.synchronized_output:
+            data = _BEGIN_SYNCHRONIZED_UPDATE + data + _END_SYNCHRONIZED_UPDATE
+
         try:
-            self.stdout.write(data)
-            self.stdout.flush()
+            if self.use_os_write:
+                self._write_to_fd(data)
+            else:
+                self.stdout.write(data)
+                self.stdout.flush()
         except IOError as e:
             if e.args and e.args[0] == errno.EINTR:
                 # Interrupted system call. Can happpen in case of a window
@@ -159,3 +248,30 @@ class Vt100_Output(object):
                 raise
 
         self._buffer = []
+        return len(data)
+
+    def _write_to_fd(self, data):
+        """
+        Encode the data and write it to the file descriptor of `stdout`.
+        Continue after partial writes, and wait until a non blocking file
+        descriptor is writable again when it returns EAGAIN.
+        """
+        # Output that was written through the file object goes first.
+        self.stdout.flush()
+
+        data = data.encode(getattr(self.stdout, 'encoding', None) or 'utf-8',
+                           getattr(self.stdout, 'errors', None) or 'strict')
+        fd = self.stdout.fileno()
+
+        while data:
+            try:
+                written = os.write(fd, data)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    select.select([], [fd], [])
+                    continue
+                elif e.errno == errno.EINTR:
+                    continue
+                raise
+
+            data = data[written:]
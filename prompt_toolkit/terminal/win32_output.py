@@ -184,10 +184,11 @@ class Win32Output(object):
 
     def flush(self):
         """
-        Write to output stream and flush.
+        Write to output stream and flush. Returns the number of characters
+        that were written.
         """
         if not self._buffer:
-            return
+            return 0
 
         data = ''.join(self._buffer)
 
@@ -200,6 +201,7 @@ class Win32Output(object):
         sys.stdout.flush()
 
         self._buffer = []
+        return len(data)
 
     def get_rows_below_cursor_position(self):
         info = self._screen_buffer_info()
@@ -3,6 +3,8 @@ from __future__ import unicode_literals
 __all__ = (
     'EventHook',
     'DummyContext',
+    'common_prefix_length',
+    'common_suffix_length',
 )
 
 
@@ -42,3 +44,37 @@ class DummyContext(object):
 
     def __exit__(self, *a):
         pass
+
+
+def common_prefix_length(a, b):
+    """
+    Return the length of the common prefix of the sequences `a` and `b`.
+    (Binary search over slices, so that the items are compared in C.)
+    """
+    low, high = 0, min(len(a), len(b))
+
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+
+    return low
+
+
+def common_suffix_length(a, b):
+    """
+    Return the length of the common suffix of the sequences `a` and `b`.
+    """
+    len_a, len_b = len(a), len(b)
+    low, high = 0, min(len_a, len_b)
+
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len_a - middle:len_a - low] == b[len_b - middle:len_b - low]:
+            low = middle
+        else:
+            high = middle - 1
+
+    return low
@@ -0,0 +1,128 @@
+"""
+Width of characters and strings in terminal cells.
+
+The widths come from a precomputed table, that covers all of Unicode (see
+`width_table`, generated by `tools/generate_width_table.py`). It's only
+loaded on first use.
+"""
+from __future__ import unicode_literals
+
+import re
+import sys
+import zlib
+
+from array import array
+
+import six
+
+__all__ = (
+    'get_cwidth',
+    'get_width',
+)
+
+#: Strings of printable ASCII characters have a width of one per character.
+_PRINTABLE_ASCII_RE = re.compile(r'[ -~]*\Z')
+
+# Filled in by `_load`.
+_page_bits = None
+_page_mask = None
+_page_index = None
+_pages = None
+_wide_re = None
+_zero_width_re = None
+_astral_re = None
+_astral_wide_re = None
+_astral_zero_width_re = None
+
+_MAX_BMP = 0xffff
+
+
+def _load():
+    """
+    Load the width table.
+    """
+    global _page_bits, _page_mask, _page_index, _pages
+    global _wide_re, _zero_width_re, _astral_re, _astral_wide_re, _astral_zero_width_re
+    from . import width_table
+
+    _page_bits = width_table.PAGE_BITS
+    _page_mask = (1 << _page_bits) - 1
+    _page_index = array(str('B'), zlib.decompress(width_table.PAGE_INDEX))
+    _pages = array(str('b'), zlib.decompress(width_table.PAGES))
+
+    # The characters of the BMP and the others are counted with different
+    # regular expressions. A character class with only BMP characters is
+    # compiled to a bitmap, while other classes are a list of ranges, that is
+    # searched one by one.
+    def bmp(ranges):
+        return [(first, min(last, _MAX_BMP)) for first, last in ranges if first <= _MAX_BMP]
+
+    def astral(ranges):
+        return [(max(first, _MAX_BMP + 1), last) for first, last in ranges if last > _MAX_BMP]
+
+    _wide_re = _ranges_to_regex(bmp(width_table.WIDE_RANGES))
+    _zero_width_re = _ranges_to_regex(bmp(width_table.ZERO_WIDTH_RANGES))
+
+    # On narrow builds (Python 2), characters outside the BMP are surrogate
+    # pairs. Those can't be in a character class.
+    if sys.maxunicode > _MAX_BMP:
+        _astral_re = _ranges_to_regex([(_MAX_BMP + 1, sys.maxunicode)])
+        _astral_wide_re = _ranges_to_regex(astral(width_table.WIDE_RANGES))
+        _astral_zero_width_re = _ranges_to_regex(astral(width_table.ZERO_WIDTH_RANGES))
+
+
+def _ranges_to_regex(ranges):
+    """
+    Create a regex that matches a sequence of characters of the given
+    (first, last) code point ranges.
+    """
+    def char(code):
+        c = six.unichr(code)
+        return '\\' + c if c in '\\]^-' else c
+
+    return re.compile('[%s]+' % ''.join('%s-%s' % (char(first), char(last)) for first, last in ranges))
+
+
+def _count(regex, text):
+    """
+    Return the number of characters in `text` that are matched by `regex`.
+    """
+    return sum(map(len, regex.findall(text)))
+
+
+def get_cwidth(char):
+    """
+    Return the width of a character, like ``wcwidth``: 2 for wide characters,
+    0 for zero width (like combining) characters and -1 for control
+    characters. Otherwise 1.
+    """
+    if _pages is None:
+        _load()
+
+    code = ord(char)
+    return _pages[_page_index[code >> _page_bits] << _page_bits | code & _page_mask]
+
+
+def get_width(text):
+    """
+    Return the width of a string. Zero width and control characters don't
+    take any space.
+
+    This doesn't loop over the characters in Python: wide and zero width
+    characters are counted with regular expressions.
+    """
+    if _PRINTABLE_ASCII_RE.match(text):
+        return len(text)
+
+    if _pages is None:
+        _load()
+
+    width = len(text) + _count(_wide_re, text) - _count(_zero_width_re, text)
+
+    if _astral_re is not None:
+        astral = ''.join(_astral_re.findall(text))
+
+        if astral:
+            width += _count(_astral_wide_re, astral) - _count(_astral_zero_width_re, astral)
+
+    return width
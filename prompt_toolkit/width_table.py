@@ -0,0 +1,532 @@
+# Generated by tools/generate_width_table.py from wcwidth 0.2.14. Do not edit.
+"""
+Width of all Unicode code points. (See `prompt_toolkit.width`.)
+"""
+
+#: Number of bits of the code point that index into a page.
+PAGE_BITS = 8
+
+#: For every page of code points, the number of that page in `PAGES`.
+#: (One byte per page, zlib compressed.)
+PAGE_INDEX = (
+    b'\x78\xda\x63\x60\x64\x64\x62\x66\x61\x65\x63\xe7\xe0\xe4\xe2\xe6\xe1\xe5\xe3\x17\x60\x14\x64\x64\x64\x14\x12\x16\x11\x15\x13\x97'
+    b'\x60\x64\x94\x64\x64\x94\x62\x94\x96\x91\x05\x8a\xc9\xc9\x2b\x28\x2a\x29\xab\xa8\xaa\xd1\x1b\xa8\x33\x6a\x30\x6a\x6a\x69\xeb\x90'
+    b'\xa0\x45\x97\x91\x10\x50\x53\xd3\x63\x64\xd4\x37\x60\x34\x34\x32\x86\x08\x98\x30\x32\x9a\x9a\x99\x5b\x58\x5a\x59\xdb\xd8\xda\xd9'
+    b'\x3b\x38\x3a\x39\xbb\xb8\xba\xb9\x63\xd3\xea\xc1\x48\x02\xf0\x84\x31\xbc\xbc\x81\x84\x0f\x3e\x47\xfb\xfa\x11\x34\xcd\x5f\x2d\x20'
+    b'\x10\xce\x09\xc2\x94\x0f\x66\x0c\x09\x0d\x83\x30\xc3\xc1\x64\x84\x77\x24\x63\x54\x74\x0c\x63\x6c\x1c\x44\x34\x3e\x21\x31\x29\x39'
+    b'\x25\x35\x8d\x31\x3d\x03\x1a\x0c\x23\x1a\x64\x8e\x74\xff\x33\x8e\x82\x51\x30\x0a\x46\xc1\x28\x18\x05\xa3\x60\x14\x8c\x82\x11\x05'
+    b'\xb2\xb2\x47\xc3\x60\x14\x8c\x5c\x00\x00\x1e\xfc\x8c\x71'
+)
+
+#: The distinct pages. One signed byte, the width, per code point.
+#: (zlib compressed.)
+PAGES = (
+    b'\x78\xda\xed\x5d\x09\x76\x03\x21\x08\x45\xef\x7f\xe7\x34\x4d\x66\x8b\xa2\x23\xb2\xb8\x8c\xb6\xef\x35\x6d\x8c\xc8\x22\x7c\x19\xb4'
+    b'\xf0\xca\x37\xa7\xdb\x5e\xaf\xb6\xf4\x1f\xdf\xc0\xb8\x2d\x89\xa7\x54\xb0\x04\x41\x37\x48\xf7\xfe\xfa\x7e\xf3\xc8\xa1\xe4\xa9\x83'
+    b'\x16\xd9\x3b\x98\x0a\xf1\x60\x6f\x7b\x79\xff\xc1\xbb\x09\xb6\x59\xda\x22\x54\xe2\x21\x20\xd7\xf5\xd2\xff\xf8\x8d\x46\xad\x6e\x92'
+    b'\x89\xb9\x2a\x7a\xf2\x6a\x71\x3a\x6c\x45\xc6\x2b\x4a\x43\x4e\x9b\xb1\x5e\xec\xdb\x25\x34\x9b\x1b\x1f\x24\xe8\xef\x44\xbe\x2f\xa1'
+    b'\x40\xbf\x20\xcc\xff\x61\xa1\x19\x8b\x4a\x79\x3e\x0d\xf9\x53\xf4\xcf\xf2\x88\xbb\xfc\x21\xf4\x6f\x40\x1d\x81\xc7\x7f\x40\x1f\xc0'
+    b'\xd9\xda\x3f\x89\x3e\x44\x9e\xae\x56\xf8\x29\xfa\xc5\xeb\x8f\xc7\x3f\xc2\xd6\x05\x16\xa4\x7c\x1b\x93\x1e\xa0\x80\xcd\x0e\xde\x02'
+    b'\x1e\x1c\xa4\xe9\x67\x87\x82\x1d\x27\x54\x10\xc4\x61\x1c\xc4\xe0\x8b\x12\xb8\x4c\x50\x15\x21\x74\x9e\x61\x61\x73\xb0\x67\xf7\xe8'
+    b'\x53\x90\x80\x9c\x36\xe6\xe4\x95\x1b\x74\xde\xb4\x2d\x66\xcc\x0d\x18\x87\x29\x00\xc7\x7a\x9f\x8f\x74\x2b\xdd\x42\xbb\x5d\x78\x09'
+    b'\x59\x68\x67\x0d\x57\xb9\x3e\x24\x97\xc3\xe3\xaf\x34\x8c\x55\x68\x95\xea\xdd\xee\xf4\x55\xc3\x68\xa5\x13\x45\xbb\x03\x50\x12\x0e'
+    b'\x32\x1e\x43\x31\xf0\xf7\x60\xb8\xe9\x44\x14\x48\xec\x7a\x07\x4e\x17\xe6\xf5\x98\xd5\x6b\xad\xda\x43\x2f\xd0\x5c\x1e\x04\x64\x98'
+    b'\xfb\x75\xb8\xf6\x0f\x46\xff\x7f\x7c\xbe\x57\xcb\xe9\x34\xa7\xea\x1d\xd7\xe7\xf6\x11\x94\x19\x84\x23\xb8\x50\x3f\x3e\x33\xab\xed'
+    b'\x4f\xe7\x3b\x3e\x1c\x14\x19\xe8\xdd\xdb\xbb\x5f\x4b\xf0\xf7\x06\xee\x8b\x98\xd9\x06\xf2\x4c\x1b\xcb\xc8\xd0\xd3\xa7\x25\x6c\x1d'
+    b'\x05\x0a\x5d\x2b\xac\x67\x78\xd0\xd5\x7c\x5a\xc7\xc3\x1e\xc2\x12\xde\xf4\x52\x33\x96\xf9\x9f\x36\x4d\x23\xdf\xf5\xb5\x97\x88\x90'
+    b'\x16\x03\x11\x29\x45\x49\x51\xfa\x2b\x4f\x47\xd9\x1e\xd4\xe6\x33\xf7\x7a\x5a\xcd\x6a\x31\x8a\x3b\xbc\x0e\x93\xcb\xe5\xd1\x57\x3e'
+    b'\x3e\xe3\x15\x39\x90\xc3\x22\x61\xfa\xc4\x3c\xf5\x7b\x8f\x69\xaa\xfb\x12\x53\x77\xf4\x2c\xdd\x9d\xd5\xb2\xd3\x8f\x56\x28\x33\x4d'
+    b'\x15\x2a\x75\x59\x85\x3e\x8f\xe7\x89\x3b\x45\xa0\x71\xa0\xb4\xac\x46\x48\x11\xa2\x6c\x8f\x86\x66\x6d\x9f\x7f\xc2\x63\x8c\x63\x6f'
+    b'\xa1\xd4\xd3\xef\x93\x30\xa3\xeb\x34\x48\x83\xb3\x34\xde\x76\xfb\xeb\xfe\x33\x21\x53\x66\x5f\x16\x8b\x77\xa1\xb8\x8b\x8c\xe0\xa5'
+    b'\xfc\x8a\x08\x5e\xc6\xb0\x20\x6e\xc9\x9f\x84\xb2\xd6\x19\x8f\xc6\x5a\xc4\x23\xbf\x38\x8a\x68\x63\x5d\xe6\x0f\x04\x6a\xd3\xe8\xf0'
+    b'\xab\x47\x32\xf3\x71\xf5\x0c\xb0\x9c\x7d\xe9\x0e\x32\x7f\xa8\x87\x44\x18\x98\xf2\xc7\xe7\x92\xdc\xe1\xe8\x60\xe5\x53\x9b\xc3\xc0'
+    b'\x7b\xe9\xd5\x07\xe5\xe7\x4f\x7e\xcb\x7f\x45\xd3\x11\x5f\x1d\x9c\x79\xb5\x50\x21\x1a\x26\x51\x5e\x07\x6d\x40\xfa\x51\x51\x35\xae'
+    b'\xeb\xb3\x0b\x98\xb8\xfc\x1b\x6d\xd5\x5b\x24\x07\x16\x00\x5b\xe2\xb8\xa4\x12\xcf\x03\xc8\x3d\x7b\x88\x3b\x2f\x4c\xd7\xe7\xb5\xb4'
+    b'\x39\x76\xf4\xd5\x06\x32\xa7\x57\x9f\x6c\xb1\x44\x75\xed\x16\xe0\x02\x29\xa4\x6f\xee\x00\xdc\x7e\xf5\x40\xd5\x55\x01\xe9\x04\x41'
+    b'\xc5\x49\xf3\xd5\x18\x1b\xee\x1a\xdd\x95\xa1\x79\x98\x56\x78\xc8\x4a\x9c\x14\x1a\xac\xfb\x6b\xa6\xb4\x5f\x09\x78\xb5\x1a\xee\xf4'
+    b'\x78\xcf\xa1\xc5\x65\xfb\xa9\xdc\xfc\xd1\x1f\xaf\x20\x70\xf4\xfa\x57\x44\x3c\x4d\x9f\xde\xf6\x2c\x9c\x19\xdb\xb5\x40\xc1\x95\xd5'
+    b'\xb7\x86\x23\xdc\x8d\x1f\x1f\x52\x59\xf5\xb1\x63\x7b\x89\x76\xc1\x5a\xfd\xe9\x18\xe7\x3c\xf5\x82\x85\x44\xd0\x75\x23\x54\xc2\xb6'
+    b'\xad\x2f\xe6\x06\x8f\x07\x0d\x0e\x5c\x74\xbc\xc3\x2b\x86\xab\xf5\xc5\x96\x50\x94\x29\x40\x2f\x90\xd0\x4a\x17\x67\x56\xa5\x65\x4a'
+    b'\x6a\x39\x52\x45\xf1\x3c\x3d\x50\xad\x40\xfd\x48\xfe\x2f\x45\x2a\x7b\xa1\xe3\xe4\x50\xcb\x58\xcd\xa3\x63\xe0\x89\x32\x02\x7e\xf8'
+    b'\xe9\x1b\x63\x44\x1f\x5d\x73\x43\x03\xb9\xe1\x6c\xbd\xc7\xf0\xf5\xc0\xf8\x1f\xed\x2c\xb4\x6d\x70\xa2\xf7\x13\x1c\xdd\xb3\x9f\xdf'
+    b'\x16\xc9\x7e\xa0\x9f\xcd\x81\x1b\x3a\x01\x24\x99\x41\xca\x1a\x06\xc9\x55\x79\x6f\xe1\xd4\xba\xc8\xa9\x49\x52\xf5\x47\xfe\xf5\x3c'
+    b'\x4b\x8e\x49\xf5\x49\x99\xf0\xc8\x41\xc8\xe9\xc2\x99\xdd\x8a\x31\x51\x0e\x38\x73\xdf\x01\x67\x35\x38\x8f\x29\x10\x51\x7f\x1c\xaf'
+    b'\x1f\xfe\x04\xa0\xfe\xff\x7d\x4c\xf1\xff\x80\xe0\x61\x2d\xe4\xff\x0f\x59\x1a\xb1\x46'
+)
+
+#: (first, last) code point ranges of wide characters.
+WIDE_RANGES = (
+    (0x1100, 0x115f),
+    (0x231a, 0x231b),
+    (0x2329, 0x232a),
+    (0x23e9, 0x23ec),
+    (0x23f0, 0x23f0),
+    (0x23f3, 0x23f3),
+    (0x25fd, 0x25fe),
+    (0x2614, 0x2615),
+    (0x2630, 0x2637),
+    (0x2648, 0x2653),
+    (0x267f, 0x267f),
+    (0x268a, 0x268f),
+    (0x2693, 0x2693),
+    (0x26a1, 0x26a1),
+    (0x26aa, 0x26ab),
+    (0x26bd, 0x26be),
+    (0x26c4, 0x26c5),
+    (0x26ce, 0x26ce),
+    (0x26d4, 0x26d4),
+    (0x26ea, 0x26ea),
+    (0x26f2, 0x26f3),
+    (0x26f5, 0x26f5),
+    (0x26fa, 0x26fa),
+    (0x26fd, 0x26fd),
+    (0x2705, 0x2705),
+    (0x270a, 0x270b),
+    (0x2728, 0x2728),
+    (0x274c, 0x274c),
+    (0x274e, 0x274e),
+    (0x2753, 0x2755),
+    (0x2757, 0x2757),
+    (0x2795, 0x2797),
+    (0x27b0, 0x27b0),
+    (0x27bf, 0x27bf),
+    (0x2b1b, 0x2b1c),
+    (0x2b50, 0x2b50),
+    (0x2b55, 0x2b55),
+    (0x2e80, 0x2e99),
+    (0x2e9b, 0x2ef3),
+    (0x2f00, 0x2fd5),
+    (0x2ff0, 0x3029),
+    (0x3030, 0x303e),
+    (0x3041, 0x3096),
+    (0x309b, 0x30ff),
+    (0x3105, 0x312f),
+    (0x3131, 0x318e),
+    (0x3190, 0x31e5),
+    (0x31ef, 0x321e),
+    (0x3220, 0x3247),
+    (0x3250, 0xa48c),
+    (0xa490, 0xa4c6),
+    (0xa960, 0xa97c),
+    (0xac00, 0xd7a3),
+    (0xf900, 0xfaff),
+    (0xfe10, 0xfe19),
+    (0xfe30, 0xfe52),
+    (0xfe54, 0xfe66),
+    (0xfe68, 0xfe6b),
+    (0xff01, 0xff60),
+    (0xffe0, 0xffe6),
+    (0x16fe0, 0x16fe3),
+    (0x16ff2, 0x16ff6),
+    (0x17000, 0x18cd5),
+    (0x18cff, 0x18d1e),
+    (0x18d80, 0x18df2),
+    (0x1aff0, 0x1aff3),
+    (0x1aff5, 0x1affb),
+    (0x1affd, 0x1affe),
+    (0x1b000, 0x1b122),
+    (0x1b132, 0x1b132),
+    (0x1b150, 0x1b152),
+    (0x1b155, 0x1b155),
+    (0x1b164, 0x1b167),
+    (0x1b170, 0x1b2fb),
+    (0x1d300, 0x1d356),
+    (0x1d360, 0x1d376),
+    (0x1f004, 0x1f004),
+    (0x1f0cf, 0x1f0cf),
+    (0x1f18e, 0x1f18e),
+    (0x1f191, 0x1f19a),
+    (0x1f200, 0x1f202),
+    (0x1f210, 0x1f23b),
+    (0x1f240, 0x1f248),
+    (0x1f250, 0x1f251),
+    (0x1f260, 0x1f265),
+    (0x1f300, 0x1f320),
+    (0x1f32d, 0x1f335),
+    (0x1f337, 0x1f37c),
+    (0x1f37e, 0x1f393),
+    (0x1f3a0, 0x1f3ca),
+    (0x1f3cf, 0x1f3d3),
+    (0x1f3e0, 0x1f3f0),
+    (0x1f3f4, 0x1f3f4),
+    (0x1f3f8, 0x1f3fa),
+    (0x1f400, 0x1f43e),
+    (0x1f440, 0x1f440),
+    (0x1f442, 0x1f4fc),
+    (0x1f4ff, 0x1f53d),
+    (0x1f54b, 0x1f54e),
+    (0x1f550, 0x1f567),
+    (0x1f57a, 0x1f57a),
+    (0x1f595, 0x1f596),
+    (0x1f5a4, 0x1f5a4),
+    (0x1f5fb, 0x1f64f),
+    (0x1f680, 0x1f6c5),
+    (0x1f6cc, 0x1f6cc),
+    (0x1f6d0, 0x1f6d2),
+    (0x1f6d5, 0x1f6d8),
+    (0x1f6dc, 0x1f6df),
+    (0x1f6eb, 0x1f6ec),
+    (0x1f6f4, 0x1f6fc),
+    (0x1f7e0, 0x1f7eb),
+    (0x1f7f0, 0x1f7f0),
+    (0x1f90c, 0x1f93a),
+    (0x1f93c, 0x1f945),
+    (0x1f947, 0x1f9ff),
+    (0x1fa70, 0x1fa7c),
+    (0x1fa80, 0x1fa8a),
+    (0x1fa8e, 0x1fac6),
+    (0x1fac8, 0x1fac8),
+    (0x1facd, 0x1fadc),
+    (0x1fadf, 0x1faea),
+    (0x1faef, 0x1faf8),
+    (0x20000, 0x2fffd),
+    (0x30000, 0x3fffd),
+)
+
+#: (first, last) code point ranges of zero width and control characters.
+ZERO_WIDTH_RANGES = (
+    (0x0000, 0x001f),
+    (0x007f, 0x009f),
+    (0x0300, 0x036f),
+    (0x0483, 0x0489),
+    (0x0591, 0x05bd),
+    (0x05bf, 0x05bf),
+    (0x05c1, 0x05c2),
+    (0x05c4, 0x05c5),
+    (0x05c7, 0x05c7),
+    (0x0600, 0x0605),
+    (0x0610, 0x061a),
+    (0x061c, 0x061c),
+    (0x064b, 0x065f),
+    (0x0670, 0x0670),
+    (0x06d6, 0x06dd),
+    (0x06df, 0x06e4),
+    (0x06e7, 0x06e8),
+    (0x06ea, 0x06ed),
+    (0x070f, 0x070f),
+    (0x0711, 0x0711),
+    (0x0730, 0x074a),
+    (0x07a6, 0x07b0),
+    (0x07eb, 0x07f3),
+    (0x07fd, 0x07fd),
+    (0x0816, 0x0819),
+    (0x081b, 0x0823),
+    (0x0825, 0x0827),
+    (0x0829, 0x082d),
+    (0x0859, 0x085b),
+    (0x0890, 0x0891),
+    (0x0897, 0x089f),
+    (0x08ca, 0x0903),
+    (0x093a, 0x093c),
+    (0x093e, 0x094f),
+    (0x0951, 0x0957),
+    (0x0962, 0x0963),
+    (0x0981, 0x0983),
+    (0x09bc, 0x09bc),
+    (0x09be, 0x09c4),
+    (0x09c7, 0x09c8),
+    (0x09cb, 0x09cd),
+    (0x09d7, 0x09d7),
+    (0x09e2, 0x09e3),
+    (0x09fe, 0x09fe),
+    (0x0a01, 0x0a03),
+    (0x0a3c, 0x0a3c),
+    (0x0a3e, 0x0a42),
+    (0x0a47, 0x0a48),
+    (0x0a4b, 0x0a4d),
+    (0x0a51, 0x0a51),
+    (0x0a70, 0x0a71),
+    (0x0a75, 0x0a75),
+    (0x0a81, 0x0a83),
+    (0x0abc, 0x0abc),
+    (0x0abe, 0x0ac5),
+    (0x0ac7, 0x0ac9),
+    (0x0acb, 0x0acd),
+    (0x0ae2, 0x0ae3),
+    (0x0afa, 0x0aff),
+    (0x0b01, 0x0b03),
+    (0x0b3c, 0x0b3c),
+    (0x0b3e, 0x0b44),
+    (0x0b47, 0x0b48),
+    (0x0b4b, 0x0b4d),
+    (0x0b55, 0x0b57),
+    (0x0b62, 0x0b63),
+    (0x0b82, 0x0b82),
+    (0x0bbe, 0x0bc2),
+    (0x0bc6, 0x0bc8),
+    (0x0bca, 0x0bcd),
+    (0x0bd7, 0x0bd7),
+    (0x0c00, 0x0c04),
+    (0x0c3c, 0x0c3c),
+    (0x0c3e, 0x0c44),
+    (0x0c46, 0x0c48),
+    (0x0c4a, 0x0c4d),
+    (0x0c55, 0x0c56),
+    (0x0c62, 0x0c63),
+    (0x0c81, 0x0c83),
+    (0x0cbc, 0x0cbc),
+    (0x0cbe, 0x0cc4),
+    (0x0cc6, 0x0cc8),
+    (0x0cca, 0x0ccd),
+    (0x0cd5, 0x0cd6),
+    (0x0ce2, 0x0ce3),
+    (0x0cf3, 0x0cf3),
+    (0x0d00, 0x0d03),
+    (0x0d3b, 0x0d3c),
+    (0x0d3e, 0x0d44),
+    (0x0d46, 0x0d48),
+    (0x0d4a, 0x0d4d),
+    (0x0d57, 0x0d57),
+    (0x0d62, 0x0d63),
+    (0x0d81, 0x0d83),
+    (0x0dca, 0x0dca),
+    (0x0dcf, 0x0dd4),
+    (0x0dd6, 0x0dd6),
+    (0x0dd8, 0x0ddf),
+    (0x0df2, 0x0df3),
+    (0x0e31, 0x0e31),
+    (0x0e34, 0x0e3a),
+    (0x0e47, 0x0e4e),
+    (0x0eb1, 0x0eb1),
+    (0x0eb4, 0x0ebc),
+    (0x0ec8, 0x0ece),
+    (0x0f18, 0x0f19),
+    (0x0f35, 0x0f35),
+    (0x0f37, 0x0f37),
+    (0x0f39, 0x0f39),
+    (0x0f3e, 0x0f3f),
+    (0x0f71, 0x0f84),
+    (0x0f86, 0x0f87),
+    (0x0f8d, 0x0f97),
+    (0x0f99, 0x0fbc),
+    (0x0fc6, 0x0fc6),
+    (0x102b, 0x103e),
+    (0x1056, 0x1059),
+    (0x105e, 0x1060),
+    (0x1062, 0x1064),
+    (0x1067, 0x106d),
+    (0x1071, 0x1074),
+    (0x1082, 0x108d),
+    (0x108f, 0x108f),
+    (0x109a, 0x109d),
+    (0x1160, 0x11ff),
+    (0x135d, 0x135f),
+    (0x1712, 0x1715),
+    (0x1732, 0x1734),
+    (0x1752, 0x1753),
+    (0x1772, 0x1773),
+    (0x17b4, 0x17d3),
+    (0x17dd, 0x17dd),
+    (0x180b, 0x180f),
+    (0x1885, 0x1886),
+    (0x18a9, 0x18a9),
+    (0x1920, 0x192b),
+    (0x1930, 0x193b),
+    (0x1a17, 0x1a1b),
+    (0x1a55, 0x1a5e),
+    (0x1a60, 0x1a7c),
+    (0x1a7f, 0x1a7f),
+    (0x1ab0, 0x1add),
+    (0x1ae0, 0x1aeb),
+    (0x1b00, 0x1b04),
+    (0x1b34, 0x1b44),
+    (0x1b6b, 0x1b73),
+    (0x1b80, 0x1b82),
+    (0x1ba1, 0x1bad),
+    (0x1be6, 0x1bf3),
+    (0x1c24, 0x1c37),
+    (0x1cd0, 0x1cd2),
+    (0x1cd4, 0x1ce8),
+    (0x1ced, 0x1ced),
+    (0x1cf4, 0x1cf4),
+    (0x1cf7, 0x1cf9),
+    (0x1dc0, 0x1dff),
+    (0x200b, 0x200f),
+    (0x2028, 0x202e),
+    (0x2060, 0x2064),
+    (0x2066, 0x206f),
+    (0x20d0, 0x20f0),
+    (0x2cef, 0x2cf1),
+    (0x2d7f, 0x2d7f),
+    (0x2de0, 0x2dff),
+    (0x302a, 0x302f),
+    (0x3099, 0x309a),
+    (0xa66f, 0xa672),
+    (0xa674, 0xa67d),
+    (0xa69e, 0xa69f),
+    (0xa6f0, 0xa6f1),
+    (0xa802, 0xa802),
+    (0xa806, 0xa806),
+    (0xa80b, 0xa80b),
+    (0xa823, 0xa827),
+    (0xa82c, 0xa82c),
+    (0xa880, 0xa881),
+    (0xa8b4, 0xa8c5),
+    (0xa8e0, 0xa8f1),
+    (0xa8ff, 0xa8ff),
+    (0xa926, 0xa92d),
+    (0xa947, 0xa953),
+    (0xa980, 0xa983),
+    (0xa9b3, 0xa9c0),
+    (0xa9e5, 0xa9e5),
+    (0xaa29, 0xaa36),
+    (0xaa43, 0xaa43),
+    (0xaa4c, 0xaa4d),
+    (0xaa7b, 0xaa7d),
+    (0xaab0, 0xaab0),
+    (0xaab2, 0xaab4),
+    (0xaab7, 0xaab8),
+    (0xaabe, 0xaabf),
+    (0xaac1, 0xaac1),
+    (0xaaeb, 0xaaef),
+    (0xaaf5, 0xaaf6),
+    (0xabe3, 0xabea),
+    (0xabec, 0xabed),
+    (0xd7b0, 0xd7ff),
+    (0xfb1e, 0xfb1e),
+    (0xfe00, 0xfe0f),
+    (0xfe20, 0xfe2f),
+    (0xfeff, 0xfeff),
+    (0xfff9, 0xfffb),
+    (0x101fd, 0x101fd),
+    (0x102e0, 0x102e0),
+    (0x10376, 0x1037a),
+    (0x10a01, 0x10a03),
+    (0x10a05, 0x10a06),
+    (0x10a0c, 0x10a0f),
+    (0x10a38, 0x10a3a),
+    (0x10a3f, 0x10a3f),
+    (0x10ae5, 0x10ae6),
+    (0x10d24, 0x10d27),
+    (0x10d69, 0x10d6d),
+    (0x10eab, 0x10eac),
+    (0x10efa, 0x10eff),
+    (0x10f46, 0x10f50),
+    (0x10f82, 0x10f85),
+    (0x11000, 0x11002),
+    (0x11038, 0x11046),
+    (0x11070, 0x11070),
+    (0x11073, 0x11074),
+    (0x1107f, 0x11082),
+    (0x110b0, 0x110ba),
+    (0x110bd, 0x110bd),
+    (0x110c2, 0x110c2),
+    (0x110cd, 0x110cd),
+    (0x11100, 0x11102),
+    (0x11127, 0x11134),
+    (0x11145, 0x11146),
+    (0x11173, 0x11173),
+    (0x11180, 0x11182),
+    (0x111b3, 0x111c0),
+    (0x111c9, 0x111cc),
+    (0x111ce, 0x111cf),
+    (0x1122c, 0x11237),
+    (0x1123e, 0x1123e),
+    (0x11241, 0x11241),
+    (0x112df, 0x112ea),
+    (0x11300, 0x11303),
+    (0x1133b, 0x1133c),
+    (0x1133e, 0x11344),
+    (0x11347, 0x11348),
+    (0x1134b, 0x1134d),
+    (0x11357, 0x11357),
+    (0x11362, 0x11363),
+    (0x11366, 0x1136c),
+    (0x11370, 0x11374),
+    (0x113b8, 0x113c0),
+    (0x113c2, 0x113c2),
+    (0x113c5, 0x113c5),
+    (0x113c7, 0x113ca),
+    (0x113cc, 0x113d0),
+    (0x113d2, 0x113d2),
+    (0x113e1, 0x113e2),
+    (0x11435, 0x11446),
+    (0x1145e, 0x1145e),
+    (0x114b0, 0x114c3),
+    (0x115af, 0x115b5),
+    (0x115b8, 0x115c0),
+    (0x115dc, 0x115dd),
+    (0x11630, 0x11640),
+    (0x116ab, 0x116b7),
+    (0x1171d, 0x1172b),
+    (0x1182c, 0x1183a),
+    (0x11930, 0x11935),
+    (0x11937, 0x11938),
+    (0x1193b, 0x1193e),
+    (0x11940, 0x11940),
+    (0x11942, 0x11943),
+    (0x119d1, 0x119d7),
+    (0x119da, 0x119e0),
+    (0x119e4, 0x119e4),
+    (0x11a01, 0x11a0a),
+    (0x11a33, 0x11a39),
+    (0x11a3b, 0x11a3e),
+    (0x11a47, 0x11a47),
+    (0x11a51, 0x11a5b),
+    (0x11a8a, 0x11a99),
+    (0x11b60, 0x11b67),
+    (0x11c2f, 0x11c36),
+    (0x11c38, 0x11c3f),
+    (0x11c92, 0x11ca7),
+    (0x11ca9, 0x11cb6),
+    (0x11d31, 0x11d36),
+    (0x11d3a, 0x11d3a),
+    (0x11d3c, 0x11d3d),
+    (0x11d3f, 0x11d45),
+    (0x11d47, 0x11d47),
+    (0x11d8a, 0x11d8e),
+    (0x11d90, 0x11d91),
+    (0x11d93, 0x11d97),
+    (0x11ef3, 0x11ef6),
+    (0x11f00, 0x11f01),
+    (0x11f03, 0x11f03),
+    (0x11f34, 0x11f3a),
+    (0x11f3e, 0x11f42),
+    (0x11f5a, 0x11f5a),
+    (0x13430, 0x13440),
+    (0x13447, 0x13455),
+    (0x1611e, 0x1612f),
+    (0x16af0, 0x16af4),
+    (0x16b30, 0x16b36),
+    (0x16f4f, 0x16f4f),
+    (0x16f51, 0x16f87),
+    (0x16f8f, 0x16f92),
+    (0x16fe4, 0x16fe4),
+    (0x16ff0, 0x16ff1),
+    (0x1bc9d, 0x1bc9e),
+    (0x1bca0, 0x1bca3),
+    (0x1cf00, 0x1cf2d),
+    (0x1cf30, 0x1cf46),
+    (0x1d165, 0x1d169),
+    (0x1d16d, 0x1d182),
+    (0x1d185, 0x1d18b),
+    (0x1d1aa, 0x1d1ad),
+    (0x1d242, 0x1d244),
+    (0x1da00, 0x1da36),
+    (0x1da3b, 0x1da6c),
+    (0x1da75, 0x1da75),
+    (0x1da84, 0x1da84),
+    (0x1da9b, 0x1da9f),
+    (0x1daa1, 0x1daaf),
+    (0x1e000, 0x1e006),
+    (0x1e008, 0x1e018),
+    (0x1e01b, 0x1e021),
+    (0x1e023, 0x1e024),
+    (0x1e026, 0x1e02a),
+    (0x1e08f, 0x1e08f),
+    (0x1e130, 0x1e136),
+    (0x1e2ae, 0x1e2ae),
+    (0x1e2ec, 0x1e2ef),
+    (0x1e4ec, 0x1e4ef),
+    (0x1e5ee, 0x1e5ef),
+    (0x1e6e3, 0x1e6e3),
+    (0x1e6e6, 0x1e6e6),
+    (0x1e6ee, 0x1e6ef),
+    (0x1e6f5, 0x1e6f5),
+    (0x1e8d0, 0x1e8d6),
+    (0x1e944, 0x1e94a),
+    (0x1f3fb, 0x1f3ff),
+    (0xe0001, 0xe0001),
+    (0xe0020, 0xe007f),
+    (0xe0100, 0xe01ef),
+)
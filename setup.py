@@ -17,7 +17,6 @@ setup(
             'jedi>=0.8.1',
             'pygments',
             'six>=1.8.0',
-            'wcwidth',
         ],
         entry_points={
             'console_scripts': [
@@ -0,0 +1,293 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit import CommandLineInterface
+from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.line import Line
+
+import io
+import os
+import prompt_toolkit
+import pty
+import threading
+import unittest
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+class _EventLoop(object):
+    """
+    Event loop that doesn't run anything by itself.
+    """
+    def __init__(self):
+        self.executor_calls = []
+        self.calls_from_executor = []
+        self.timers = []
+
+    def run_in_executor(self, callback, priority=0, key=None):
+        self.executor_calls.append(callback)
+
+    def call_from_executor(self, callback):
+        self.calls_from_executor.append(callback)
+
+    def call_later(self, delay, callback):
+        self.timers.append(callback)
+
+
+class _Completer(Completer):
+    def __init__(self):
+        self.yielded = []
+        self.documents = []
+
+        #: Called when the completer starts.
+        self.on_start = lambda: None
+
+    def get_completions(self, document):
+        self.documents.append(document.text)
+        self.on_start()
+
+        for text in ['one', 'two', 'three']:
+            self.yielded.append(text)
+            yield Completion(text, -len(document.text_before_cursor))
+
+
+class AsyncCompletionTest(unittest.TestCase):
+    def setUp(self):
+        # Send every completion in a separate batch.
+        self._interval = prompt_toolkit._COMPLETION_BATCH_INTERVAL
+        prompt_toolkit._COMPLETION_BATCH_INTERVAL = 0
+
+        self.completer = _Completer()
+        self.cli = CommandLineInterface(stdout=io.StringIO(),
+                                        line=Line(completer=self.completer))
+        self.eventloop = _EventLoop()
+        self.cli.eventloop = self.eventloop
+        self.cli._redraw = lambda: None
+
+    def tearDown(self):
+        prompt_toolkit._COMPLETION_BATCH_INTERVAL = self._interval
+
+    def _run_executor(self):
+        calls, self.eventloop.executor_calls = self.eventloop.executor_calls, []
+        for c in calls:
+            c()
+
+    def _run_calls_from_executor(self, count=None):
+        calls = self.eventloop.calls_from_executor
+        for c in calls[:count]:
+            c()
+        del calls[:count]
+
+    def _completions(self):
+        return [c.text for c in self.cli.line.complete_state.current_completions]
+
+    def test_batches(self):
+        self.cli.line.insert_text('t')
+        self._run_executor()
+
+        self._run_calls_from_executor(1)
+        self.assertEqual(self._completions(), ['one'])
+
+        self._run_calls_from_executor()
+        self.assertEqual(self._completions(), ['one', 'two', 'three'])
+
+    def test_cancel(self):
+        self.cli.line.insert_text('t')
+        self.cli.line.insert_text('w')
+
+        # Only one completer is started. It's cancelled before it runs, so it
+        # doesn't call the completer.
+        self.assertEqual(len(self.eventloop.executor_calls), 1)
+        self._run_executor()
+        self.assertEqual(self.completer.yielded, [])
+
+        # When it's done, it runs again for the new text.
+        self._run_calls_from_executor()
+        self._run_executor()
+        self.assertEqual(self.completer.documents, ['tw'])
+
+        self._run_calls_from_executor()
+        self.assertEqual(self._completions(), ['one', 'two', 'three'])
+        self.assertEqual(self.cli.line.complete_state.original_document.text, 'tw')
+
+    def test_text_changed_while_running(self):
+        # Type the next character while the completer is running.
+        self.completer.on_start = lambda: self.cli.line.insert_text('w')
+
+        self.cli.line.insert_text('t')
+        self._run_executor()
+
+        # The second character doesn't start another completer, and the
+        # running one stops at the first completion.
+        self.assertEqual(self.completer.documents, ['t'])
+        self.assertEqual(self.completer.yielded, ['one'])
+        self.assertEqual(self.eventloop.executor_calls, [])
+
+        # When it's done, it runs once more, for the latest text.
+        self.completer.on_start = lambda: None
+        self._run_calls_from_executor()
+        self.assertEqual(len(self.eventloop.executor_calls), 1)
+
+        self._run_executor()
+        self._run_calls_from_executor()
+        self.assertEqual(self.completer.documents, ['t', 'tw'])
+        self.assertEqual(self._completions(), ['one', 'two', 'three'])
+        self.assertEqual(self.cli.line.complete_state.original_document.text, 'tw')
+
+    def test_text_changed(self):
+        self.cli.line.insert_text('t')
+        self._run_executor()
+
+        # Move the cursor before the first completions arrive: the
+        # completions are not shown and the completer is restarted when it's
+        # done.
+        self.cli.line.cursor_position = 0
+
+        self._run_calls_from_executor(1)
+        self.assertEqual(self.cli.line.complete_state, None)
+        self.assertEqual(len(self.eventloop.executor_calls), 0)
+
+        self._run_calls_from_executor()
+        self.assertEqual(self.cli.line.complete_state, None)
+        self.assertEqual(len(self.eventloop.executor_calls), 1)
+
+
+class RedrawTest(unittest.TestCase):
+    def setUp(self):
+        self.cli = CommandLineInterface(stdout=io.StringIO())
+        self.cli.eventloop = _EventLoop()
+        self.cli.renderer.render = lambda cli: None
+
+    def test_merge_redraws(self):
+        self.cli._redraw()
+        self.assertEqual(self.cli.renders_performed, 1)
+
+        # Within the interval, the redraws are postponed and merged.
+        self.cli._redraw()
+        self.cli._redraw()
+        self.assertEqual(self.cli.renders_requested, 3)
+        self.assertEqual(self.cli.renders_performed, 1)
+        self.assertEqual(len(self.cli.eventloop.timers), 1)
+
+        self.cli.eventloop.timers.pop()()
+        self.assertEqual(self.cli.renders_performed, 2)
+
+    def test_no_interval(self):
+        self.cli.min_redraw_interval = 0
+
+        for i in range(3):
+            self.cli._redraw()
+
+        self.assertEqual(self.cli.renders_performed, 3)
+        self.assertEqual(self.cli.eventloop.timers, [])
+
+
+class ReadInputTest(unittest.TestCase):
+    def setUp(self):
+        self.master, slave = pty.openpty()
+        self.stdin = os.fdopen(slave, 'rb', 0)
+        self.stdout = io.open(os.dup(slave), 'w')
+
+    def tearDown(self):
+        self.stdin.close()
+        self.stdout.close()
+        os.close(self.master)
+
+    def test_async_completion_in_next_read_input(self):
+        cli = CommandLineInterface(stdin=self.stdin, stdout=self.stdout,
+                                   line=Line(completer=_Completer()))
+
+        # The text for every completer that is started.
+        started = []
+        run_in_executor = cli.run_in_executor
+
+        def record(callback, **kwargs):
+            started.append(cli.line.text)
+            run_in_executor(callback, **kwargs)
+        cli.run_in_executor = record
+
+        # Both inputs end while their completer is still waiting or running.
+        os.write(self.master, b'a\r')
+        self.assertEqual(cli.read_input().text, 'a')
+
+        os.write(self.master, b'b\r')
+        self.assertEqual(cli.read_input().text, 'b')
+
+        self.assertEqual(started, ['a', 'b'])
+
+    def test_executor_is_shared(self):
+        cli = CommandLineInterface(stdin=self.stdin, stdout=self.stdout)
+
+        executors = []
+        cli.onReadInputStart += lambda: executors.append(cli.eventloop.executor)
+
+        for i in range(2):
+            os.write(self.master, b'\r')
+            cli.read_input()
+
+        self.assertEqual(executors, [cli.executor, cli.executor])
+
+        # It's not shut down at the end of the input.
+        done = threading.Event()
+        cli.executor.submit(done.set)
+        self.assertTrue(done.wait(5))
+
+
+@unittest.skipIf(asyncio is None, 'asyncio is not available')
+class ReadInputAsyncTest(unittest.TestCase):
+    def setUp(self):
+        self.master, slave = pty.openpty()
+        self.stdin = os.fdopen(slave, 'rb', 0)
+        self.stdout = io.open(os.dup(slave), 'w')
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        self.stdin.close()
+        self.stdout.close()
+        os.close(self.master)
+
+    def test_read_input_async(self):
+        cli = CommandLineInterface(stdin=self.stdin, stdout=self.stdout)
+
+        # Other work on the same event loop, while reading the input.
+        ticks = []
+
+        def tick():
+            ticks.append(None)
+            if cli.is_reading_input:
+                self.loop.call_later(.001, tick)
+
+        self.loop.call_soon(tick)
+        self.loop.call_later(.05, os.write, self.master, b'hello\r')
+
+        result = self.loop.run_until_complete(cli.read_input_async(loop=self.loop))
+
+        self.assertEqual(result.text, 'hello')
+        self.assertFalse(cli.is_reading_input)
+        self.assertTrue(len(ticks) > 10)
+
+    def test_run_in_executor(self):
+        # (Imported here, it requires asyncio.)
+        from prompt_toolkit.eventloop.asyncio_posix import AsyncioEventLoop
+
+        eventloop = AsyncioEventLoop(None, self.stdin, loop=self.loop)
+        result = []
+
+        def done():
+            result.append('done')
+            self.loop.stop()
+
+        def callback():
+            eventloop.call_from_executor(done)
+
+        eventloop.run_in_executor(callback, priority=1, key='key')
+        self.loop.call_later(2, self.loop.stop)
+        self.loop.run_forever()
+        eventloop.close()
+
+        # Our executor was used, not the one of the asyncio loop.
+        self.assertEqual(result, ['done'])
+        self.assertEqual(eventloop.executor.jobs_submitted, 1)
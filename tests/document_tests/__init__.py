@@ -60,3 +60,26 @@ class DocumentTest(unittest.TestCase):
 
         self.assertEqual(pos[0], 3)
         self.assertEqual(pos[1], 3)
+
+    def test_translate_row_col_to_index(self):
+        self.assertEqual(self.document.translate_row_col_to_index(0, 2), 2)
+        self.assertEqual(self.document.translate_row_col_to_index(2, 3), len('line 1\nline 2\nlin'))
+
+    def test_cursor_up_and_down(self):
+        document = Document('long line\nshort\nlong line', len('long line\nshort\nlong li'))
+
+        self.assertEqual(document.get_cursor_up_position(), - len('\nlong li'))
+        self.assertEqual(document.get_cursor_up_position(count=2), - len('ne\nshort\nlong li'))
+        self.assertEqual(document.get_cursor_down_position(), 0)
+
+        document = Document(document.text, len('long li'))
+        self.assertEqual(document.get_cursor_down_position(), len('ne\nshort'))
+
+    def test_lines_are_shared(self):
+        # Documents with the same text share the list of lines, so it can't be
+        # modified.
+        document = Document(self.document.text, 0)
+
+        self.assertIs(document.lines, self.document.lines)
+        self.assertRaises(TypeError, document.lines.append, 'line 5')
+        self.assertRaises(TypeError, document.lines.__setitem__, 0, 'line 0')
@@ -0,0 +1,165 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit.eventloop.posix import PosixEventLoop, _Waker
+from prompt_toolkit.key_binding import InputProcessor, Registry
+from prompt_toolkit.keys import Keys
+
+import os
+import select
+import threading
+import time
+import unittest
+
+
+class PosixEventLoopTest(unittest.TestCase):
+    def setUp(self):
+        self.keys = []
+
+        registry = Registry()
+        registry.add_binding(Keys.Any)(lambda event: self.keys.append(event.data))
+
+        self.read_fd, self.write_fd = os.pipe()
+        self.stdin = os.fdopen(self.read_fd, 'rb', 0)
+        self.eventloop = PosixEventLoop(InputProcessor(registry), self.stdin)
+
+    def tearDown(self):
+        self.eventloop.close()
+        self.stdin.close()
+        os.close(self.write_fd)
+
+    def test_call_later(self):
+        called = []
+        self.eventloop.call_later(.02, lambda: called.append(2))
+        self.eventloop.call_later(.01, lambda: called.append(1))
+        self.eventloop.call_later(.03, lambda: os.write(self.write_fd, b'x'))
+
+        start = time.time()
+        self.eventloop.loop()
+
+        self.assertEqual(called, [1, 2])
+        self.assertEqual(self.keys, ['x'])
+        self.assertTrue(time.time() - start >= .03)
+
+    def test_input_timeout(self):
+        called = []
+        self.eventloop.input_timeout = .02
+        self.eventloop.onInputTimeout += lambda: called.append('timeout')
+
+        # A timer doesn't cause the input timeout to fire earlier.
+        self.eventloop.call_later(.01, lambda: called.append('timer'))
+        self.eventloop.call_later(.04, lambda: os.write(self.write_fd, b'x'))
+        self.eventloop.loop()
+
+        self.assertEqual(called, ['timer', 'timeout'])
+
+    def test_read_all_available_input(self):
+        self.eventloop.stdin_read_size = 4
+        os.write(self.write_fd, b'abcdefghij')
+
+        self.eventloop.loop()
+        self.assertEqual(''.join(self.keys), 'abcdefghij')
+
+    def test_add_reader(self):
+        read_fd, write_fd = os.pipe()
+        received = []
+
+        def reader():
+            received.append(os.read(read_fd, 1024))
+
+            # Stop watching, and return from the loop by sending input.
+            self.eventloop.remove_reader(read_fd)
+            os.write(self.write_fd, b'x')
+
+        try:
+            self.eventloop.add_reader(read_fd, reader)
+            os.write(write_fd, b'data')
+            self.eventloop.loop()
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+        self.assertEqual(received, [b'data'])
+        self.assertEqual(self.keys, ['x'])
+
+    def test_cancel_timer(self):
+        called = []
+        timer = self.eventloop.call_later(.01, lambda: called.append('cancelled'))
+        self.eventloop.call_later(.02, lambda: os.write(self.write_fd, b'x'))
+        timer.cancel()
+
+        self.eventloop.loop()
+        self.assertEqual(called, [])
+
+    def test_call_from_executor(self):
+        called = []
+
+        def done():
+            called.append('done')
+            os.write(self.write_fd, b'x')
+
+        # Callbacks that are queued before the event loop wakes up, are
+        # processed in one batch, in order.
+        for i in range(3):
+            self.eventloop.call_from_executor(lambda i=i: called.append(i))
+        self.eventloop.call_from_executor(done)
+
+        self.eventloop.loop()
+        self.assertEqual(called, [0, 1, 2, 'done'])
+
+    def test_call_from_executor_threads(self):
+        called = []
+        total = 4 * 1000
+
+        def callback():
+            called.append(1)
+            if len(called) == total:
+                os.write(self.write_fd, b'x')
+
+        def producer():
+            for i in range(1000):
+                self.eventloop.call_from_executor(callback)
+
+        threads = [threading.Thread(target=producer) for i in range(4)]
+        for t in threads:
+            t.start()
+
+        self.eventloop.loop()
+
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(called), total)
+
+    def test_call_from_executor_reentrant(self):
+        # A signal handler (SIGWINCH) can call `call_from_executor` while the
+        # main thread is in the middle of `call_from_executor`. Run this in
+        # another thread, so that a deadlock doesn't hang the tests.
+        called = []
+
+        def main_thread():
+            with self.eventloop._calls_from_executor_lock:
+                self.eventloop.call_from_executor(lambda: called.append('resize'))
+
+        thread = threading.Thread(target=main_thread)
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout=2)
+        self.assertFalse(thread.is_alive())
+
+        self.eventloop.process_queued_calls_from_executor()
+        self.assertEqual(called, ['resize'])
+
+    def test_wake_after_close(self):
+        read_fd, write_fd = os.pipe()
+        waker = _Waker()
+        waker.close()
+
+        # Another file gets the file descriptor number of the waker. Waking up
+        # the closed waker must not write to it.
+        os.dup2(write_fd, waker._write_fd)
+        try:
+            waker.wake()
+            self.assertEqual(select.select([read_fd], [], [], 0)[0], [])
+        finally:
+            for fd in (read_fd, write_fd, waker._write_fd):
+                os.close(fd)
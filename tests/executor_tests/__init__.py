@@ -0,0 +1,71 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit.eventloop.executor import ThreadPoolExecutor
+
+import threading
+import unittest
+
+
+class ThreadPoolExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.called = []
+
+        # Keep the only worker busy until `release` is set.
+        self.release = threading.Event()
+        self.executor.submit(self.release.wait)
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown()
+
+    def _submit(self, name, **kw):
+        self.executor.submit(lambda: self.called.append(name), **kw)
+
+    def _wait(self):
+        done = threading.Event()
+        self.executor.submit(done.set, priority=-100)
+        self.release.set()
+        self.assertTrue(done.wait(5))
+
+    def test_priority(self):
+        self._submit('a')
+        self._submit('b', priority=1)
+        self._submit('c')
+        self._wait()
+
+        self.assertEqual(self.called, ['b', 'a', 'c'])
+
+    def test_coalesce(self):
+        self._submit('a', key='completion')
+        self._submit('b', key='signatures')
+        self._submit('c', key='completion')
+        self._wait()
+
+        self.assertEqual(self.called, ['b', 'c'])
+        self.assertEqual(self.executor.jobs_coalesced, 1)
+
+    def test_bounded(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        release = threading.Event()
+        try:
+            for i in range(10):
+                executor.submit(release.wait)
+            self.assertEqual(executor.threads_started, 2)
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_shutdown(self):
+        # Waiting jobs still run after `shutdown`.
+        self._submit('a')
+        done = threading.Event()
+        self.executor.submit(done.set)
+        self.executor.shutdown()
+        self.release.set()
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(self.called, ['a'])
+
+        # But new jobs are refused.
+        self.assertRaises(RuntimeError, self._submit, 'b')
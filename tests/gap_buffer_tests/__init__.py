@@ -0,0 +1,68 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit.gap_buffer import GapBuffer
+
+import random
+import unittest
+
+
+class GapBufferTest(unittest.TestCase):
+    def test_initial(self):
+        self.assertEqual(GapBuffer().text, '')
+        self.assertEqual(GapBuffer('hello').text, 'hello')
+        self.assertEqual(len(GapBuffer('hello')), 5)
+
+    def test_insert(self):
+        b = GapBuffer('hello world')
+        b.insert(5, ',')
+        b.insert(6, ' big')
+        b.insert(0, '>')
+        b.insert(len(b), '!')
+
+        self.assertEqual(b.text, '>hello, big world!')
+        self.assertEqual(len(b), len('>hello, big world!'))
+
+    def test_delete(self):
+        b = GapBuffer('hello world')
+
+        self.assertEqual(b.delete(4, 6), 'o ')
+        self.assertEqual(b.text, 'hellworld')
+
+        # Out of range.
+        self.assertEqual(b.delete(-2, 1), 'h')
+        self.assertEqual(b.delete(6, 100), 'ld')
+        self.assertEqual(b.delete(3, 3), '')
+        self.assertEqual(b.text, 'ellwor')
+
+    def test_random_edits(self):
+        # Compare with the same operations on a string, for a text that's big
+        # enough to have its chunks split.
+        r = random.Random(1)
+        text = ''.join(r.choice('abc\n') for i in range(5000))
+        b = GapBuffer(text)
+        position = len(text) // 2
+
+        for i in range(2000):
+            position = max(0, min(len(text), position + r.randint(-20, 20)))
+            action = r.choice(['insert', 'delete', 'backspace', 'text'])
+
+            if action == 'insert':
+                data = r.choice(['x', 'yz', 'long text ' * 30])
+                text = text[:position] + data + text[position:]
+                b.insert(position, data)
+                position += len(data)
+            elif action == 'delete':
+                count = r.randint(1, 5)
+                self.assertEqual(b.delete(position, position + count), text[position:position + count])
+                text = text[:position] + text[position + count:]
+            elif action == 'backspace':
+                start = max(0, position - r.randint(1, 5))
+                self.assertEqual(b.delete(start, position), text[start:position])
+                text = text[:start] + text[position:]
+                position = start
+            else:
+                self.assertEqual(b.text, text)
+
+            self.assertEqual(len(b), len(text))
+
+        self.assertEqual(b.text, text)
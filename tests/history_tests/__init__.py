@@ -0,0 +1,151 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit.history import History, FileHistory
+
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class FileHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'history')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _history(self, cls=FileHistory):
+        history = cls(self.filename)
+        self.addCleanup(history.close)
+        return history
+
+    def _write(self, data):
+        with open(self.filename, 'wb') as f:
+            f.write(data.encode('utf-8'))
+
+    def test_no_file(self):
+        history = self._history()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.strings, [])
+
+    def test_load(self):
+        self._write(
+            '\n# 2014-01-01 10:00:00.000000\n+print(1)\n'
+            '\n# 2014-01-01 10:00:01.000000\n+def f():\n+    return "☃"\n'
+            '\n# 2014-01-01 10:00:02.000000\n+\n+x = 1\n')
+
+        history = self._history()
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history[0], 'print(1)')
+        self.assertEqual(history[1], 'def f():\n    return "☃"')
+        self.assertEqual(history[2], '\nx = 1')
+        self.assertEqual(history[-1], '\nx = 1')
+        self.assertEqual(history[1:], [history[1], history[2]])
+        self.assertRaises(IndexError, lambda: history[3])
+
+    def test_append(self):
+        self._write('\n# 2014-01-01 10:00:00.000000\n+a\n')
+
+        history = self._history()
+        history.append('b\nc')
+
+        self.assertEqual(history.strings, ['a', 'b\nc'])
+        self.assertEqual(history[-1], 'b\nc')
+
+        # Reading the file again gives the same entries.
+        self.assertEqual(self._history().strings, ['a', 'b\nc'])
+
+    def test_load_without_headers(self):
+        # Any line that doesn't start with '+' separates entries.
+        self._write('+a\n+b\n\n+c\nother\n+d\n')
+
+        history = self._history()
+        self.assertEqual(history.strings, ['a\nb', 'c', 'd'])
+
+    def test_find(self):
+        self._write(
+            '\n# 2014-01-01 10:00:00.000000\n+abc\n'
+            '\n# 2014-01-01 10:00:01.000000\n+def\n+ghi\n'
+            '\n# 2014-01-01 10:00:02.000000\n+abc\n')
+
+        history = self._history()
+        history.append('xyz abc')
+
+        self.assertEqual(history.find('abc'), 0)
+        self.assertEqual(history.find('abc', 1), 2)
+        self.assertEqual(history.find('abc', 1, 2), None)
+        self.assertEqual(history.find_backwards('abc'), 3)
+        self.assertEqual(history.find_backwards('abc', 0, 3), 2)
+        self.assertEqual(history.find('def\nghi'), 1)
+
+        # Don't match the file format itself.
+        self.assertEqual(history.find('2014'), None)
+        self.assertEqual(history.find('+ghi'), None)
+        self.assertEqual(history.find('abc\n'), None)
+
+    def test_file_truncated_by_other_process(self):
+        self._write(
+            '\n# 2014-01-01 10:00:00.000000\n+abc\n'
+            '\n# 2014-01-01 10:00:01.000000\n+def\n')
+
+        history = self._history()
+
+        # Like another shell that truncates the history file. (The entries
+        # are gone, but that doesn't crash.)
+        self._write('')
+
+        self.assertEqual(history.strings, ['', ''])
+        self.assertEqual(history.find('def'), None)
+
+    def test_file_replaced_by_other_process(self):
+        self._write('+abc\n\n+def\n')
+        history = self._history()
+
+        # Like another shell that writes a new file and renames it. We keep
+        # reading the old one.
+        os.rename(self.filename, self.filename + '.old')
+        self._write('+xyz\n')
+
+        self.assertEqual(history.strings, ['abc', 'def'])
+        self.assertEqual(history.find('def'), 1)
+
+    def test_small_blocks(self):
+        entries = ['entry %i\nline' % i for i in range(50)] + ['a' * 100, 'abc']
+        self._write(''.join('\n# 2014-01-01 10:00:00.000000\n+%s\n' % e.replace('\n', '\n+')
+                            for e in entries))
+
+        # Load and search in blocks that are smaller than the entries.
+        class SmallBlocksFileHistory(FileHistory):
+            block_size = 16
+
+        history = self._history(SmallBlocksFileHistory)
+        self.assertEqual(history.strings, entries)
+        self.assertEqual(history.find('entry 3\n'), 3)
+        self.assertEqual(history.find('entry 3'), 3)
+        self.assertEqual(history.find('entry 3', 4), 30)
+        self.assertEqual(history.find_backwards('entry 3'), 39)
+        self.assertEqual(history.find_backwards('entry 3', 0, 30), 3)
+        self.assertEqual(history.find('aaa'), 50)
+        self.assertEqual(history.find_backwards('ab'), 51)
+        self.assertEqual(history.find('line\nentry'), None)
+
+
+class HistoryTest(unittest.TestCase):
+    def test_find(self):
+        history = History()
+        history.append('abc')
+        history.append('de')
+        history.append('f abc')
+
+        self.assertEqual(history.find('abc'), 0)
+        self.assertEqual(history.find('abc', 1), 2)
+        self.assertEqual(history.find_backwards('abc'), 2)
+        self.assertEqual(history.find_backwards('abc', 0, 2), 0)
+        self.assertEqual(history.find_backwards('ef'), None)
+
+        # Appended strings are searched too.
+        history.append('abc')
+        self.assertEqual(history.find_backwards('abc'), 3)
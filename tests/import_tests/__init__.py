@@ -0,0 +1,64 @@
+from __future__ import unicode_literals
+
+import os
+import subprocess
+import sys
+import unittest
+
+import prompt_toolkit
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(prompt_toolkit.__file__)))
+
+
+def _import_times(module):
+    """
+    Import `module` in a new process with ``-X importtime``. Return a dict
+    that maps the names of all the imported modules to their cumulative
+    import time in microseconds.
+    """
+    env = dict(os.environ, PYTHONPATH=_ROOT)
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+        stderr=subprocess.STDOUT, env=env, cwd=_ROOT)
+
+    result = {}
+    for line in output.decode('utf-8').splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            try:
+                result[name.strip()] = int(cumulative)
+            except ValueError:
+                pass  # The header.
+    return result
+
+
+#: Budget for `import prompt_toolkit`, in milliseconds. The wall clock time
+#: depends on the machine, so this one is generous: it only catches imports
+#: of slow modules that should be deferred. A lower budget can be given with
+#: ``PROMPT_TOOLKIT_IMPORT_BUDGET_MS`` (e.g. 70), but not a higher one.
+_DEFAULT_BUDGET_MS = 250.
+_BUDGET_MS = min(_DEFAULT_BUDGET_MS, float(os.environ.get('PROMPT_TOOLKIT_IMPORT_BUDGET_MS') or
+                                           _DEFAULT_BUDGET_MS))
+
+
+@unittest.skipIf(sys.version_info < (3, 7), '-X importtime requires Python 3.7.')
+class ImportTimeTest(unittest.TestCase):
+    def test_import_time(self):
+        # Best of a few runs, to not fail on a busy machine.
+        times = [_import_times('prompt_toolkit')['prompt_toolkit'] for i in range(5)]
+        self.assertLess(min(times) / 1000., _BUDGET_MS)
+
+    def test_lazy_imports(self):
+        modules = _import_times('prompt_toolkit')
+
+        for name in ['jedi',
+                     'pygments.formatters',
+                     'pygments.lexers',
+                     'pygments.styles',
+                     'prompt_toolkit.contrib.python_input',
+                     'prompt_toolkit.key_bindings.emacs',
+                     'prompt_toolkit.key_bindings.vi',
+                     'prompt_toolkit.width_table',
+                     'subprocess',
+                     'tempfile']:
+            self.assertNotIn(name, modules)
@@ -109,3 +109,47 @@ class InputStreamTest(unittest.TestCase):
         self.assertEqual(self.processor.keys[0].key, Keys.Escape)
         self.assertEqual(self.processor.keys[1].key, '[')
         self.assertEqual(self.processor.keys[2].key, '*')
+
+    def test_cpr_response(self):
+        self.stream.feed('a\x1b[40;10Rb')
+
+        self.assertEqual(len(self.processor.keys), 3)
+        self.assertEqual(self.processor.keys[0].key, 'a')
+        self.assertEqual(self.processor.keys[1].key, Keys.CPRResponse)
+        self.assertEqual(self.processor.keys[2].key, 'b')
+        self.assertEqual(self.processor.keys[1].data, '\x1b[40;10R')
+
+    def test_longer_sequence_in_parts(self):
+        # '\x1b[1~' is Home, '\x1b[15~' is F5.
+        self.stream.feed('\x1b[1')
+        self.assertEqual(len(self.processor.keys), 0)
+
+        self.stream.feed('5~\x1b[1~')
+
+        self.assertEqual(len(self.processor.keys), 2)
+        self.assertEqual(self.processor.keys[0].key, Keys.F5)
+        self.assertEqual(self.processor.keys[1].key, Keys.Home)
+
+    def test_bracketed_paste(self):
+        self.stream.feed('a\x1b[200~hello\x1b[Aworld\r\x1b[201~b')
+
+        self.assertEqual(len(self.processor.keys), 3)
+        self.assertEqual(self.processor.keys[0].key, 'a')
+        self.assertEqual(self.processor.keys[1].key, Keys.BracketedPaste)
+        self.assertEqual(self.processor.keys[1].data, 'hello\x1b[Aworld\r')
+        self.assertEqual(self.processor.keys[2].key, 'b')
+        self.assertFalse(self.stream.in_bracketed_paste)
+
+    def test_bracketed_paste_in_parts(self):
+        # Start and end markers are split, and a flush happens in between.
+        for data in ['\x1b[20', '0~hel', 'lo\x1b', '[20', '1', '~\x1b[A']:
+            self.stream.feed(data)
+
+            if data == '0~hel':
+                self.assertTrue(self.stream.in_bracketed_paste)
+                self.stream.flush()
+
+        self.assertEqual(len(self.processor.keys), 2)
+        self.assertEqual(self.processor.keys[0].key, Keys.BracketedPaste)
+        self.assertEqual(self.processor.keys[0].data, 'hello')
+        self.assertEqual(self.processor.keys[1].key, Keys.Up)
@@ -1,8 +1,16 @@
 from __future__ import unicode_literals
 
+from prompt_toolkit import CommandLineInterface
 from prompt_toolkit.key_binding import InputProcessor, Registry, KeyPress
+from prompt_toolkit.key_bindings.emacs import emacs_bindings
+from prompt_toolkit.key_bindings.vi import vi_bindings
 from prompt_toolkit.keys import Keys
+from prompt_toolkit.enums import InputMode
+from prompt_toolkit.history import History
+from prompt_toolkit.line import Line
+from prompt_toolkit.terminal.vt100_input import InputStream
 
+import io
 import unittest
 
 
@@ -68,3 +76,81 @@ class KeyBindingTest(unittest.TestCase):
         self.processor.feed_key(KeyPress(Keys.ControlD, ''))
 
         self.assertEqual(self.handlers.called, ['control_x', 'control_d'])
+
+    def test_input_mode(self):
+        self.registry.add_binding(Keys.ControlD, in_mode=InputMode.VI_NAVIGATION)(self.handlers.vi_control_d)
+
+        # Bindings for the current input mode have priority over bindings
+        # without input mode.
+        self.processor.feed_key(KeyPress(Keys.ControlD, ''))
+        self.processor.input_mode = InputMode.VI_NAVIGATION
+        self.processor.feed_key(KeyPress(Keys.ControlD, ''))
+
+        self.assertEqual(self.handlers.called, ['control_d', 'vi_control_d'])
+
+    def test_prefix_in_other_input_mode(self):
+        self.registry.add_binding(Keys.ControlD, Keys.ControlD, in_mode=InputMode.VI_NAVIGATION)(
+            self.handlers.vi_control_d_control_d)
+
+        # In insert mode, the longer binding is not considered.
+        self.processor.feed_key(KeyPress(Keys.ControlD, ''))
+        self.assertEqual(self.handlers.called, ['control_d'])
+
+        self.processor.input_mode = InputMode.VI_NAVIGATION
+        self.processor.feed_key(KeyPress(Keys.ControlD, ''))
+        self.assertEqual(self.handlers.called, ['control_d'])
+
+        self.processor.feed_key(KeyPress(Keys.ControlD, ''))
+        self.assertEqual(self.handlers.called, ['control_d', 'vi_control_d_control_d'])
+
+    def test_any_fallback(self):
+        self.registry.add_binding(Keys.ControlSquareClose, 'x')(self.handlers.control_square_close_x)
+
+        # An exact match has priority over a match with 'Any'.
+        self.processor.feed_key(KeyPress(Keys.ControlSquareClose, ''))
+        self.processor.feed_key(KeyPress('x', 'x'))
+        self.processor.feed_key(KeyPress(Keys.ControlSquareClose, ''))
+        self.processor.feed_key(KeyPress('y', 'y'))
+
+        self.assertEqual(self.handlers.called, ['control_square_close_x', 'control_square_close_any'])
+
+
+class BracketedPasteTest(unittest.TestCase):
+    def _create_cli(self, key_bindings):
+        history = History()
+        history.append('import os')
+        history.append('print(os.getcwd())')
+
+        cli = CommandLineInterface(stdout=io.StringIO(), line=Line(history=history),
+                                   key_binding_factories=[key_bindings])
+        return cli, InputStream(cli.input_processor)
+
+    def test_paste(self):
+        cli, stream = self._create_cli(emacs_bindings)
+        stream.feed('\x1b[200~a\r\nb\rc\x1b[201~')
+
+        self.assertEqual(cli.line.text, 'a\nb\nc')
+
+    def test_paste_in_system_prompt(self):
+        cli, stream = self._create_cli(emacs_bindings)
+        cli.input_processor.push_input_mode(InputMode.SYSTEM)
+        stream.feed('\x1b[200~ls\r\npwd\rls\x1b[201~')
+
+        self.assertEqual(cli.lines['system'].text, 'ls\npwd\nls')
+        self.assertEqual(cli.line.text, '')
+
+    def test_paste_in_incremental_search(self):
+        cli, stream = self._create_cli(emacs_bindings)
+        stream.feed('\x12')  # Control-R
+        stream.feed('\x1b[200~import\r\x1b[201~')
+
+        self.assertEqual(cli.lines['search'].text, 'import')
+        self.assertEqual(cli.line.text, 'import os')
+
+    def test_paste_in_vi_search(self):
+        cli, stream = self._create_cli(vi_bindings)
+        stream.feed('\x1b?')  # Backward search.
+        stream.feed('\x1b[200~getcwd\r\x1b[201~')
+
+        self.assertEqual(cli.lines['search'].text, 'getcwd')
+        self.assertEqual(cli.line.text, 'print(os.getcwd())')
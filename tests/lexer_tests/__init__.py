@@ -0,0 +1,126 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit.layout.lexers import IncrementalLexer
+from pygments.lexers import PythonLexer, JavascriptLexer
+
+import unittest
+
+
+_CODE = '''
+import os
+
+class Point(object):
+    """
+    A point.
+    """
+    def __init__(self, x=0, y=0):
+        self.x = x  # Horizontal.
+        self.y = y
+
+    def __repr__(self):
+        return 'Point(%r, %r)' % (self.x, self.y)
+'''
+
+
+class IncrementalLexerTest(unittest.TestCase):
+    def setUp(self):
+        self.pygments_lexer = PythonLexer(stripnl=False, stripall=False, ensurenl=False)
+        self.lexer = IncrementalLexer(self.pygments_lexer)
+
+    def _explode(self, tokens):
+        return [(token, c) for token, text in tokens for c in text]
+
+    def _assert_same_as_full_lexing(self, text):
+        self.assertEqual(
+            self._explode(self.lexer.get_tokens(text)),
+            self._explode(self.pygments_lexer.get_tokens(text)))
+
+    def test_initial(self):
+        self._assert_same_as_full_lexing(_CODE)
+
+    def test_typing(self):
+        text = _CODE
+        position = text.index('self.y = y') + len('self.y = y')
+
+        for c in ' + 1  # Vertical.':
+            text = text[:position] + c + text[position:]
+            position += 1
+            self._assert_same_as_full_lexing(text)
+
+    def test_open_and_close_string(self):
+        # Opening a triple quoted string changes the state of all the
+        # following lines.
+        self._assert_same_as_full_lexing(_CODE)
+
+        position = _CODE.index('class Point')
+        text = _CODE[:position] + '"""' + _CODE[position:]
+        self._assert_same_as_full_lexing(text)
+
+        position = text.index('def __repr__')
+        text = text[:position] + '"""' + text[position:]
+        self._assert_same_as_full_lexing(text)
+
+        self._assert_same_as_full_lexing(_CODE)
+
+    def test_insert_and_delete_lines(self):
+        self._assert_same_as_full_lexing(_CODE)
+        self._assert_same_as_full_lexing(_CODE + _CODE)
+        self._assert_same_as_full_lexing(_CODE.replace('import os\n', ''))
+        self._assert_same_as_full_lexing('')
+        self._assert_same_as_full_lexing(_CODE)
+
+    def test_only_changed_lines_are_lexed(self):
+        text = _CODE * 50
+        self.lexer.get_tokens(text)
+        line_tokens = self.lexer._line_tokens
+
+        # Change the last line.
+        self.lexer.get_tokens(text + 'x')
+
+        self.assertTrue(all(a is b for a, b in zip(line_tokens[:-2], self.lexer._line_tokens)))
+
+
+class MultilineTokenLexerTest(unittest.TestCase):
+    """
+    Strings and comments of JavaScript are one token (of one rule), which can
+    span several lines, without a state transition.
+    """
+    def setUp(self):
+        self.pygments_lexer = JavascriptLexer(stripnl=False, stripall=False, ensurenl=False)
+        self.lexer = IncrementalLexer(self.pygments_lexer)
+
+    def _explode(self, tokens):
+        return [(token, c) for token, text in tokens for c in text]
+
+    def _assert_same_as_full_lexing(self, text):
+        self.assertEqual(
+            self._explode(self.lexer.get_tokens(text)),
+            self._explode(self.pygments_lexer.get_tokens(text)))
+
+    def test_close_unterminated_string(self):
+        self._assert_same_as_full_lexing('a = 1;\nb = 2;\nc = 3;\nd = 4;\n')
+        self._assert_same_as_full_lexing('a = "x\nb = 2;\nc = 3;\nd = 4;\n')
+        self._assert_same_as_full_lexing('a = "x\nb = 2;\nc = 3;\nd = "4;\n')
+        self._assert_same_as_full_lexing('a = "x\nb = 2;\nc = 3;\nd = 4;\n')
+
+    def test_close_unterminated_comment(self):
+        self._assert_same_as_full_lexing('a = 1; /* x\nb = 2;\nc = 3;\nd = 4;\n')
+        self._assert_same_as_full_lexing('a = 1; /* x\nb = 2;\nc = 3;\nd = 4; */\n')
+        self._assert_same_as_full_lexing('a = 1; /* x\nb = 2;\nc = 3;\nd = 4;\n')
+
+    def test_edit_inside_multiline_token(self):
+        text = 'a = 1;\n/* x\nb = 2;\nc = 3;\n*/ d = 4;\ne = 5;\n'
+        self._assert_same_as_full_lexing(text)
+        self._assert_same_as_full_lexing(text.replace('c = 3;', 'c = 3; */ f(/*'))
+        self._assert_same_as_full_lexing(text)
+
+    def test_only_changed_lines_are_lexed(self):
+        text = 'function f(a, b) {\n    return "s" + a / b;  // Comment.\n}\n' * 50
+        self.lexer.get_tokens(text)
+        line_tokens = self.lexer._line_tokens
+
+        # Change the last line. (Lexing restarts at the last line that
+        # starts in the root state, the last function.)
+        self.lexer.get_tokens(text + 'x')
+
+        self.assertTrue(all(a is b for a, b in zip(line_tokens[:-4], self.lexer._line_tokens)))
@@ -1,6 +1,8 @@
 from __future__ import unicode_literals
 
 from prompt_toolkit.line import Line
+from prompt_toolkit.enums import IncrementalSearchDirection
+from prompt_toolkit.history import History
 
 import unittest
 
@@ -149,3 +151,85 @@ class LineTest(unittest.TestCase):
         self.cli.swap_characters_before_cursor()
 
         self.assertEqual(self.cli.text, 'hello wrold')
+
+
+class GapBufferLineTest(LineTest):
+    """
+    Same tests, for a `Line` that stores its text in a gap buffer.
+    """
+    def setUp(self):
+        self.cli = Line(gap_buffer=True)
+
+    def test_history_and_edit(self):
+        self.cli.insert_text('first')
+        self.cli.add_to_history()
+        self.cli.reset()
+
+        self.cli.insert_text('second')
+        self.cli.history_backward()
+        self.assertEqual(self.cli.text, 'first')
+
+        self.cli.delete_before_cursor(count=2)
+        self.cli.history_forward()
+        self.assertEqual(self.cli.text, 'second')
+
+        self.cli.history_backward()
+        self.assertEqual(self.cli.text, 'fir')
+
+
+class WorkingLinesTest(unittest.TestCase):
+    def setUp(self):
+        self.history = History()
+        self.history.append('first')
+        self.history.append('second')
+
+        self.cli = Line(history=self.history)
+
+    def test_edit_history_entry(self):
+        self.cli.insert_text('third')
+        self.cli.history_backward()
+        self.assertEqual(self.cli.text, 'second')
+
+        # Editing an entry doesn't change the history.
+        self.cli.insert_text('!')
+        self.cli.history_forward()
+        self.cli.history_backward()
+        self.assertEqual(self.cli.text, 'second!')
+        self.assertEqual(self.history.strings, ['first', 'second'])
+
+        # After a reset, the history is shown again.
+        self.cli.reset()
+        self.cli.history_backward()
+        self.assertEqual(self.cli.text, 'second')
+
+    def test_incremental_search(self):
+        self.history.append('third\nsecond line')
+
+        self.cli.reset()
+        self.cli.start_isearch(IncrementalSearchDirection.BACKWARD)
+        self.cli.set_search_text('sec')
+        self.assertEqual(self.cli.working_index, 2)
+        self.assertEqual(self.cli.cursor_position, len('third\n'))
+
+        # Search the previous entries.
+        self.assertTrue(self.cli.incremental_search(IncrementalSearchDirection.BACKWARD))
+        self.assertEqual(self.cli.working_index, 1)
+        self.assertEqual(self.cli.cursor_position, 0)
+
+        self.assertFalse(self.cli.incremental_search(IncrementalSearchDirection.BACKWARD))
+
+        # Modified entries are searched instead of the history.
+        self.cli.exit_isearch()
+        self.cli.working_index = 0
+        self.cli.text = 'first second'
+        self.cli.cursor_position = len(self.cli.text)
+
+        self.cli.start_isearch(IncrementalSearchDirection.BACKWARD)
+        self.cli.working_index = 2
+        self.cli.cursor_position = 0
+        self.cli.set_search_text('second')
+        self.assertEqual(self.cli.working_index, 1)
+
+        self.cli.incremental_search(IncrementalSearchDirection.BACKWARD)
+        self.assertEqual(self.cli.working_index, 0)
+        self.assertEqual(self.cli.cursor_position, len('first '))
@@ -0,0 +1,83 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit.terminal.vt100_output import Vt100_Output
+
+import fcntl
+import io
+import os
+import threading
+import unittest
+
+
+class Vt100OutputTest(unittest.TestCase):
+    def setUp(self):
+        self.read_fd, self.write_fd = os.pipe()
+        self.stdout = io.open(self.write_fd, 'w', encoding='utf-8')
+
+    def tearDown(self):
+        self.stdout.close()
+        os.close(self.read_fd)
+
+    def _read(self, size):
+        data = b''
+        while len(data) < size:
+            data += os.read(self.read_fd, size - len(data))
+        return data
+
+    def test_flush_with_os_write(self):
+        output = Vt100_Output(self.stdout, use_os_write=True)
+        output.write('caf\u00e9')
+        output.cursor_forward(2)
+
+        self.assertEqual(output.flush(), 8)
+        self.assertEqual(self._read(9), 'caf\u00e9\x1b[2C'.encode('utf-8'))
+
+        # Nothing is written when the buffer is empty.
+        self.assertEqual(output.flush(), 0)
+
+    def test_output_of_file_object_goes_first(self):
+        self.stdout.write('abc')
+
+        output = Vt100_Output(self.stdout, use_os_write=True)
+        output.write('def')
+        output.flush()
+
+        self.assertEqual(self._read(6), b'abcdef')
+
+    def test_non_blocking_fd(self):
+        fcntl.fcntl(self.write_fd, fcntl.F_SETFL, os.O_NONBLOCK)
+
+        # More than fits in the pipe: this requires partial writes and waiting
+        # for EAGAIN.
+        data = 'x' * 1000000
+        received = []
+
+        def reader():
+            received.append(self._read(len(data)))
+        thread = threading.Thread(target=reader)
+        thread.start()
+
+        output = Vt100_Output(self.stdout, use_os_write=True)
+        output.write(data)
+        output.flush()
+
+        thread.join()
+        self.assertEqual(received[0], data.encode('utf-8'))
+
+    def test_synchronized_output(self):
+        stdout = io.StringIO()
+
+        output = Vt100_Output(stdout, synchronized_output=True)
+        output.write('abc')
+        output.flush()
+
+        self.assertEqual(stdout.getvalue(), '\x1b[?2026habc\x1b[?2026l')
+
+    def test_insert_and_delete(self):
+        output = Vt100_Output(None)
+        output.insert_characters(1)
+        output.delete_characters(2)
+        output.insert_lines(3)
+        output.delete_lines(1)
+
+        self.assertEqual(''.join(output._buffer), '\x1b[@\x1b[2P\x1b[3L\x1b[M')
@@ -0,0 +1,88 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit.profiler import Frame, Profiler, FrameRecorder, summarize
+from prompt_toolkit.renderer import Screen, Size, Point, output_screen_diff
+from prompt_toolkit.terminal.vt100_output import Vt100_Output
+from pygments.styles.default import DefaultStyle
+from pygments.token import Token
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.frames = []
+        self.profiler = Profiler()
+        self.profiler.onFrame += self.frames.append
+
+    def test_frame(self):
+        start = time.time()
+        self.profiler.add_time('lexer', time.time())
+        self.profiler.add_time('layout', start)
+        self.profiler.count('keys')
+        self.profiler.count('keys', 2)
+        self.profiler.end_frame()
+
+        self.assertEqual(len(self.frames), 1)
+        frame = self.frames[0]
+
+        # The frame starts at the start of the outer phase.
+        self.assertEqual(frame.start, start)
+        self.assertEqual(set(frame.phases), set(['lexer', 'layout']))
+        self.assertTrue(frame.phases['layout'] >= frame.phases['lexer'])
+        self.assertEqual(frame.counters, {'keys': 3})
+        self.assertEqual(frame.keys, 3)
+        self.assertTrue(frame.latency >= frame.phases['layout'])
+
+        # The next frame starts empty.
+        self.profiler.end_frame()
+        self.assertEqual(self.frames[1].phases, {})
+        self.assertEqual(self.profiler.frame_count, 2)
+
+    def test_output_screen_diff(self):
+        def render(text, previous_screen=None):
+            screen = Screen(Size(rows=10, columns=80))
+            screen.write_highlighted([(Token, text)])
+            output_screen_diff(Vt100_Output(None), screen, Point(0, 0), previous_screen,
+                               style=DefaultStyle, profiler=self.profiler)
+            self.profiler.end_frame()
+            return screen
+
+        screen = render('hello')
+        render('hallo', screen)
+
+        self.assertEqual(self.frames[0].counters, {'rows_changed': 1, 'cells_diffed': 5})
+        self.assertEqual(self.frames[1].counters, {'rows_changed': 1, 'cells_diffed': 1})
+
+    def test_summarize(self):
+        frames = [Frame(0, (i + 1) / 1000., {'layout': i / 1000.}, {'keys': 1, 'cells_diffed': 10})
+                  for i in range(100)]
+        frames.append(Frame(0, 1, {}, {'cells_diffed': 10}))  # Without key presses.
+
+        summary = summarize(frames)
+        self.assertEqual(summary['frames'], 101)
+        self.assertEqual(summary['key_frames'], 100)
+        self.assertEqual(summary['latency'], (.05, .099, .1))
+        self.assertEqual(summary['phases']['layout'], (.049, .098, .099))
+        self.assertEqual(summary['counters']['cells_diffed'], (1010, 10))
+
+    def test_frame_recorder(self):
+        directory = tempfile.mkdtemp()
+        try:
+            recorder = FrameRecorder(os.path.join(directory, 'session.log'))
+            self.profiler.onFrame += recorder
+
+            self.profiler.count('keys')
+            self.profiler.end_frame()
+            self.profiler.add_time('flush', time.time())
+            self.profiler.end_frame()
+
+            frames = recorder.read()
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual([f.to_dict() for f in frames], [f.to_dict() for f in self.frames])
@@ -1,9 +1,19 @@
 #!/usr/bin/env python
-from line_tests import LineTest
+from line_tests import LineTest, GapBufferLineTest, WorkingLinesTest
+from cli_tests import AsyncCompletionTest, RedrawTest, ReadInputTest, ReadInputAsyncTest
 from document_tests import DocumentTest
+from eventloop_tests import PosixEventLoopTest
+from executor_tests import ThreadPoolExecutorTest
+from gap_buffer_tests import GapBufferTest
+from history_tests import HistoryTest, FileHistoryTest
+from import_tests import ImportTimeTest
 from inputstream_tests import InputStreamTest
-from key_binding_tests import KeyBindingTest
-from screen_tests import ScreenTest
+from key_binding_tests import KeyBindingTest, BracketedPasteTest
+from lexer_tests import IncrementalLexerTest, MultilineTokenLexerTest
+from output_tests import Vt100OutputTest
+from profiler_tests import ProfilerTest
+from screen_tests import ScreenTest, OutputScreenDiffTest
+from width_tests import WidthTest
 
 import unittest
 
@@ -1,6 +1,10 @@
 from __future__ import unicode_literals
 
-from prompt_toolkit.renderer import Screen, Char, Size, Point
+from prompt_toolkit.renderer import Screen, Char, Size, Point, output_screen_diff, \
+    _get_token_to_attrs_cache
+from prompt_toolkit.utils import common_prefix_length, common_suffix_length
+from prompt_toolkit.terminal.vt100_output import Vt100_Output
+from pygments.styles.default import DefaultStyle
 from pygments.token import Token
 
 import unittest
@@ -15,7 +19,7 @@ class ScreenTest(unittest.TestCase):
         self.assertEqual(self.screen.current_height, 1)
 
         # After writing a character.
-        self.screen._buffer[5][0] = Char()
+        self.screen.write_at_pos(5, 0, Char())
         self.assertEqual(self.screen.current_height, 6)
 
     def test_get_cursor_position(self):
@@ -38,59 +42,226 @@ class ScreenTest(unittest.TestCase):
         self.screen.write_char('b', Token.B)
         self.screen.write_char('c', Token.C)
 
-        self.assertEqual(self.screen._buffer[0][0].char, 'x')
-        self.assertEqual(self.screen._buffer[0][1].char, 'y')
-        self.assertEqual(self.screen._buffer[0][2].char, 'z')
-        self.assertEqual(self.screen._buffer[1][0].char, 'a')
-        self.assertEqual(self.screen._buffer[1][1].char, 'b')
-        self.assertEqual(self.screen._buffer[1][2].char, 'c')
+        self.assertEqual(self.screen.get_char(0, 0).char, 'x')
+        self.assertEqual(self.screen.get_char(0, 1).char, 'y')
+        self.assertEqual(self.screen.get_char(0, 2).char, 'z')
+        self.assertEqual(self.screen.get_char(1, 0).char, 'a')
+        self.assertEqual(self.screen.get_char(1, 1).char, 'b')
+        self.assertEqual(self.screen.get_char(1, 2).char, 'c')
 
-        self.assertEqual(self.screen._buffer[0][0].token, Token.X)
-        self.assertEqual(self.screen._buffer[0][1].token, Token.Y)
-        self.assertEqual(self.screen._buffer[0][2].token, Token.Z)
-        self.assertEqual(self.screen._buffer[1][0].token, Token.A)
-        self.assertEqual(self.screen._buffer[1][1].token, Token.B)
-        self.assertEqual(self.screen._buffer[1][2].token, Token.C)
+        self.assertEqual(self.screen.get_char(0, 0).token, Token.X)
+        self.assertEqual(self.screen.get_char(0, 1).token, Token.Y)
+        self.assertEqual(self.screen.get_char(0, 2).token, Token.Z)
+        self.assertEqual(self.screen.get_char(1, 0).token, Token.A)
+        self.assertEqual(self.screen.get_char(1, 1).token, Token.B)
+        self.assertEqual(self.screen.get_char(1, 2).token, Token.C)
 
     def test_write_at_pos(self):
         # Test first write
         x = Char('x', Token.X, z_index=0)
         self.screen.write_at_pos(5, 3, x)
-        self.assertEqual(self.screen._buffer[5][3], x)
+        self.assertEqual(self.screen.get_char(5, 3), x)
 
         # Test higher z_index.
         y = Char('y', Token.Y, z_index=10)
         self.screen.write_at_pos(5, 3, y)
-        self.assertEqual(self.screen._buffer[5][3], y)
+        self.assertEqual(self.screen.get_char(5, 3), y)
 
         # Test lower z_index. (Should not replace.)
         z = Char('z', Token.Z, z_index=8)
         self.screen.write_at_pos(5, 3, z)
-        self.assertEqual(self.screen._buffer[5][3], y)
+        self.assertEqual(self.screen.get_char(5, 3), y)
 
     def test_write_highlighted_at_pos(self):
         self.screen.write_highlighted_at_pos(4, 2, [(Token.ABC, 'abc'), (Token.DEF, 'def')])
 
-        self.assertEqual(self.screen._buffer[4][2].char, 'a')
-        self.assertEqual(self.screen._buffer[4][3].char, 'b')
-        self.assertEqual(self.screen._buffer[4][4].char, 'c')
-        self.assertEqual(self.screen._buffer[4][2].token, Token.ABC)
-        self.assertEqual(self.screen._buffer[4][3].token, Token.ABC)
-        self.assertEqual(self.screen._buffer[4][4].token, Token.ABC)
+        self.assertEqual(self.screen.get_char(4, 2).char, 'a')
+        self.assertEqual(self.screen.get_char(4, 3).char, 'b')
+        self.assertEqual(self.screen.get_char(4, 4).char, 'c')
+        self.assertEqual(self.screen.get_char(4, 2).token, Token.ABC)
+        self.assertEqual(self.screen.get_char(4, 3).token, Token.ABC)
+        self.assertEqual(self.screen.get_char(4, 4).token, Token.ABC)
 
-        self.assertEqual(self.screen._buffer[4][5].char, 'd')
-        self.assertEqual(self.screen._buffer[4][6].char, 'e')
-        self.assertEqual(self.screen._buffer[4][7].char, 'f')
-        self.assertEqual(self.screen._buffer[4][5].token, Token.DEF)
-        self.assertEqual(self.screen._buffer[4][6].token, Token.DEF)
-        self.assertEqual(self.screen._buffer[4][7].token, Token.DEF)
+        self.assertEqual(self.screen.get_char(4, 5).char, 'd')
+        self.assertEqual(self.screen.get_char(4, 6).char, 'e')
+        self.assertEqual(self.screen.get_char(4, 7).char, 'f')
+        self.assertEqual(self.screen.get_char(4, 5).token, Token.DEF)
+        self.assertEqual(self.screen.get_char(4, 6).token, Token.DEF)
+        self.assertEqual(self.screen.get_char(4, 7).token, Token.DEF)
 
     def test_write_highlighted(self):
         self.screen.write_highlighted([(Token.ABC, 'abc'), (Token.DEF, 'def')])
         self.screen.write_highlighted([(Token.GHI, 'ghi'), (Token.JKL, 'jkl')])
 
-        self.assertEqual(self.screen._buffer[0][4].char, 'e')
-        self.assertEqual(self.screen._buffer[0][8].char, 'i')
+        self.assertEqual(self.screen.get_char(0, 4).char, 'e')
+        self.assertEqual(self.screen.get_char(0, 8).char, 'i')
 
-        self.assertEqual(self.screen._buffer[0][4].token, Token.DEF)
-        self.assertEqual(self.screen._buffer[0][8].token, Token.GHI)
+        self.assertEqual(self.screen.get_char(0, 4).token, Token.DEF)
+        self.assertEqual(self.screen.get_char(0, 8).token, Token.GHI)
+
+    def test_write_double_width_char(self):
+        self.screen.write_char('中', Token.A)
+        self.screen.write_char('x', Token.B)
+
+        self.assertEqual(self.screen.get_char(0, 0).char, '中')
+        self.assertEqual(self.screen.get_char(0, 2).char, 'x')
+        self.assertEqual(self.screen.get_cursor_position(), Point(y=0, x=0))
+
+    def test_copy_row_from(self):
+        source = Screen(Size(rows=10, columns=20))
+        source.write_highlighted([(Token.A, 'abc\ndef')])
+
+        self.screen.copy_row_from(source, 1, 3, 2)
+
+        self.assertEqual(self.screen.current_height, 4)
+        self.assertEqual(self.screen.get_char(3, 2), Char('d', Token.A))
+        self.assertEqual(self.screen.get_char(3, 4), Char('f', Token.A))
+        self.assertEqual(self.screen.get_char(3, 0), Char())
+
+
+class OutputScreenDiffTest(unittest.TestCase):
+    def setUp(self):
+        self.output = Vt100_Output(None)
+
+    def _render(self, text, previous_screen=None, **kwargs):
+        screen = Screen(Size(rows=10, columns=80))
+        screen.write_highlighted([(Token, text)])
+
+        self.output._buffer = []
+        output_screen_diff(self.output, screen, Point(0, 0), previous_screen, style=DefaultStyle, **kwargs)
+        return screen, ''.join(self.output._buffer)
+
+    def test_only_changed_characters_are_written(self):
+        screen, data = self._render('hello-world')
+        self.assertIn('hello-world', data)
+
+        screen, data = self._render('hello-there', screen)
+        self.assertIn('there', data)
+        self.assertNotIn('hello', data)
+
+    def test_shorter_line_is_trimmed(self):
+        screen, data = self._render('hello world')
+        screen, data = self._render('hello', screen)
+
+        self.assertIn('\x1b[K', data)
+        self.assertNotIn('hello', data)
+
+    def test_unchanged_screen_writes_no_characters(self):
+        screen, data = self._render('line1\nline2\nline3')
+        screen, data = self._render('line1\nline2\nline3', screen)
+
+        self.assertNotIn('line', data)
+
+    def test_changed_span_in_the_middle_of_a_row(self):
+        screen, data = self._render('abcdefgh\nline2')
+        screen, data = self._render('abcXYfgh\nline2', screen)
+
+        self.assertIn('XY', data)
+        self.assertNotIn('abc', data)
+        self.assertNotIn('fgh', data)
+
+    def test_carriage_return_to_start_of_row(self):
+        screen, data = self._render('abcdefgh')
+        screen, data = self._render('abcdefgX', screen)
+
+        # Back to the cursor position with '\r', not with CURSOR_BACKWARD.
+        self.assertTrue(data.endswith('X\r'))
+
+    def test_unchanged_characters_are_written_again_when_cheaper(self):
+        screen, data = self._render('abcdefgh')
+        screen, data = self._render('XbcYefgh', screen)
+
+        # Writing 'bc' is cheaper than '\x1b[2C'.
+        self.assertIn('XbcY', data)
+        self.assertNotIn('\x1b[2C', data)
+
+    def test_cursor_down_to_existing_rows(self):
+        screen, data = self._render('line1\nline2\nline3\nline4')
+        screen, data = self._render('Line1\nline2\nline3\nLine4', screen)
+
+        self.assertIn('\x1b[3B', data)
+        self.assertNotIn('\r\n', data)
+
+    def test_newlines_for_new_rows(self):
+        screen, data = self._render('line1')
+        screen, data = self._render('line1\n\n\nline4', screen)
+
+        self.assertIn('\x1b[0m\r\n\r\n\r\n', data)
+
+    def test_insert_characters(self):
+        screen, data = self._render('hello world')
+        screen, data = self._render('Xhello world', screen, use_insert_delete=True)
+
+        self.assertIn('\x1b[@', data)
+        self.assertIn('X', data)
+        self.assertNotIn('hello', data)
+
+        # Not without `use_insert_delete`.
+        screen, data = self._render('hello world')
+        screen, data = self._render('Xhello world', screen)
+        self.assertNotIn('\x1b[@', data)
+
+    def test_delete_characters(self):
+        screen, data = self._render('hello world, hello world')
+        screen, data = self._render('hell world, hello world', screen, use_insert_delete=True)
+
+        self.assertIn('\x1b[P', data)
+        self.assertNotIn('world', data)
+        self.assertNotIn('\x1b[K', data)
+
+    def test_insert_lines(self):
+        screen, data = self._render('line1\nline2\nline3\nline4')
+        screen, data = self._render('line1\nnew\nline2\nline3\nline4', screen,
+                                    use_insert_delete=True, available_height=10)
+
+        self.assertIn('\x1b[L', data)
+        self.assertIn('new', data)
+        self.assertNotIn('line', data)
+
+    def test_insert_lines_after_split_line(self):
+        screen, data = self._render('line1\nline2\nline3\nline4')
+        screen, data = self._render('li\nne1\nline2\nline3\nline4', screen,
+                                    use_insert_delete=True, available_height=10)
+
+        self.assertIn('\x1b[L', data)
+        self.assertNotIn('line', data)
+
+    def test_no_insert_lines_at_the_bottom(self):
+        # Inserting a line would push the last one below the bottom of the
+        # terminal.
+        screen, data = self._render('line1\nline2\nline3\nline4')
+        screen, data = self._render('line1\nnew\nline2\nline3\nline4', screen,
+                                    use_insert_delete=True, available_height=4)
+
+        self.assertNotIn('\x1b[L', data)
+        self.assertIn('line4', data)
+
+    def test_delete_lines(self):
+        screen, data = self._render('line1\nline2\nline3\nline4')
+        screen, data = self._render('line1\nline3\nline4', screen, use_insert_delete=True)
+
+        self.assertIn('\x1b[M', data)
+        self.assertNotIn('line', data)
+
+    def test_common_prefix_and_suffix_length(self):
+        self.assertEqual(common_prefix_length(list('abcdef'), list('abcxef')), 3)
+        self.assertEqual(common_suffix_length(list('abcdef'), list('abcxef')), 2)
+        self.assertEqual(common_prefix_length(list('abc'), list('abc')), 3)
+        self.assertEqual(common_suffix_length(list('abc'), list('xbc')), 2)
+        self.assertEqual(common_prefix_length([], list('abc')), 0)
+
+    def test_token_to_attrs_cache(self):
+        cache = _get_token_to_attrs_cache(DefaultStyle, False)
+        self.assertIs(cache, _get_token_to_attrs_cache(DefaultStyle, False))
+
+        attrs = cache[Token.Keyword]
+        self.assertEqual(attrs, ('008000', None, True, False))
+        self.assertEqual(cache[Token.Keyword], attrs)
+
+        # When grayed, every token gets the style of `Token.Aborted`.
+        grayed_cache = _get_token_to_attrs_cache(DefaultStyle, True)
+        self.assertEqual(grayed_cache[Token.Keyword], grayed_cache[Token.Aborted])
+
+    def test_set_attributes(self):
+        self.output.set_attributes('008000', None, bold=True)
+        self.assertEqual(''.join(self.output._buffer), '\x1b[0m\x1b[38;5;28;01m')
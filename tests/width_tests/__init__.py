@@ -0,0 +1,42 @@
+from __future__ import unicode_literals
+
+from prompt_toolkit.width import get_cwidth, get_width
+
+import sys
+import unittest
+
+
+class WidthTest(unittest.TestCase):
+    def test_get_cwidth(self):
+        self.assertEqual(get_cwidth('a'), 1)
+        self.assertEqual(get_cwidth(' '), 1)
+        self.assertEqual(get_cwidth('\u3042'), 2)  # Hiragana A.
+        self.assertEqual(get_cwidth('\uff21'), 2)  # Fullwidth A.
+        self.assertEqual(get_cwidth('\u0301'), 0)  # Combining acute accent.
+        self.assertEqual(get_cwidth('\u200b'), 0)  # Zero width space.
+        self.assertEqual(get_cwidth('\x00'), 0)
+        self.assertEqual(get_cwidth('\x01'), -1)
+        self.assertEqual(get_cwidth('\x7f'), -1)
+
+    @unittest.skipIf(sys.maxunicode < 0x10ffff, 'Narrow build.')
+    def test_get_cwidth_astral(self):
+        self.assertEqual(get_cwidth('\U0001f600'), 2)  # Emoji.
+        self.assertEqual(get_cwidth('\U00020000'), 2)  # CJK Extension B.
+        self.assertEqual(get_cwidth('\U0001d400'), 1)  # Mathematical bold A.
+        self.assertEqual(get_cwidth('\U000e0100'), 0)  # Variation selector.
+
+    def test_get_width(self):
+        self.assertEqual(get_width(''), 0)
+        self.assertEqual(get_width('hello world'), 11)
+        self.assertEqual(get_width('\u3042\u3044'), 4)
+        self.assertEqual(get_width('e\u0301'), 1)
+
+        # Control characters don't take any space.
+        self.assertEqual(get_width('a\x01b\tc'), 3)
+
+    def test_get_width_is_sum_of_cwidths(self):
+        text = 'abc \u3042\uff21\u0301\u200b\x00\x01\xe9\u4e00\u20ac'
+        if sys.maxunicode >= 0x10ffff:
+            text += '\U0001f600\U00020000\U0001d400'
+
+        self.assertEqual(get_width(text), sum(max(0, get_cwidth(c)) for c in text))
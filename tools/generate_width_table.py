@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Generate `prompt_toolkit/width_table.py`: the width of every Unicode code
+point, as given by the `wcwidth` package.
+
+The table has two levels: the code points are split in pages of 256, and
+identical pages are stored only once. Both levels are zlib compressed.
+
+Usage::
+
+    python tools/generate_width_table.py [output file]
+"""
+from __future__ import unicode_literals, print_function
+
+import io
+import os
+import sys
+import zlib
+
+import six
+import wcwidth
+
+PAGE_BITS = 8
+MAX_CODE_POINT = 0x10ffff
+
+
+def _ranges(widths, predicate):
+    """
+    Return the (first, last) code point ranges for which `predicate(width)`
+    is true.
+    """
+    result = []
+    start = None
+
+    for code, width in enumerate(widths):
+        if predicate(width):
+            if start is None:
+                start = code
+        elif start is not None:
+            result.append((start, code - 1))
+            start = None
+
+    if start is not None:
+        result.append((start, len(widths) - 1))
+
+    return result
+
+
+def _bytes_literal(data, indent='    '):
+    """
+    Return a bytes literal for `data`, split over multiple lines.
+    """
+    lines = []
+    for i in range(0, len(data), 32):
+        chunk = data[i:i + 32]
+        lines.append("%sb'%s'" % (indent, ''.join('\\x%02x' % c for c in bytearray(chunk))))
+    return '(\n%s\n)' % '\n'.join(lines)
+
+
+def _ranges_literal(ranges):
+    lines = ['    (0x%04x, 0x%04x),' % r for r in ranges]
+    return '(\n%s\n)' % '\n'.join(lines)
+
+
+def generate():
+    widths = [wcwidth.wcwidth(six.unichr(i)) for i in range(MAX_CODE_POINT + 1)]
+
+    page_size = 1 << PAGE_BITS
+    pages = {}
+    index = []
+
+    for start in range(0, len(widths), page_size):
+        page = bytes(bytearray(w & 0xff for w in widths[start:start + page_size]))
+        index.append(pages.setdefault(page, len(pages)))
+
+    assert len(pages) < 256, 'Page numbers have to fit in a byte.'
+
+    pages_data = b''.join(sorted(pages, key=pages.get))
+
+    return '\n'.join([
+        '# Generated by tools/generate_width_table.py from wcwidth %s. Do not edit.' % wcwidth.__version__,
+        '"""',
+        'Width of all Unicode code points. (See `prompt_toolkit.width`.)',
+        '"""',
+        '',
+        '#: Number of bits of the code point that index into a page.',
+        'PAGE_BITS = %i' % PAGE_BITS,
+        '',
+        '#: For every page of code points, the number of that page in `PAGES`.',
+        '#: (One byte per page, zlib compressed.)',
+        'PAGE_INDEX = %s' % _bytes_literal(zlib.compress(bytes(bytearray(index)), 9)),
+        '',
+        '#: The distinct pages. One signed byte, the width, per code point.',
+        '#: (zlib compressed.)',
+        'PAGES = %s' % _bytes_literal(zlib.compress(pages_data, 9)),
+        '',
+        '#: (first, last) code point ranges of wide characters.',
+        'WIDE_RANGES = %s' % _ranges_literal(_ranges(widths, lambda w: w == 2)),
+        '',
+        '#: (first, last) code point ranges of zero width and control characters.',
+        'ZERO_WIDTH_RANGES = %s' % _ranges_literal(_ranges(widths, lambda w: w <= 0)),
+        '',
+    ])
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv:
+        filename = argv[0]
+    else:
+        filename = os.path.join(os.path.dirname(__file__), '..', 'prompt_toolkit', 'width_table.py')
+
+    with io.open(filename, 'w', encoding='ascii') as f:
+        f.write(generate())
+
+
+if __name__ == '__main__':
+    main()